@@ -0,0 +1,170 @@
+"""Answer a JSONL file of questions without starting the desktop UI.
+
+Each input line is an object with ``mode`` ("health" or "symptom"),
+``language`` ("en" or "km") and ``message``; an optional ``id`` is copied to
+the output. Results are written as JSONL in completion order, one line per
+input, with the answer or an error kind and the per-item latency.
+
+    python batch.py questions.jsonl -o answers.jsonl --concurrency 8
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from config.prompts import get_prompt
+from config.settings import REQUEST_TIMEOUT
+from core.client import ModelClient, ClientError
+from core.env import load_env_file, get_api_key
+from core.response_cache import ResponseCache
+
+BASE_DIR = Path(__file__).parent
+
+MODES = ("health", "symptom")
+LANGUAGES = ("en", "km")
+MAX_MESSAGE_LENGTH = 500
+
+
+def read_records(lines):
+    """Yield (index, record, error) for every non-blank input line."""
+    for index, line in enumerate(lines):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield index, {}, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield index, {}, "Record must be a JSON object"
+            continue
+        yield index, record, validate_record(record)
+
+
+def validate_record(record):
+    message = record.get("message")
+    if not isinstance(message, str) or not message.strip():
+        return "Missing message"
+    if len(message.strip()) > MAX_MESSAGE_LENGTH:
+        return f"Message too long (max {MAX_MESSAGE_LENGTH} characters)"
+    if record.get("mode", "health") not in MODES:
+        return f"Unknown mode: {record.get('mode')!r}"
+    if record.get("language", "en") not in LANGUAGES:
+        return f"Unknown language: {record.get('language')!r}"
+    return None
+
+
+def answer_record(client, record):
+    """Run one record through the model and return the result fields."""
+    mode = record.get("mode", "health")
+    language = record.get("language", "en")
+    prompt = get_prompt(mode, language, record["message"].strip())
+    started = time.perf_counter()
+    try:
+        response = client.generate(prompt, stream=False, timeout=REQUEST_TIMEOUT, mode=mode)
+        result = {"status": "ok", "response": response}
+    except ClientError as e:
+        result = {"status": "error", "error_kind": e.kind, "error": str(e)}
+    except Exception as e:
+        result = {"status": "error", "error_kind": "internal", "error": repr(e)}
+    result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+def run_batch(client, lines, out, concurrency, cache=None):
+    """Stream records through the client with at most ``concurrency`` in flight.
+
+    Returns a dict of counts per status/error kind.
+    """
+    slots = threading.BoundedSemaphore(concurrency)
+    write_lock = threading.Lock()
+    counts = {}
+
+    def write(index, record, result):
+        row = {"index": index}
+        if "id" in record:
+            row["id"] = record["id"]
+        for key in ("mode", "language", "message"):
+            if key in record:
+                row[key] = record[key]
+        row.update(result)
+        key = result["status"] if result["status"] == "ok" else result["error_kind"]
+        with write_lock:
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+            out.flush()
+            counts[key] = counts.get(key, 0) + 1
+
+    def finish(future, index, record):
+        try:
+            result = future.result()
+            if cache is not None and result["status"] == "ok":
+                cache.put(record.get("mode", "health"), record.get("language", "en"),
+                          record["message"].strip(), result["response"])
+            write(index, record, result)
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch") as executor:
+        for index, record, error in read_records(lines):
+            if error:
+                write(index, record, {"status": "error", "error_kind": "invalid", "error": error,
+                                      "latency_ms": 0.0})
+                continue
+            # Blocks once `concurrency` requests are in flight, so the input is
+            # never read further ahead than the pool can process
+            slots.acquire()
+            future = executor.submit(answer_record, client, record)
+            future.add_done_callback(lambda f, i=index, r=record: finish(f, i, r))
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Answer a JSONL file of health questions headlessly.")
+    parser.add_argument("input", help="JSONL file of {mode, language, message} records ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="JSONL file to write results to (default: stdout)")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="requests in flight at once (default: 4)")
+    parser.add_argument("--warm-cache", action="store_true",
+                        help="store successful answers in the app's response cache")
+    args = parser.parse_args(argv)
+
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+
+    load_env_file(BASE_DIR)
+    client = ModelClient.from_settings(get_api_key())
+    unavailable = [mode for mode in MODES if not client.available(mode)]
+    if unavailable:
+        print(f"No usable model backend for {', '.join(unavailable)} (Gemini API not available or "
+              f"GEMINI_API_KEY not configured); those items will fail.", file=sys.stderr)
+    cache = ResponseCache() if args.warm_cache else None
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+
+    started = time.perf_counter()
+    try:
+        counts = run_batch(client, source, out, args.concurrency, cache)
+    finally:
+        client.shutdown()
+        if cache is not None:
+            cache.close()
+        if source is not sys.stdin:
+            source.close()
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    summary = ", ".join(f"{key}={value}" for key, value in sorted(counts.items()))
+    if client.coalesced:
+        summary += f" ({client.coalesced} duplicates shared a call)"
+    print(f"Processed {total} records in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.1f}/s): {summary}",
+          file=sys.stderr)
+    return 0 if counts.get("ok", 0) == total else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""Memory per transcript row: ui.transcript.ChatMessage against the old record.
+
+Run from the project root:  python -m benchmarks.bench_memory
+
+Rows mimic a session restored from history, where every row carries its
+own copy of the sender string as read from SQLite.
+"""
+import tracemalloc
+
+from benchmarks.samples import ANSWERS
+from ui.transcript import ChatMessage
+
+
+class LegacyChatMessage:
+    """The dict-backed record ChatMessage used before it got __slots__."""
+
+    def __init__(self, kind, text, sender="", message_id=None, created_at=None):
+        self.kind = kind
+        self.text = text
+        self.sender = sender
+        self.message_id = message_id
+        self.created_at = created_at
+        self.note = ""
+
+
+def bytes_per_message(record_class, count=20000):
+    """Bytes allocated per row, excluding the message text itself."""
+    texts = [ANSWERS[row % len(ANSWERS)] for row in range(count)]
+    sender_bytes = ["You".encode("utf-8"), "Healthcare AI".encode("utf-8")]
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    # A fresh sender string per row, as sqlite3 returns them
+    rows = [record_class("user" if row % 2 == 0 else "bot", texts[row], sender_bytes[row % 2].decode("utf-8"),
+                         row, 1700000000.0 + row)
+            for row in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del rows
+    return allocated / count
+
+
+def main(count=20000):
+    legacy = bytes_per_message(LegacyChatMessage, count)
+    compact = bytes_per_message(ChatMessage, count)
+    print(f"{'record':<20}{'bytes/row':>12}")
+    print(f"{'legacy (dict)':<20}{legacy:>12.0f}")
+    print(f"{'ChatMessage':<20}{compact:>12.0f}")
+    print(f"saving: {1 - compact / legacy:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Microbenchmark: core.renderer against the old per-bubble formatter.
+
+Run from the project root:  python -m benchmarks.bench_renderer
+"""
+import timeit
+
+from benchmarks.samples import ANSWERS_EN, ANSWERS_KM
+from core.renderer import render_markdown
+
+
+def legacy_format_message(message):
+    """The formatter ModernChatBubble used before core.renderer existed."""
+    import re
+
+    message = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', message)
+    message = re.sub(r'\*(.*?)\*', r'<i>\1</i>', message)
+    message = message.replace('\n', '<br>')
+
+    lines = message.split('<br>')
+    formatted_lines = []
+    in_list = False
+
+    for line in lines:
+        line = line.strip()
+        if re.match(r'^\d+\.\s+', line) or line.startswith('•') or line.startswith('-'):
+            if not in_list:
+                formatted_lines.append('<ul style="margin: 8px 0; padding-left: 20px;">')
+                in_list = True
+            if re.match(r'^\d+\.\s+', line):
+                item_text = re.sub(r'^\d+\.\s+', '', line)
+            else:
+                item_text = re.sub(r'^[•\-]\s*', '', line)
+            formatted_lines.append(f'<li style="margin: 2px 0; line-height: 1.5;">{item_text}</li>')
+        else:
+            if in_list:
+                formatted_lines.append('</ul>')
+                in_list = False
+            if line:
+                formatted_lines.append(f'<p style="margin: 8px 0; line-height: 1.6;">{line}</p>')
+
+    if in_list:
+        formatted_lines.append('</ul>')
+    result = ''.join(formatted_lines)
+
+    result = re.sub(r'<p[^>]*>\s*</p>', '', result)
+
+    return result
+
+
+def per_call_us(func, answers, number):
+    def run():
+        for answer in answers:
+            func(answer)
+    best = min(timeit.repeat(run, number=number, repeat=5))
+    return best / (number * len(answers)) * 1e6
+
+
+def main(number=2000):
+    uncached = render_markdown.__wrapped__
+    print(f"{'corpus':<8}{'legacy':>12}{'renderer':>12}{'memoized':>12}{'speedup':>10}")
+    for name, answers in (("en", ANSWERS_EN), ("km", ANSWERS_KM)):
+        legacy = per_call_us(legacy_format_message, answers, number)
+        fresh = per_call_us(uncached, answers, number)
+        render_markdown.cache_clear()
+        memoized = per_call_us(render_markdown, answers, number)
+        print(f"{name:<8}{legacy:>10.1f}us{fresh:>10.1f}us{memoized:>10.2f}us{legacy / fresh:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""UI hot-path benchmarks, run offscreen against a fake model.
+
+Run from the project root:  python -m benchmarks.bench_ui
+
+Each figure is the median wall time in milliseconds of the operation plus
+the event-loop work and repaint it triggers. Transcript-size dependent paths
+are measured at every size in SIZES.
+"""
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from PyQt6.QtWidgets import QApplication
+
+from benchmarks.fake_client import FakeModelClient
+from benchmarks.samples import ANSWERS
+
+SIZES = (100, 1000, 10000)
+COLD_START_RUNS = 3
+
+
+_app = None
+
+
+def get_app():
+    # Keep a reference: a collected QApplication takes every widget with it
+    global _app
+    if _app is None:
+        _app = QApplication.instance() or QApplication([sys.argv[0]])
+    return _app
+
+
+def pump(seconds):
+    app = get_app()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+
+
+def settle(window, quiet=0.25, timeout=120):
+    """Run the event loop until batched layout has measured every bubble and
+    the scroll range has stopped moving."""
+    app = get_app()
+    tab = window.current_tab
+    scroll_bar = tab.chat_view.verticalScrollBar()
+    heights = tab.chat_view.bubble_delegate._heights
+    bubbles = sum(1 for message in tab.chat_model.messages() if message.kind != "system")
+    last, quiet_since = None, time.perf_counter()
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        app.processEvents()
+        if scroll_bar.maximum() != last or len(heights) < bubbles:
+            last, quiet_since = scroll_bar.maximum(), time.perf_counter()
+        elif time.perf_counter() - quiet_since > quiet:
+            return
+        time.sleep(0.002)
+
+
+def make_window(directory, rows):
+    import main
+    from ui.transcript import ChatMessage
+
+    window = main.HealthBotDemoWindow(client=FakeModelClient(), data_dir=directory)
+    window.resize(900, 700)
+    window.show()
+    window.current_tab.chat_model.prepend([
+        ChatMessage("user", f"Question {row} about my health?", "You") if row % 2 == 0
+        else ChatMessage("bot", ANSWERS[row % len(ANSWERS)], "Healthcare AI")
+        for row in range(rows)
+    ])
+    settle(window)
+    return window
+
+
+def close_window(window):
+    window.close()
+    window.deleteLater()
+    pump(0.05)
+
+
+def median_ms(window, action, repeat):
+    """Median time of ``action`` plus the events and repaint it causes."""
+    app = get_app()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        action()
+        app.processEvents()
+        window.current_tab.chat_view.viewport().repaint()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def wait_until_idle(window, timeout=10):
+    app = get_app()
+    deadline = time.perf_counter() + timeout
+    while window.current_tab.scheduler.busy and time.perf_counter() < deadline:
+        app.processEvents()
+        time.sleep(0.0005)
+
+
+def bench_transcript(rows):
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        window = make_window(directory, rows)
+        counter = iter(range(10 ** 9))
+        results[f"add_chat_bubble_ms@{rows}"] = median_ms(
+            window, lambda: window.current_tab._add_chat_bubble(ANSWERS[next(counter) % len(ANSWERS)], "Healthcare AI",
+                                                                False), 30)
+        settle(window)
+        results[f"toggle_theme_ms@{rows}"] = median_ms(window, window.toggle_theme, 6)
+        results[f"refresh_chat_bubbles_ms@{rows}"] = median_ms(window, window._refresh_chat_bubbles, 6)
+        close_window(window)
+    return results
+
+
+def bench_language_and_suggestions(rows=1000):
+    with tempfile.TemporaryDirectory() as directory:
+        window = make_window(directory, rows)
+        tab = window.current_tab
+        results = {
+            "toggle_language_ms": median_ms(window, window.toggle_language, 6),
+            "suggestion_switch_ms": median_ms(
+                window, lambda: tab.set_symptom_checker_mode() or tab.set_health_query_mode(), 10),
+        }
+        close_window(window)
+    return results
+
+
+def bench_send_to_answer(rows=1000, repeat=10):
+    """Send a message and wait for the fake model's streamed answer to land."""
+    with tempfile.TemporaryDirectory() as directory:
+        window = make_window(directory, rows)
+        tab = window.current_tab
+        samples = []
+        for attempt in range(repeat):
+            tab.user_input.setText(f"Benchmark question number {attempt} about vitamin levels")
+            started = time.perf_counter()
+            tab.send_message()
+            wait_until_idle(window)
+            samples.append((time.perf_counter() - started) * 1000)
+        close_window(window)
+    return {"send_to_answer_ms": statistics.median(samples)}
+
+
+def cold_start_child(directory):
+    """Child process: build the window and report once it has painted."""
+    started = time.perf_counter()
+    app = get_app()
+    import main
+
+    window = main.HealthBotDemoWindow(client=FakeModelClient(), data_dir=directory)
+    window.show()
+    while not window._first_paint_done:
+        app.processEvents()
+    print(f"{(time.perf_counter() - started) * 1000:.3f}", flush=True)
+    window.close()
+
+
+def bench_cold_start(runs=COLD_START_RUNS):
+    """Process spawn to first paint, interpreter start-up included."""
+    samples = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as directory:
+            started = time.perf_counter()
+            child = subprocess.Popen([sys.executable, "-m", "benchmarks.bench_ui", "--cold-start-child", directory],
+                                     stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+            for line in child.stdout:
+                if line.strip().replace(".", "", 1).isdigit():
+                    samples.append((time.perf_counter() - started) * 1000)
+                    break
+            child.stdout.close()
+            child.wait()
+    return {"cold_start_first_paint_ms": statistics.median(samples)} if samples else {}
+
+
+def run(sizes=SIZES):
+    get_app()
+    results = {}
+    for rows in sizes:
+        results.update(bench_transcript(rows))
+    results.update(bench_language_and_suggestions())
+    results.update(bench_send_to_answer())
+    results.update(bench_cold_start())
+    return results
+
+
+def main():
+    if len(sys.argv) == 3 and sys.argv[1] == "--cold-start-child":
+        cold_start_child(sys.argv[2])
+        return
+    for name, value in run().items():
+        print(f"{name:<34}{value:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Deterministic stand-in for core.client.ModelClient.
+
+Answers come from benchmarks.samples, picked by a stable hash of the prompt,
+and are streamed in fixed-size chunks with optional simulated latency, so
+UI benchmarks measure the app rather than the network.
+"""
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from benchmarks.samples import ANSWERS
+from core.client import ClientError
+
+
+class FakeModelClient:
+    def __init__(self, first_chunk_delay=0.0, chunk_delay=0.0, chunk_size=40, max_workers=2):
+        self.first_chunk_delay = first_chunk_delay
+        self.chunk_delay = chunk_delay
+        self.chunk_size = chunk_size
+        self.requests = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fake-model")
+
+    def answer_for(self, prompt):
+        text = prompt if isinstance(prompt, str) else prompt[-1]["parts"][0]
+        return ANSWERS[zlib.crc32(text.encode("utf-8")) % len(ANSWERS)]
+
+    def model_id(self, mode):
+        return "fake/samples"
+
+    def available(self, mode):
+        return True
+
+    def warm_up(self):
+        future = Future()
+        future.set_result(None)
+        return future
+
+    def generate(self, prompt, on_chunk=None, stream=True, cancel_event=None, timeout=None, mode="health"):
+        self.requests += 1
+        answer = self.answer_for(prompt)
+        time.sleep(self.first_chunk_delay)
+        if not stream:
+            return answer
+        for end in range(self.chunk_size, len(answer) + self.chunk_size, self.chunk_size):
+            if cancel_event is not None and cancel_event.is_set():
+                raise ClientError("cancelled", "Request cancelled.")
+            if on_chunk:
+                on_chunk(answer[:end])
+            time.sleep(self.chunk_delay)
+        return answer
+
+    def submit(self, prompt, on_chunk=None, stream=True, cancel_event=None, timeout=None, on_start=None,
+               mode="health", owner=None):
+        def run():
+            if on_start:
+                on_start()
+            return self.generate(prompt, on_chunk, stream, cancel_event, timeout, mode)
+        return self._executor.submit(run)
+
+    def shutdown(self, wait=False):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,96 @@
+"""Local stand-in for an OpenAI-compatible chat completions server.
+
+Serves deterministic answers from benchmarks.samples over HTTP/1.1
+keep-alive, streaming them as server-sent events when asked to. Point a
+backend in MODEL_BACKENDS at it to run the app or the benchmarks without a
+real model:
+
+    python -m benchmarks.fake_server --port 8080
+"""
+import argparse
+import json
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from benchmarks.samples import ANSWERS
+
+
+class FakeChatHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    chunk_size = 40
+    chunk_delay = 0.0
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        if not self.path.endswith("/chat/completions"):
+            self.send_error(404)
+            return
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        question = request["messages"][-1]["content"]
+        answer = ANSWERS[zlib.crc32(question.encode("utf-8")) % len(ANSWERS)]
+        if request.get("stream"):
+            try:
+                self._stream(request["model"], answer)
+            except (BrokenPipeError, ConnectionResetError):
+                # The client cancelled mid-stream and dropped the connection
+                self.close_connection = True
+        else:
+            body = json.dumps({"model": request["model"], "choices": [
+                {"index": 0, "message": {"role": "assistant", "content": answer}, "finish_reason": "stop"}
+            ]}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def _stream(self, model, answer):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for start in range(0, len(answer), self.chunk_size):
+            event = {"model": model, "choices": [{"index": 0, "delta": {"content": answer[start:start + self.chunk_size]}}]}
+            self._write_chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+            time.sleep(self.chunk_delay)
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._write_chunk(b"")
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+
+def serve(host="127.0.0.1", port=0):
+    """Return a server bound to (host, port); call serve_forever() to run it."""
+    return ThreadingHTTPServer((host, port), FakeChatHandler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve deterministic answers on /v1/chat/completions.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--chunk-delay", type=float, default=0.0, help="seconds between streamed chunks")
+    args = parser.parse_args()
+    FakeChatHandler.chunk_delay = args.chunk_delay
+    server = serve(args.host, args.port)
+    print(f"Serving on http://{args.host}:{server.server_port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
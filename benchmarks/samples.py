@@ -0,0 +1,45 @@
+# Realistic Gemini answers used by the benchmarks, in the shape the prompts ask for
+ANSWERS_EN = [
+    """**Headaches** are often caused by stress, dehydration or lack of sleep. Tension headaches feel like a tight band around the head.
+
+**Recommendation:** Drink water, rest in a quiet room and consider paracetamol if needed.
+
+**See a doctor** if the headache is sudden and severe, or comes with fever, stiff neck or vision changes.""",
+    """## Possible causes
+1. **Viral infection** (common cold or flu) - usually with body aches and fatigue.
+2. **Bacterial infection** - such as strep throat or a urinary tract infection.
+3. **Heat exhaustion** - after long exposure to high temperatures.
+
+## Self-care tips
+- Rest and drink plenty of fluids.
+- Use a light blanket; avoid *overheating*.
+
+**When to see a doctor:** if fever is above 39°C, lasts more than 3 days, or you have trouble breathing.""",
+    """Good sleep supports memory, mood and immunity. Adults need **7-9 hours** per night.
+
+* Keep a regular schedule, even on weekends.
+* Avoid screens and caffeine for 1-2 hours before bed.
+   * Try reading or a warm shower instead.
+
+If you snore loudly or wake up tired for weeks, talk to a doctor. More at [CDC](https://www.cdc.gov/sleep/).""",
+]
+
+ANSWERS_KM = [
+    """**ការឈឺក្បាល** ច្រើនតែបណ្តាលមកពីភាពតានតឹង ការខ្វះទឹក ឬការគេងមិនគ្រប់គ្រាន់។
+
+**ការណែនាំ៖** ផឹកទឹកឱ្យបានច្រើន សម្រាកនៅកន្លែងស្ងាត់។
+
+**ជួបគ្រូពេទ្យ** ប្រសិនបើឈឺក្បាលខ្លាំងភ្លាមៗ ឬមានគ្រុនក្តៅ និងរឹងក។""",
+    """## មូលហេតុដែលអាចកើតមាន
+1. **ការឆ្លងមេរោគ** (ផ្តាសាយ ឬគ្រុនផ្តាសាយ) - ជាធម្មតាមានឈឺខ្លួន និងអស់កម្លាំង។
+2. **ការឆ្លងបាក់តេរី** - ដូចជាការរលាកបំពង់ក។
+3. **ការហត់នឿយដោយកំដៅ** - បន្ទាប់ពីនៅក្នុងកំដៅខ្លាំងយូរ។
+
+## គន្លឹះថែទាំខ្លួនឯង
+- សម្រាក និងផឹកទឹកឱ្យបានច្រើន។
+- ប្រើភួយស្តើង *កុំឱ្យក្តៅពេក*។
+
+**ពេលណាត្រូវជួបគ្រូពេទ្យ៖** ប្រសិនបើគ្រុនក្តៅលើស 39°C ឬលើសពី 3 ថ្ងៃ។""",
+]
+
+ANSWERS = ANSWERS_EN + ANSWERS_KM
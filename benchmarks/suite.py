@@ -0,0 +1,127 @@
+"""Benchmark suite with JSON baselines and regression checks.
+
+Run from the project root:
+    python -m benchmarks.suite save [NAME]            # writes benchmarks/baselines/NAME.json
+    python -m benchmarks.suite compare BASE [CURRENT] # CURRENT defaults to a fresh run
+
+Every metric is a time or a size, so lower is better. ``compare`` exits with status 1
+when any metric is slower than the baseline by more than ``--threshold``.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+DEFAULT_THRESHOLD = 0.2
+
+
+def bench_format_message(number=500):
+    """Per-call cost of the bubble formatter (core.renderer), memoization bypassed."""
+    from benchmarks.bench_renderer import per_call_us
+    from benchmarks.samples import ANSWERS_EN, ANSWERS_KM
+    from core.renderer import render_markdown
+
+    uncached = render_markdown.__wrapped__
+    return {
+        "format_message_us_en": per_call_us(uncached, ANSWERS_EN, number),
+        "format_message_us_km": per_call_us(uncached, ANSWERS_KM, number),
+    }
+
+
+def metadata():
+    from PyQt6.QtCore import QT_VERSION_STR
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "qt": QT_VERSION_STR,
+        "platform": platform.platform(),
+    }
+
+
+def collect():
+    from benchmarks import bench_ui
+    from benchmarks.bench_memory import bytes_per_message
+    from ui.transcript import ChatMessage
+
+    results = bench_format_message()
+    results["chat_message_bytes"] = bytes_per_message(ChatMessage)
+    results.update(bench_ui.run())
+    return {"meta": metadata(), "results": results}
+
+
+def load(path):
+    path = Path(path)
+    if not path.exists() and not path.suffix:
+        path = BASELINE_DIR / f"{path}.json"
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Return (rows, regressions); a row is (name, old, new, ratio or None)."""
+    old, new = baseline["results"], current["results"]
+    rows, regressions = [], []
+    for name in sorted(set(old) | set(new)):
+        before, after = old.get(name), new.get(name)
+        ratio = after / before if before and after is not None else None
+        rows.append((name, before, after, ratio))
+        if ratio is not None and ratio > 1 + threshold:
+            regressions.append(name)
+    return rows, regressions
+
+
+def print_comparison(rows, regressions):
+    print(f"{'metric':<34}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, before, after, ratio in rows:
+        change = f"{(ratio - 1) * 100:+.1f}%" if ratio is not None else "n/a"
+        flag = "  REGRESSION" if name in regressions else ""
+        before = f"{before:.2f}" if before is not None else "-"
+        after = f"{after:.2f}" if after is not None else "-"
+        print(f"{name:<34}{before:>12}{after:>12}{change:>10}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    save_parser = commands.add_parser("save", help="run the suite and store a baseline")
+    save_parser.add_argument("name", nargs="?", default="baseline")
+    compare_parser = commands.add_parser("compare", help="compare a run against a baseline")
+    compare_parser.add_argument("baseline", help="baseline name or JSON path")
+    compare_parser.add_argument("current", nargs="?", help="second baseline (default: run the suite now)")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="allowed slowdown before flagging, as a fraction (default: 0.2)")
+    args = parser.parse_args()
+
+    if args.command == "save":
+        BASELINE_DIR.mkdir(parents=True, exist_ok=True)
+        path = BASELINE_DIR / f"{args.name}.json"
+        report = collect()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"Saved {len(report['results'])} metrics to {path}")
+        return 0
+
+    baseline = load(args.baseline)
+    current = load(args.current) if args.current else collect()
+    rows, regressions = compare(baseline, current, args.threshold)
+    print_comparison(rows, regressions)
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+# Curated offline answers for common questions (English/Khmer).
+# After editing, rebuild the search index with: python -m core.knowledge
+
+KNOWLEDGE_BASE = [
+    {
+        "id": "medication",
+        "mode": "health",
+        "en": {
+            "questions": ["Medication info", "How should I take my medicine safely?",
+                          "Can I take painkillers with other drugs?", "missed dose pills tablets"],
+            "answer": "**Taking medicine safely**\n"
+                      "- Follow the dose and timing on the label or from your doctor or pharmacist.\n"
+                      "- Do not mix medicines (including herbal remedies) without asking a pharmacist.\n"
+                      "- If you miss a dose, take it when you remember unless the next dose is close; never double up.\n\n"
+                      "See a doctor if you get a rash, swelling, trouble breathing or any severe side effect."
+        },
+        "km": {
+            "questions": ["ព័ត៌មានឱសថ", "តើខ្ញុំគួរលេបថ្នាំដោយសុវត្ថិភាពយ៉ាងដូចម្តេច?", "ភ្លេចលេបថ្នាំ"],
+            "answer": "**ការប្រើថ្នាំដោយសុវត្ថិភាព**\n"
+                      "- ប្រើតាមកម្រិតថ្នាំ និងពេលវេលាដែលមានលើស្លាក ឬតាមវេជ្ជបញ្ជា។\n"
+                      "- កុំលាយថ្នាំ (រួមទាំងថ្នាំបុរាណ) ដោយមិនសួរឱសថការី។\n"
+                      "- បើភ្លេចលេបថ្នាំ សូមលេបពេលនឹកឃើញ លើកលែងតែជិតដល់ពេលលេបបន្ទាប់ ហើយកុំលេបទ្វេដង។\n\n"
+                      "សូមជួបគ្រូពេទ្យ ប្រសិនបើមានកន្ទួល ហើម ពិបាកដកដង្ហើម ឬផលរំខានធ្ងន់ធ្ងរ។"
+        }
+    },
+    {
+        "id": "exercise",
+        "mode": "health",
+        "en": {
+            "questions": ["Exercise tips", "How much exercise do I need?", "physical activity workout walking"],
+            "answer": "**Staying active**\n"
+                      "- Aim for at least 150 minutes of moderate activity (such as brisk walking) each week.\n"
+                      "- Add muscle-strengthening exercise on 2 days a week and start slowly if you are new to it.\n"
+                      "- Warm up, drink water and avoid exercising in the hottest part of the day.\n\n"
+                      "See a doctor before starting if you have heart disease, chest pain or dizziness during activity."
+        },
+        "km": {
+            "questions": ["គន្លឹះហាត់ប្រាណ", "តើខ្ញុំត្រូវហាត់ប្រាណប៉ុន្មាន?", "ដើរ លំហាត់ប្រាណ"],
+            "answer": "**ការរក្សាសកម្មភាពរាងកាយ**\n"
+                      "- ព្យាយាមធ្វើសកម្មភាពកម្រិតមធ្យម (ដូចជាដើរលឿន) យ៉ាងហោចណាស់ 150 នាទីក្នុងមួយសប្តាហ៍។\n"
+                      "- បន្ថែមលំហាត់ពង្រឹងសាច់ដុំ 2 ថ្ងៃក្នុងមួយសប្តាហ៍ ហើយចាប់ផ្តើមបន្តិចម្តងៗ។\n"
+                      "- កម្តៅសាច់ដុំមុនហាត់ ផឹកទឹក និងជៀសវាងហាត់ពេលថ្ងៃក្តៅខ្លាំង។\n\n"
+                      "សូមជួបគ្រូពេទ្យមុនចាប់ផ្តើម ប្រសិនបើមានជំងឺបេះដូង ឈឺទ្រូង ឬវិលមុខពេលហាត់។"
+        }
+    },
+    {
+        "id": "nutrition",
+        "mode": "health",
+        "en": {
+            "questions": ["Nutrition help", "What is a healthy diet?", "healthy eating food vegetables"],
+            "answer": "**Healthy eating**\n"
+                      "- Fill half your plate with vegetables and fruit, and choose whole grains, fish, beans or lean meat.\n"
+                      "- Limit sugary drinks, salt and fried or processed food.\n"
+                      "- Eat regular meals and drink plenty of clean water.\n\n"
+                      "See a doctor or dietitian for unexplained weight loss, diabetes or special dietary needs."
+        },
+        "km": {
+            "questions": ["ជំនួយអាហារូបត្ថម្ភ", "តើរបបអាហារមានសុខភាពល្អជាអ្វី?", "អាហារ បន្លែ"],
+            "answer": "**ការញ៉ាំអាហារមានសុខភាពល្អ**\n"
+                      "- ដាក់បន្លែ និងផ្លែឈើពាក់កណ្តាលចាន ហើយជ្រើសរើសគ្រាប់ធញ្ញជាតិ ត្រី សណ្តែក ឬសាច់គ្មានខ្លាញ់។\n"
+                      "- កាត់បន្ថយភេសជ្ជៈផ្អែម អំបិល និងអាហារចៀន ឬកែច្នៃ។\n"
+                      "- ញ៉ាំអាហារឱ្យទៀងពេល ហើយផឹកទឹកស្អាតឱ្យបានគ្រប់គ្រាន់។\n\n"
+                      "សូមជួបគ្រូពេទ្យ ប្រសិនបើស្រកទម្ងន់ដោយមិនដឹងមូលហេតុ មានជំងឺទឹកនោមផ្អែម ឬត្រូវការរបបអាហារពិសេស។"
+        }
+    },
+    {
+        "id": "sleep",
+        "mode": "health",
+        "en": {
+            "questions": ["Sleep issues", "I can't sleep at night", "insomnia trouble sleeping tired"],
+            "answer": "**Better sleep**\n"
+                      "- Adults need about 7-9 hours; keep the same bed and wake times every day.\n"
+                      "- Avoid caffeine after midday and screens for an hour before bed.\n"
+                      "- Keep the bedroom dark, quiet and cool.\n\n"
+                      "See a doctor if poor sleep lasts more than a few weeks, or if you snore loudly and feel sleepy all day."
+        },
+        "km": {
+            "questions": ["បញ្ហាគេង", "ខ្ញុំគេងមិនលក់នៅពេលយប់", "គេងមិនលក់ អស់កម្លាំង"],
+            "answer": "**ការគេងឱ្យបានល្អ**\n"
+                      "- មនុស្សពេញវ័យត្រូវការគេងប្រហែល 7-9 ម៉ោង ហើយគួរចូលគេង និងក្រោកនៅម៉ោងដដែលរាល់ថ្ងៃ។\n"
+                      "- ជៀសវាងកាហ្វេក្រោយថ្ងៃត្រង់ និងអេក្រង់មួយម៉ោងមុនចូលគេង។\n"
+                      "- រក្សាបន្ទប់គេងឱ្យងងឹត ស្ងាត់ និងត្រជាក់។\n\n"
+                      "សូមជួបគ្រូពេទ្យ ប្រសិនបើគេងមិនលក់ច្រើនសប្តាហ៍ ឬស្រមុកខ្លាំង ហើយងងុយគេងពេញមួយថ្ងៃ។"
+        }
+    },
+    {
+        "id": "hydration",
+        "mode": "health",
+        "en": {
+            "questions": ["How much water should I drink?", "dehydration drinking water thirsty"],
+            "answer": "**Staying hydrated**\n"
+                      "- Most adults need about 2 litres (8 glasses) of fluid a day, more in hot weather or when active.\n"
+                      "- Pale yellow urine is a good sign; dark urine and thirst mean you need more.\n"
+                      "- Use oral rehydration salts after diarrhoea or heavy sweating.\n\n"
+                      "See a doctor for confusion, fainting, very little urine or a child who will not drink."
+        },
+        "km": {
+            "questions": ["តើខ្ញុំគួរផឹកទឹកប៉ុន្មាន?", "ខ្វះជាតិទឹក ស្រេកទឹក"],
+            "answer": "**ការផឹកទឹកឱ្យបានគ្រប់គ្រាន់**\n"
+                      "- មនុស្សពេញវ័យភាគច្រើនត្រូវការទឹកប្រហែល 2 លីត្រ (8 កែវ) ក្នុងមួយថ្ងៃ និងច្រើនជាងនេះពេលក្តៅ ឬហាត់ប្រាណ។\n"
+                      "- ទឹកនោមពណ៌លឿងស្រាលជាសញ្ញាល្អ ទឹកនោមពណ៌ក្រម៉ៅ និងការស្រេកទឹកមានន័យថាត្រូវផឹកបន្ថែម។\n"
+                      "- ប្រើអំបិលប្រឆាំងការខ្វះជាតិទឹក (ORS) ក្រោយរាគ ឬបែកញើសខ្លាំង។\n\n"
+                      "សូមជួបគ្រូពេទ្យ ប្រសិនបើវង្វេងស្មារតី សន្លប់ នោមតិចខ្លាំង ឬកុមារមិនព្រមផឹក។"
+        }
+    },
+    {
+        "id": "stress",
+        "mode": "health",
+        "en": {
+            "questions": ["How can I manage stress?", "anxiety stress worried mental health"],
+            "answer": "**Managing stress**\n"
+                      "- Regular exercise, enough sleep and time with people you trust all lower stress.\n"
+                      "- Try slow breathing: in for 4 seconds, out for 6, for a few minutes.\n"
+                      "- Limit alcohol and caffeine, and break big tasks into small steps.\n\n"
+                      "See a doctor if worry or low mood lasts more than two weeks or affects daily life; seek help immediately if you think about harming yourself."
+        },
+        "km": {
+            "questions": ["តើខ្ញុំអាចគ្រប់គ្រងភាពតានតឹងយ៉ាងដូចម្តេច?", "ស្ត្រេស ព្រួយបារម្ភ សុខភាពផ្លូវចិត្ត"],
+            "answer": "**ការគ្រប់គ្រងភាពតានតឹង**\n"
+                      "- ការហាត់ប្រាណទៀងទាត់ ការគេងគ្រប់គ្រាន់ និងពេលវេលាជាមួយមនុស្សដែលអ្នកទុកចិត្ត ជួយកាត់បន្ថយភាពតានតឹង។\n"
+                      "- សាកល្បងដកដង្ហើមយឺតៗ៖ ស្រូប 4 វិនាទី ដកចេញ 6 វិនាទី ពីរបីនាទី។\n"
+                      "- កាត់បន្ថយគ្រឿងស្រវឹង និងកាហ្វេ ហើយបែងចែកការងារធំជាជំហានតូចៗ។\n\n"
+                      "សូមជួបគ្រូពេទ្យ ប្រសិនបើការព្រួយបារម្ភ ឬអារម្មណ៍ធ្លាក់ចុះមានលើសពីពីរសប្តាហ៍ ហើយស្វែងរកជំនួយភ្លាមៗ បើមានគំនិតធ្វើបាបខ្លួនឯង។"
+        }
+    },
+    {
+        "id": "blood_pressure",
+        "mode": "health",
+        "en": {
+            "questions": ["What is high blood pressure?", "hypertension blood pressure"],
+            "answer": "**High blood pressure**\n"
+                      "- A reading of 140/90 or higher on repeated checks is high; it often has no symptoms.\n"
+                      "- Less salt, regular exercise, a healthy weight and no smoking all help lower it.\n"
+                      "- If you are prescribed medicine, take it every day even when you feel well.\n\n"
+                      "Get urgent care for a reading above 180/120 with headache, chest pain or weakness."
+        },
+        "km": {
+            "questions": ["តើសម្ពាធឈាមខ្ពស់ជាអ្វី?", "លើសឈាម សម្ពាធឈាម"],
+            "answer": "**សម្ពាធឈាមខ្ពស់**\n"
+                      "- លទ្ធផលវាស់ 140/90 ឬខ្ពស់ជាងនេះច្រើនដង ចាត់ទុកថាខ្ពស់ ហើយជារឿយៗគ្មានរោគសញ្ញា។\n"
+                      "- ការកាត់បន្ថយអំបិល ហាត់ប្រាណទៀងទាត់ រក្សាទម្ងន់ល្អ និងឈប់ជក់បារី ជួយបន្ថយសម្ពាធឈាម។\n"
+                      "- បើគ្រូពេទ្យចេញថ្នាំ សូមលេបរៀងរាល់ថ្ងៃ ទោះបីមានអារម្មណ៍ធម្មតាក៏ដោយ។\n\n"
+                      "សូមទៅមន្ទីរពេទ្យបន្ទាន់ ប្រសិនបើសម្ពាធលើស 180/120 ហើយមានឈឺក្បាល ឈឺទ្រូង ឬខ្សោយ។"
+        }
+    },
+    {
+        "id": "fever",
+        "mode": "symptom",
+        "en": {
+            "questions": ["Fever & chills", "I have a high temperature and chills", "fever hot shivering"],
+            "answer": "**Fever and chills**\n"
+                      "- Common causes: viral infections such as flu, dengue, or a bacterial infection.\n"
+                      "- Rest, drink plenty of fluids and take paracetamol as directed; avoid ibuprofen and aspirin if dengue is possible.\n"
+                      "- Check your temperature regularly.\n\n"
+                      "See a doctor if fever lasts more than 3 days, goes above 39.5°C, or comes with a rash, bleeding, stiff neck or confusion."
+        },
+        "km": {
+            "questions": ["គ្រុនក្តៅ", "ខ្ញុំក្តៅខ្លួន និងរងា", "គ្រុន ក្តៅខ្លួន ញាក់"],
+            "answer": "**គ្រុនក្តៅ និងរងា**\n"
+                      "- មូលហេតុទូទៅ៖ មេរោគវីរុសដូចជាផ្តាសាយធំ គ្រុនឈាម ឬការឆ្លងបាក់តេរី។\n"
+                      "- សម្រាក ផឹកទឹកឱ្យបានច្រើន និងលេបប៉ារ៉ាសេតាមុលតាមការណែនាំ ហើយជៀសវាងអ៊ីប៊ុយប្រូហ្វែន និងអាស្ពីរីន បើអាចជាគ្រុនឈាម។\n"
+                      "- វាស់កម្តៅខ្លួនជាប្រចាំ។\n\n"
+                      "សូមជួបគ្រូពេទ្យ ប្រសិនបើគ្រុនលើសពី 3 ថ្ងៃ ក្តៅលើស 39.5°C ឬមានកន្ទួល ហូរឈាម រឹងក ឬវង្វេង។"
+        }
+    },
+    {
+        "id": "headache",
+        "mode": "symptom",
+        "en": {
+            "questions": ["Headache", "I have a bad headache", "head pain migraine"],
+            "answer": "**Headache**\n"
+                      "- Common causes: tension and stress, not drinking enough water, poor sleep, or migraine.\n"
+                      "- Rest in a quiet, dark room, drink water and take a simple painkiller such as paracetamol.\n"
+                      "- Regular meals and sleep help prevent headaches from coming back.\n\n"
+                      "Get urgent care for a sudden severe headache, or one with fever, stiff neck, weakness, confusion or after a head injury."
+        },
+        "km": {
+            "questions": ["ឈឺក្បាល", "ខ្ញុំឈឺក្បាលខ្លាំង", "ឈឺក្បាលប្រកាំង"],
+            "answer": "**ឈឺក្បាល**\n"
+                      "- មូលហេតុទូទៅ៖ ភាពតានតឹង ផឹកទឹកមិនគ្រប់គ្រាន់ គេងមិនបានល្អ ឬឈឺក្បាលប្រកាំង។\n"
+                      "- សម្រាកក្នុងបន្ទប់ស្ងាត់ និងងងឹត ផឹកទឹក និងលេបថ្នាំបំបាត់ការឈឺធម្មតាដូចជាប៉ារ៉ាសេតាមុល។\n"
+                      "- ការញ៉ាំ និងគេងឱ្យទៀងពេល ជួយការពារការឈឺក្បាលមិនឱ្យកើតឡើងវិញ។\n\n"
+                      "សូមទៅមន្ទីរពេទ្យបន្ទាន់ ប្រសិនបើឈឺក្បាលខ្លាំងភ្លាមៗ ឬមានគ្រុន រឹងក ខ្សោយ វង្វេង ឬក្រោយពេលរងរបួសក្បាល។"
+        }
+    },
+    {
+        "id": "cold",
+        "mode": "symptom",
+        "en": {
+            "questions": ["Cold symptoms", "runny nose sore throat sneezing", "I think I have a cold"],
+            "answer": "**Common cold**\n"
+                      "- Usually a viral infection that clears up in 7-10 days; antibiotics do not help.\n"
+                      "- Rest, drink warm fluids, and gargle with salt water for a sore throat.\n"
+                      "- Wash your hands often and cover coughs to protect others.\n\n"
+                      "See a doctor if you have trouble breathing, a high fever, or symptoms lasting more than 10 days."
+        },
+        "km": {
+            "questions": ["រោគសញ្ញាផ្តាសាយ", "ហៀរសំបោរ ឈឺបំពង់ក កណ្តាស់", "ខ្ញុំគិតថាខ្ញុំផ្តាសាយ"],
+            "answer": "**ផ្តាសាយធម្មតា**\n"
+                      "- ជាធម្មតាបណ្តាលមកពីវីរុស ហើយជាសះស្បើយក្នុងរយៈពេល 7-10 ថ្ងៃ ថ្នាំអង់ទីប៊ីយោទិចមិនជួយទេ។\n"
+                      "- សម្រាក ផឹកទឹកក្តៅឧណ្ហៗ និងខ្ពុរមាត់ដោយទឹកអំបិលពេលឈឺបំពង់ក។\n"
+                      "- លាងដៃញឹកញាប់ និងបិទមាត់ពេលក្អក ដើម្បីការពារអ្នកដទៃ។\n\n"
+                      "សូមជួបគ្រូពេទ្យ ប្រសិនបើពិបាកដកដង្ហើម គ្រុនខ្លាំង ឬរោគសញ្ញាលើសពី 10 ថ្ងៃ។"
+        }
+    },
+    {
+        "id": "allergies",
+        "mode": "symptom",
+        "en": {
+            "questions": ["Allergies", "itchy eyes sneezing allergy", "allergic reaction rash"],
+            "answer": "**Allergies**\n"
+                      "- Common triggers: dust, pollen, pets, some foods and medicines.\n"
+                      "- Avoid known triggers; an antihistamine from the pharmacy can ease sneezing and itching.\n"
+                      "- Keep windows closed on dusty days and wash bedding often.\n\n"
+                      "Get emergency help for swelling of the lips or throat, trouble breathing or fainting."
+        },
+        "km": {
+            "questions": ["អាលែកហ្សុី", "រមាស់ភ្នែក កណ្តាស់ អាឡែហ្ស៊ី", "ប្រតិកម្មអាលែកហ្សុី កន្ទួល"],
+            "answer": "**អាលែកហ្សុី**\n"
+                      "- កត្តាបង្កទូទៅ៖ ធូលី លំអងផ្កា សត្វចិញ្ចឹម អាហារ និងថ្នាំមួយចំនួន។\n"
+                      "- ជៀសវាងកត្តាបង្កដែលដឹង ហើយថ្នាំប្រឆាំងអ៊ីស្តាមីនពីឱសថស្ថានអាចជួយបំបាត់ការកណ្តាស់ និងរមាស់។\n"
+                      "- បិទបង្អួចនៅថ្ងៃមានធូលីច្រើន និងបោកកម្រាលពូកញឹកញាប់។\n\n"
+                      "សូមស្វែងរកជំនួយបន្ទាន់ ប្រសិនបើហើមបបូរមាត់ ឬបំពង់ក ពិបាកដកដង្ហើម ឬសន្លប់។"
+        }
+    },
+    {
+        "id": "cough",
+        "mode": "symptom",
+        "en": {
+            "questions": ["I have a cough", "dry cough chest cough phlegm"],
+            "answer": "**Cough**\n"
+                      "- Most coughs come from colds or flu and settle within 3 weeks.\n"
+                      "- Drink warm fluids, try honey in warm water (not for babies under 1) and avoid smoke.\n"
+                      "- Rest and keep away from dust.\n\n"
+                      "See a doctor for a cough lasting over 3 weeks, coughing blood, chest pain, weight loss or shortness of breath."
+        },
+        "km": {
+            "questions": ["ខ្ញុំក្អក", "ក្អកស្ងួត ក្អកមានស្លេស្ម"],
+            "answer": "**ក្អក**\n"
+                      "- ការក្អកភាគច្រើនបណ្តាលមកពីផ្តាសាយ ហើយបាត់ទៅវិញក្នុងរយៈពេល 3 សប្តាហ៍។\n"
+                      "- ផឹកទឹកក្តៅឧណ្ហៗ សាកល្បងទឹកឃ្មុំលាយទឹកក្តៅ (មិនសម្រាប់ទារកក្រោម 1 ឆ្នាំ) និងជៀសវាងផ្សែង។\n"
+                      "- សម្រាក និងនៅឆ្ងាយពីធូលី។\n\n"
+                      "សូមជួបគ្រូពេទ្យ ប្រសិនបើក្អកលើសពី 3 សប្តាហ៍ ក្អកចេញឈាម ឈឺទ្រូង ស្រកទម្ងន់ ឬដង្ហើមខ្លី។"
+        }
+    },
+    {
+        "id": "stomach",
+        "mode": "symptom",
+        "en": {
+            "questions": ["I have diarrhea and stomach pain", "stomach ache diarrhoea vomiting"],
+            "answer": "**Stomach upset and diarrhoea**\n"
+                      "- Common causes: contaminated food or water, or a stomach virus.\n"
+                      "- Drink oral rehydration salts in small, frequent sips and eat plain food when you can.\n"
+                      "- Wash your hands and drink only boiled or bottled water.\n\n"
+                      "See a doctor for blood in the stool, severe pain, diarrhoea over 2 days, or signs of dehydration, especially in children."
+        },
+        "km": {
+            "questions": ["ខ្ញុំរាក និងឈឺពោះ", "ឈឺពោះ រាក ក្អួត"],
+            "answer": "**ឈឺពោះ និងរាក**\n"
+                      "- មូលហេតុទូទៅ៖ អាហារ ឬទឹកមិនស្អាត ឬមេរោគវីរុសក្នុងពោះវៀន។\n"
+                      "- ផឹក ORS បន្តិចម្តងៗញឹកញាប់ ហើយញ៉ាំអាហារធម្មតាស្រាលៗពេលអាចញ៉ាំបាន។\n"
+                      "- លាងដៃ និងផឹកតែទឹកដាំពុះ ឬទឹកដប។\n\n"
+                      "សូមជួបគ្រូពេទ្យ ប្រសិនបើលាមកមានឈាម ឈឺខ្លាំង រាកលើសពី 2 ថ្ងៃ ឬមានសញ្ញាខ្វះជាតិទឹក ជាពិសេសចំពោះកុមារ។"
+        }
+    },
+    {
+        "id": "dengue",
+        "mode": "symptom",
+        "en": {
+            "questions": ["What are the signs of dengue fever?", "dengue mosquito bites"],
+            "answer": "**Dengue fever**\n"
+                      "- Spread by mosquitoes; signs include high fever, severe headache, pain behind the eyes, joint pain and rash.\n"
+                      "- Rest, drink plenty of fluids and use paracetamol only; avoid aspirin and ibuprofen.\n"
+                      "- Prevent bites with nets and repellent and empty standing water.\n\n"
+                      "Go to a hospital immediately for bleeding gums or nose, vomiting, severe belly pain or extreme tiredness."
+        },
+        "km": {
+            "questions": ["តើរោគសញ្ញាគ្រុនឈាមមានអ្វីខ្លះ?", "គ្រុនឈាម មូសខាំ"],
+            "answer": "**គ្រុនឈាម**\n"
+                      "- ចម្លងតាមមូស រោគសញ្ញារួមមាន គ្រុនខ្លាំង ឈឺក្បាលខ្លាំង ឈឺក្រោយភ្នែក ឈឺសន្លាក់ និងកន្ទួល។\n"
+                      "- សម្រាក ផឹកទឹកឱ្យបានច្រើន និងប្រើតែប៉ារ៉ាសេតាមុល ជៀសវាងអាស្ពីរីន និងអ៊ីប៊ុយប្រូហ្វែន។\n"
+                      "- ការពារមូសខាំដោយប្រើមុង និងថ្នាំការពារមូស ហើយចាក់ចោលទឹកដក់។\n\n"
+                      "សូមទៅមន្ទីរពេទ្យភ្លាមៗ ប្រសិនបើហូរឈាមអញ្ចាញធ្មេញ ឬច្រមុះ ក្អួត ឈឺពោះខ្លាំង ឬអស់កម្លាំងខ្លាំង។"
+        }
+    }
+]
@@ -1,4 +1,7 @@
 
+# Bump whenever a template below changes so cached answers are invalidated
+PROMPT_VERSION = 1
+
 HEALTH_QUERY_PROMPT_EN = """As a healthcare assistant, provide brief health information about: {message}
 
 Give me ONLY:
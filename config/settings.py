@@ -0,0 +1,101 @@
+from pathlib import Path
+
+# Model and request settings shared by the desktop app
+MODEL_NAME = "gemini-2.0-flash"
+
+GENERATION_CONFIG = {
+    "temperature": 0.6,
+    "top_p": 0.7,
+    "max_output_tokens": 250,
+}
+
+# Model backends. "gemini" uses the Google SDK with GEMINI_API_KEY; "http"
+# talks to an OpenAI-compatible chat completions server (llama.cpp, vLLM,
+# Ollama, ...). Optional keys: "generation_config", and "api_key_env" naming
+# the environment variable that holds an HTTP server's bearer token
+MODEL_BACKENDS = {
+    "gemini": {"type": "gemini"},
+    "local": {"type": "http", "base_url": "http://127.0.0.1:8080/v1"},
+}
+
+# Backend and model used by each chat mode
+MODE_BACKENDS = {
+    "health": {"backend": "gemini", "model": MODEL_NAME},
+    "symptom": {"backend": "gemini", "model": MODEL_NAME},
+}
+
+# Number of pooled threads that talk to the model concurrently, shared by
+# every conversation tab (each tab has at most one answer in progress)
+REQUEST_WORKERS = 4
+
+# Rendering quality: "high" draws drop shadows on buttons, "low" skips all
+# per-widget graphics effects (for GPU-less PCs), "auto" starts high and
+# switches to low for the rest of the run once the median of the last
+# FRAME_WINDOW frames takes longer than FRAME_BUDGET_MS to paint
+RENDER_QUALITY = "auto"
+FRAME_BUDGET_MS = 33
+FRAME_WINDOW = 30
+
+# Theme at start-up and the order the theme button steps through (names
+# from THEMES in config/styles.py)
+THEME = "dark"
+THEME_CYCLE = ("dark", "light", "high_contrast")
+
+# Local data written by the app (caches, history)
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+# Answer cache for repeated questions (e.g. the quick suggestions)
+RESPONSE_CACHE_PATH = DATA_DIR / "response_cache.sqlite3"
+RESPONSE_CACHE_MAX_ENTRIES = 500
+RESPONSE_CACHE_TTL = 7 * 24 * 60 * 60  # seconds
+
+# Durable chat history; older messages are loaded a page at a time
+CONVERSATION_DB_PATH = DATA_DIR / "conversations.sqlite3"
+HISTORY_PAGE_SIZE = 50
+
+# Multi-turn context: recent exchanges sent with each request, older ones
+# compacted into a rolling summary (estimated tokens)
+CONTEXT_TOKEN_BUDGET = 1200
+CONTEXT_SUMMARY_TOKENS = 200
+
+# Request scheduling: seconds before an unanswered request is abandoned,
+# whether resending a question that is still queued (same text up to case
+# and punctuation) replaces the queued copy instead of asking twice, and
+# whether sending while an answer is in progress abandons it (and anything
+# queued) so the new message is answered next. The last one is opt-in
+REQUEST_TIMEOUT = 30
+REPLACE_QUEUED_RESENDS = True
+SUPERSEDE_ON_SEND = False
+
+# Start answering a quick suggestion as soon as it is picked, before Send.
+# Spends a request (and a rate-limit token) if the text is then edited
+PREFETCH_SUGGESTIONS = True
+
+# Client-side rate limit shared by all requests in the process. Pick the row
+# matching the project's Gemini API tier (requests per minute)
+RATE_LIMIT_TIERS = {"free": 15, "tier1": 2000, "tier2": 10000}
+API_TIER = "free"
+RATE_LIMIT_RPM = RATE_LIMIT_TIERS[API_TIER]
+RATE_LIMIT_BURST = 5
+
+# Retries for quota/connection errors: exponential backoff with jitter,
+# or the server's retry-after hint when it sends one (seconds)
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+# Offline knowledge base: prebuilt index (python -m core.knowledge), the
+# confidence needed to answer without the model, and the lower bar for
+# using an entry as the offline fallback
+KNOWLEDGE_INDEX_PATH = Path(__file__).resolve().parent / "knowledge_index.json"
+KB_ANSWER_CONFIDENCE = 0.8
+KB_FALLBACK_CONFIDENCE = 0.3
+
+# Latency tracing: percentiles cover the last TRACE_WINDOW messages; the
+# snapshot log rotates at TRACE_LOG_MAX_BYTES and is exported every
+# TRACE_EXPORT_INTERVAL seconds
+TRACE_DIR = DATA_DIR / "traces"
+TRACE_WINDOW = 1000
+TRACE_LOG_MAX_BYTES = 1024 * 1024
+TRACE_LOG_BACKUPS = 3
+TRACE_EXPORT_INTERVAL = 60
@@ -1,33 +1,106 @@
+from functools import lru_cache
 
+# Design tokens per theme. Every color the app stylesheet and the chat
+# bubbles use comes from here, so a theme is added by adding an entry
+# ("icon" is what the theme toggle shows to switch to that theme).
+THEMES = {
+    "light": {
+        "icon": "☀️",
+        "main_bg": "#f8fafc",
+        "card_bg": "#ffffff",
+        "chat_bg": "#f1f5f9",
+        "text_primary": "#1e293b",
+        "text_secondary": "#64748b",
+        "text_muted": "#94a3b8",
+        "border_color": "#e2e8f0",
+        "accent_color": "#667eea",
+        "accent_hover": "#5a67d8",
+        "accent_pressed": "#4c51bf",
+        "accent_text": "white",
+        "danger": "#ef4444",
+        "input_bg": "#ffffff",
+        "shadow_edge": "#cbd5e1",
+        "header_gradient": "qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #667eea, stop:1 #764ba2)",
+        "suggestion_bg": "rgba(100, 149, 237, 0.1)",
+        "suggestion_border": "rgba(100, 149, 237, 0.3)",
+        "suggestion_text": "#4a90e2",
+        "suggestion_hover_bg": "rgba(100, 149, 237, 0.2)",
+        "suggestion_hover_border": "rgba(100, 149, 237, 0.5)",
+        "suggestion_pressed_bg": "rgba(100, 149, 237, 0.3)",
+        "bubbles": {
+            "user": {"background": "#667eea", "border": None, "sender": "#e6ffffff", "text": "#ffffff",
+                     "highlight": "#f59e0b"},
+            "bot": {"background": "#ffffff", "border": "#e2e8f0", "sender": "#667eea", "text": "#1e293b",
+                    "highlight": "#f59e0b"},
+            "system": {"background": "#e2e8f0", "text": "#94a3b8"},
+        },
+    },
+    "dark": {
+        "icon": "🌙",
+        "main_bg": "#0f172a",
+        "card_bg": "#1e293b",
+        "chat_bg": "#0f172a",
+        "text_primary": "#f1f5f9",
+        "text_secondary": "#cbd5e1",
+        "text_muted": "#94a3b8",
+        "border_color": "#334155",
+        "accent_color": "#60a5fa",
+        "accent_hover": "#5a67d8",
+        "accent_pressed": "#4c51bf",
+        "accent_text": "white",
+        "danger": "#ef4444",
+        "input_bg": "#1e293b",
+        "shadow_edge": "#020617",
+        "header_gradient": "qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #1e3a8a, stop:1 #3730a3)",
+        "suggestion_bg": "rgba(100, 149, 237, 0.1)",
+        "suggestion_border": "rgba(100, 149, 237, 0.3)",
+        "suggestion_text": "#4a90e2",
+        "suggestion_hover_bg": "rgba(100, 149, 237, 0.2)",
+        "suggestion_hover_border": "rgba(100, 149, 237, 0.5)",
+        "suggestion_pressed_bg": "rgba(100, 149, 237, 0.3)",
+        "bubbles": {
+            "user": {"background": "#60a5fa", "border": None, "sender": "#e6ffffff", "text": "#ffffff",
+                     "highlight": "#fbbf24"},
+            "bot": {"background": "#1e293b", "border": "#334155", "sender": "#60a5fa", "text": "#f1f5f9",
+                    "highlight": "#fbbf24"},
+            "system": {"background": "#334155", "text": "#94a3b8"},
+        },
+    },
+    "high_contrast": {
+        "icon": "🔳",
+        "main_bg": "#000000",
+        "card_bg": "#000000",
+        "chat_bg": "#000000",
+        "text_primary": "#ffffff",
+        "text_secondary": "#ffffff",
+        "text_muted": "#e5e5e5",
+        "border_color": "#ffffff",
+        "accent_color": "#ffff00",
+        "accent_hover": "#ffffff",
+        "accent_pressed": "#cccc00",
+        "accent_text": "#000000",
+        "danger": "#ff4d4d",
+        "input_bg": "#000000",
+        "shadow_edge": "#ffffff",
+        "header_gradient": "#000000",
+        "suggestion_bg": "#000000",
+        "suggestion_border": "#ffff00",
+        "suggestion_text": "#ffff00",
+        "suggestion_hover_bg": "#333300",
+        "suggestion_hover_border": "#ffffff",
+        "suggestion_pressed_bg": "#666600",
+        "bubbles": {
+            "user": {"background": "#ffff00", "border": None, "sender": "#000000", "text": "#000000",
+                     "highlight": "#00ffff"},
+            "bot": {"background": "#000000", "border": "#ffffff", "sender": "#ffff00", "text": "#ffffff",
+                    "highlight": "#00ffff"},
+            "system": {"background": "#1a1a1a", "text": "#ffffff"},
+        },
+    },
+}
 
-def get_app_stylesheet(theme="light"):
-    if theme == "light":
-        main_bg = "#f8fafc"
-        card_bg = "#ffffff"
-        chat_bg = "#f1f5f9"
-        text_primary = "#1e293b"
-        text_secondary = "#64748b"
-        text_muted = "#94a3b8"
-        border_color = "#e2e8f0"
-        accent_color = "#667eea"
-        input_bg = "#ffffff"
-        shadow = "rgba(0, 0, 0, 0.08)"
-        header_gradient = "qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #667eea, stop:1 #764ba2)"
-    else:  # dark theme
-        main_bg = "#0f172a"
-        card_bg = "#1e293b"
-        chat_bg = "#0f172a"
-        text_primary = "#f1f5f9"
-        text_secondary = "#cbd5e1"
-        text_muted = "#94a3b8"
-        border_color = "#334155"
-        accent_color = "#60a5fa"
-        input_bg = "#1e293b"
-        shadow = "rgba(0, 0, 0, 0.3)"
-        header_gradient = "qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 #1e3a8a, stop:1 #3730a3)"
-
-    # Construct and return the complete stylesheet
-    return f"""
+# Filled in from a theme's tokens by get_app_stylesheet
+APP_STYLESHEET = """
         QMainWindow {{
             background-color: {main_bg};
             color: {text_primary};
@@ -49,6 +122,32 @@ def get_app_stylesheet(theme="light"):
             font-family: "Segoe UI", "Roboto", "Inter", sans-serif;
         }}
 
+        QTabWidget#conversation_tabs::pane {{
+            border: none;
+        }}
+
+        QTabBar {{
+            qproperty-drawBase: 0;
+        }}
+
+        QTabBar::tab {{
+            background-color: {main_bg};
+            color: {text_secondary};
+            border: none;
+            border-bottom: 2px solid transparent;
+            padding: 8px 16px;
+            font-size: 13px;
+        }}
+
+        QTabBar::tab:selected {{
+            color: {text_primary};
+            border-bottom-color: {accent_color};
+        }}
+
+        QTabBar::tab:hover {{
+            color: {text_primary};
+        }}
+
         ModernButton {{
             background-color: {card_bg};
             color: {text_primary};
@@ -62,18 +161,43 @@ def get_app_stylesheet(theme="light"):
 
         ModernButton:hover {{
             background-color: {accent_color};
-            color: white;
+            color: {accent_text};
             border-color: {accent_color};
         }}
 
         ModernButton:checked {{
             background-color: {accent_color};
-            color: white;
+            color: {accent_text};
             border-color: {accent_color};
             font-weight: 600;
         }}
 
-        QScrollArea {{
+        ModernButton#new_tab_button {{
+            padding: 2px 14px;
+            border-radius: 6px;
+            font-size: 16px;
+        }}
+
+        ModernButton#suggestion_button {{
+            background-color: {suggestion_bg};
+            border: 1px solid {suggestion_border};
+            border-radius: 18px;
+            padding: 6px 12px;
+            font-size: 12px;
+            color: {suggestion_text};
+            text-align: center;
+        }}
+
+        ModernButton#suggestion_button:hover {{
+            background-color: {suggestion_hover_bg};
+            border-color: {suggestion_hover_border};
+        }}
+
+        ModernButton#suggestion_button:pressed {{
+            background-color: {suggestion_pressed_bg};
+        }}
+
+        QListView#chat_view {{
             background-color: {chat_bg};
             border: none;
             border-radius: 8px;
@@ -116,9 +240,41 @@ def get_app_stylesheet(theme="light"):
             background-color: {input_bg};
         }}
 
+        QLineEdit[error="true"] {{
+            border-color: {danger};
+        }}
+
+        QFrame#search_frame {{
+            background-color: {card_bg};
+            border: none;
+            border-bottom: 1px solid {border_color};
+        }}
+
+        QLineEdit#search_input {{
+            padding: 8px 12px;
+            font-size: 14px;
+            min-height: 20px;
+        }}
+
+        QLabel#perf_overlay {{
+            background-color: rgba(15, 23, 42, 217);
+            color: #e2e8f0;
+            border: 1px solid #475569;
+            border-radius: 8px;
+            padding: 8px 10px;
+            font-family: "Consolas", "Menlo", monospace;
+            font-size: 12px;
+        }}
+
+        QLabel#search_status {{
+            color: {text_muted};
+            font-size: 13px;
+            min-width: 70px;
+        }}
+
         QPushButton#send_button {{
             background-color: {accent_color};
-            color: white;
+            color: {accent_text};
             border: none;
             border-radius: 12px;
             font-weight: 600;
@@ -128,22 +284,26 @@ def get_app_stylesheet(theme="light"):
         }}
 
         QPushButton#send_button:hover {{
-            background-color: #5a67d8;
+            background-color: {accent_hover};
         }}
 
         QPushButton#send_button:pressed {{
-            background-color: #4c51bf;
+            background-color: {accent_pressed};
         }}
 
-        QLabel#systemMessage {{
-            color: {text_muted};
-            font-style: italic;
-            font-size: 13px;
-            padding: 12px 16px;
-            background-color: {border_color};
-            border-radius: 8px;
-            font-family: "Segoe UI", "Roboto", "Inter", sans-serif;
-            margin: 8px 0;
+        QPushButton#cancel_button {{
+            background-color: transparent;
+            color: {text_secondary};
+            border: 1px solid {border_color};
+            border-radius: 12px;
+            font-weight: 600;
+            font-size: 14px;
+            padding: 12px 20px;
+        }}
+
+        QPushButton#cancel_button:hover {{
+            color: {danger};
+            border-color: {danger};
         }}
 
         QScrollBar:vertical {{
@@ -168,108 +328,27 @@ def get_app_stylesheet(theme="light"):
         QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
             height: 0px;
         }}
-    """
-
-def get_chat_bubble_style(is_user, theme="light"):
-    if is_user:
-        if theme == "light":
-            return """
-                ModernChatBubble {
-                    background-color: #667eea;
-                    border: none;
-                    border-radius: 16px;
-                    margin-left: 80px;
-                    margin-right: 16px;
-                    margin-top: 8px;
-                    margin-bottom: 8px;
-                }
-                #senderLabel { 
-                    color: rgba(255,255,255,0.9); 
-                    font-weight: 600; 
-                    font-size: 12px; 
-                    margin-bottom: 4px;
-                    font-family: "Segoe UI", "Roboto", "Inter", sans-serif;
-                }
-                #messageLabel { 
-                    color: white; 
-                    font-size: 15px; 
-                    line-height: 1.5;
-                    font-family: "Segoe UI", "Roboto", "Inter", sans-serif;
-                }
-            """
-        else:
-            return """
-                ModernChatBubble {
-                    background-color: #60a5fa;
-                    border: none;
-                    border-radius: 16px;
-                    margin-left: 80px;
-                    margin-right: 16px;
-                    margin-top: 8px;
-                    margin-bottom: 8px;
-                }
-                #senderLabel { 
-                    color: rgba(255,255,255,0.9); 
-                    font-weight: 600; 
-                    font-size: 12px; 
-                    margin-bottom: 4px;
-                    font-family: "Segoe UI", "Roboto", "Inter", sans-serif;
-                }
-                #messageLabel { 
-                    color: white; 
-                    font-size: 15px; 
-                    line-height: 1.5;
-                    font-family: "Segoe UI", "Roboto", "Inter", sans-serif;
-                }
-            """
-    else:  # bot message
-        if theme == "light":
-            return """
-                ModernChatBubble {
-                    background-color: white;
-                    border: 1px solid #e2e8f0;
-                    border-radius: 16px;
-                    margin-right: 80px;
-                    margin-left: 16px;
-                    margin-top: 8px;
-                    margin-bottom: 8px;
-                }
-                #senderLabel { 
-                    color: #667eea; 
-                    font-weight: 600; 
-                    font-size: 12px; 
-                    margin-bottom: 4px;
-                    font-family: "Segoe UI", "Roboto", "Inter", sans-serif;
-                }
-                #messageLabel { 
-                    color: #1e293b; 
-                    font-size: 15px; 
-                    line-height: 1.6;
-                    font-family: "Segoe UI", "Roboto", "Inter", sans-serif;
-                }
-            """
-        else:
-            return """
-                ModernChatBubble {
-                    background-color: #1e293b;
-                    border: 1px solid #334155;
-                    border-radius: 16px;
-                    margin-right: 80px;
-                    margin-left: 16px;
-                    margin-top: 8px;
-                    margin-bottom: 8px;
-                }
-                #senderLabel { 
-                    color: #60a5fa; 
-                    font-weight: 600; 
-                    font-size: 12px; 
-                    margin-bottom: 4px;
-                    font-family: "Segoe UI", "Roboto", "Inter", sans-serif;
-                }
-                #messageLabel { 
-                    color: #f1f5f9; 
-                    font-size: 15px; 
-                    line-height: 1.6;
-                    font-family: "Segoe UI", "Roboto", "Inter", sans-serif;
-                }
-            """
+"""
+
+# Low quality drops the buttons' drop-shadow effects; a painted bottom
+# edge keeps them from looking flat at no extra rendering cost
+LOW_QUALITY_STYLESHEET = """
+        ModernButton {{
+            border-bottom: 2px solid {shadow_edge};
+        }}
+"""
+
+
+@lru_cache(maxsize=None)
+def get_app_stylesheet(theme="light", quality="high"):
+    """The app stylesheet for a theme and rendering quality, built once per pair."""
+    tokens = THEMES[theme]
+    stylesheet = APP_STYLESHEET.format(**tokens)
+    if quality == "low":
+        stylesheet += LOW_QUALITY_STYLESHEET.format(**tokens)
+    return stylesheet
+
+
+def get_chat_bubble_colors(kind, theme="light"):
+    """Colors used by the transcript delegate to paint a user/bot/system row."""
+    return THEMES[theme]["bubbles"][kind]
@@ -0,0 +1,12 @@
+# Quick suggestions shown above the input, per chat mode and language.
+# The leading emoji is dropped when a suggestion is copied into the input.
+SUGGESTIONS = {
+    "health": {
+        "en": ["💊 Medication Info", "🏃 Exercise Tips", "🥗 Nutrition Help", "😴 Sleep Issues"],
+        "km": ["💊 ព័ត៌មានឱសថ", "🏃 គន្លឹះហាត់ប្រាណ", "🥗 ជំនួយអាហារូបត្ថម្ភ", "😴 បញ្ហាគេង"],
+    },
+    "symptom": {
+        "en": ["🤒 Fever & Chills", "🤕 Headache", "😷 Cold Symptoms", "🤧 Allergies"],
+        "km": ["🤒 គ្រុនក្តៅ", "🤕 ឈឺក្បាល", "😷 រោគសញ្ញាផ្តាសាយ", "🤧 អាលែកហ្សុី"],
+    },
+}
@@ -5,9 +5,26 @@ UI_TEXT = {
         "health_query_btn": "🩺 General Health",
         "symptom_checker_btn": "🔍 Symptom Checker",
         "language_btn": "🌐 ខ្មែរ",
-        "theme_btn": "☀️",
         "input_placeholder": "Type your message here...",
         "send_btn": "Send",
+        "cancel_btn": "Stop",
+        "queued_note": "⏳ queued",
+        "cancelled_note": "⛔ cancelled",
+        "superseded_note": "↻ replaced",
+        "timed_out_note": "⏱️ timed out",
+        "offline_note": "📚 offline guide",
+        "search_placeholder": "Search this conversation...",
+        "search_no_results": "No matches",
+        "history_gap": "⋯ {count} messages not shown",
+        "tab_title": "Chat {number}",
+        "new_tab_tooltip": "New conversation (Ctrl+T)",
+        "export_tooltip": "Export this conversation (Ctrl+S)",
+        "import_tooltip": "Import conversations (Ctrl+O)",
+        "export_nothing": "Nothing to export yet.",
+        "exported": "📤 Exported {count} messages to {path}",
+        "import_failed": "⚠️ Could not import {path}: {error}",
+        "import_partial": "⚠️ Imported {count} conversation(s) from {path}, then stopped at {error}",
+        "request_timed_out": "⏱️ No answer in time, so the request was stopped. Please try again.",
         "mode_label_health": "💬 <b>General Health Information</b>",
         "mode_label_symptom": "🔍 <b>Symptom Checker</b>",
         "switched_to_health": "✅ Switched to General Health mode.",
@@ -25,9 +42,26 @@ UI_TEXT = {
         "health_query_btn": "🩺 សុខភាពទូទៅ",
         "symptom_checker_btn": "🔍 ពិនិត្យរោគសញ្ញា",
         "language_btn": "🌐 English",
-        "theme_btn": "☀️",
         "input_placeholder": "សរសេរសាររបស់អ្នកនៅទីនេះ...",
         "send_btn": "ផ្ញើ",
+        "cancel_btn": "ឈប់",
+        "queued_note": "⏳ កំពុងរង់ចាំ",
+        "cancelled_note": "⛔ បានបោះបង់",
+        "superseded_note": "↻ បានជំនួស",
+        "timed_out_note": "⏱️ អស់ពេល",
+        "offline_note": "📚 មគ្គុទ្ទេសក៍ក្រៅបណ្តាញ",
+        "search_placeholder": "ស្វែងរកក្នុងការសន្ទនានេះ...",
+        "search_no_results": "រកមិនឃើញ",
+        "history_gap": "⋯ សារ {count} មិនបានបង្ហាញ",
+        "tab_title": "ការសន្ទនា {number}",
+        "new_tab_tooltip": "ការសន្ទនាថ្មី (Ctrl+T)",
+        "export_tooltip": "នាំចេញការសន្ទនានេះ (Ctrl+S)",
+        "import_tooltip": "នាំចូលការសន្ទនា (Ctrl+O)",
+        "export_nothing": "មិនទាន់មានអ្វីត្រូវនាំចេញទេ។",
+        "exported": "📤 បាននាំចេញសារ {count} ទៅ {path}",
+        "import_failed": "⚠️ មិនអាចនាំចូល {path}: {error}",
+        "import_partial": "⚠️ បាននាំចូលការសន្ទនា {count} ពី {path} ហើយបានឈប់នៅ {error}",
+        "request_timed_out": "⏱️ មិនមានចម្លើយទាន់ពេល ដូច្នេះសំណើត្រូវបានបញ្ឈប់។ សូមព្យាយាមម្តងទៀត។",
         "mode_label_health": "💬 <b>ព័ត៌មានសុខភាពទូទៅ</b>",
         "mode_label_symptom": "🔍 <b>ពិនិត្យរោគសញ្ញា</b>",
         "switched_to_health": "✅ បានប្តូរទៅរបៀបសុខភាពទូទៅ។",
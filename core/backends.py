@@ -0,0 +1,267 @@
+"""Model backends: the Gemini SDK and OpenAI-compatible HTTP servers.
+
+A backend turns a prompt into text pieces for a given model name; the
+shared ModelClient in core.client adds pooling, rate limiting, retries and
+cancellation on top. Backends are built from MODEL_BACKENDS in
+config.settings and picked per chat mode through MODE_BACKENDS.
+"""
+import http.client
+import importlib.util
+import json
+import os
+import queue
+import socket
+import threading
+from urllib.parse import urlsplit
+
+from config.settings import GENERATION_CONFIG, MODEL_BACKENDS, REQUEST_WORKERS
+
+# The SDK pulls in protobuf/grpc/google-auth, so it is only imported when the
+# first model is built (normally by warm_up() in the background)
+GEMINI_AVAILABLE = importlib.util.find_spec("google.generativeai") is not None
+
+
+class BackendError(Exception):
+    """A failed backend call already classified into a ClientError kind."""
+
+    def __init__(self, kind, message, retry_after=None):
+        super().__init__(message)
+        self.kind = kind
+        self.retry_after = retry_after
+
+
+def to_chat_messages(prompt):
+    """Gemini ``contents`` (or a plain string) as chat-completions messages."""
+    if isinstance(prompt, str):
+        return [{"role": "user", "content": prompt}]
+    return [
+        {"role": "assistant" if turn["role"] == "model" else "user", "content": "\n".join(turn["parts"])}
+        for turn in prompt
+    ]
+
+
+def _parse(payload, extract):
+    try:
+        return extract(json.loads(payload))
+    except (ValueError, KeyError, IndexError, TypeError, AttributeError):
+        raise BackendError("server", "Unexpected response from the model server.") from None
+
+
+class GeminiBackend:
+    """Google Gemini through the google-generativeai SDK.
+
+    The SDK is configured once and each model object is built on first use,
+    so the transport stays warm between messages.
+    """
+    rate_limited = True
+
+    def __init__(self, api_key, generation_config=None):
+        self.api_key = api_key
+        self.generation_config = dict(generation_config or GENERATION_CONFIG)
+        self._models = {}
+        self._lock = threading.Lock()
+
+    @property
+    def available(self):
+        return GEMINI_AVAILABLE and bool(self.api_key)
+
+    def _get_model(self, model_name):
+        if not GEMINI_AVAILABLE:
+            raise BackendError("unavailable", "Gemini API not available. Install google-generativeai package.")
+        if not self.api_key:
+            raise BackendError("auth", "API key not configured. Please check your .env file.")
+
+        with self._lock:
+            if model_name not in self._models:
+                import google.generativeai as genai
+                genai.configure(api_key=self.api_key)
+                self._models[model_name] = genai.GenerativeModel(model_name)
+            return self._models[model_name]
+
+    def warm_up(self, model_name):
+        """Build the model and make one free call (token count) on its channel,
+        so DNS, TLS and channel set-up are done before the first question."""
+        self._get_model(model_name).count_tokens("ping")
+
+    def iter_text(self, prompt, model_name, stream=True, timeout=None):
+        """Yield the answer in pieces (a single piece when not streaming)."""
+        model = self._get_model(model_name)
+        request_options = {"timeout": timeout} if timeout else None
+        if not stream:
+            response = model.generate_content(prompt, generation_config=self.generation_config,
+                                              request_options=request_options)
+            if response and response.text:
+                yield response.text
+            return
+
+        response = model.generate_content(prompt, generation_config=self.generation_config, stream=True,
+                                          request_options=request_options)
+        for chunk in response:
+            try:
+                piece = chunk.text
+            except ValueError:
+                # Chunks without text parts (e.g. a trailing safety verdict)
+                continue
+            if piece:
+                yield piece
+
+    def close(self):
+        pass
+
+
+class HTTPBackend:
+    """An OpenAI-compatible ``/chat/completions`` server (llama.cpp, vLLM, Ollama...).
+
+    Connections are HTTP/1.1 keep-alive and pooled, so consecutive requests
+    skip the TCP (and TLS) handshake. Streaming uses server-sent events.
+    """
+    rate_limited = False
+    available = True
+
+    def __init__(self, base_url, api_key=None, generation_config=None, pool_size=REQUEST_WORKERS,
+                 connect_timeout=5):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported backend URL: {base_url!r}")
+        self._connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = parts.path.rstrip("/") + "/chat/completions"
+        self.api_key = api_key
+        self.generation_config = dict(generation_config or GENERATION_CONFIG)
+        self.connect_timeout = connect_timeout
+        self._idle = queue.LifoQueue(maxsize=pool_size)
+
+    def _connect(self):
+        connection = self._connection_class(self.host, self.port, timeout=self.connect_timeout)
+        connection.connect()
+        # Small request writes must not wait on delayed ACKs
+        connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return connection
+
+    def _checkout(self):
+        try:
+            return self._idle.get_nowait(), True
+        except queue.Empty:
+            return self._connect(), False
+
+    def _checkin(self, connection):
+        try:
+            self._idle.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def _body(self, prompt, model_name, stream):
+        config = self.generation_config
+        body = {"model": model_name, "messages": to_chat_messages(prompt), "stream": stream}
+        for ours, theirs in (("temperature", "temperature"), ("top_p", "top_p"),
+                             ("max_output_tokens", "max_tokens")):
+            if ours in config:
+                body[theirs] = config[ours]
+        return json.dumps(body).encode("utf-8")
+
+    def _headers(self, stream):
+        headers = {"Content-Type": "application/json",
+                   "Accept": "text/event-stream" if stream else "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    def _open(self, body, headers, timeout):
+        """Send the request and return (connection, response)."""
+        connection, reused = self._checkout()
+        while True:
+            try:
+                connection.sock.settimeout(timeout or None)
+                connection.request("POST", self.path, body=body, headers=headers)
+                return connection, connection.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                connection.close()
+                if not reused:
+                    raise
+            except BaseException:
+                connection.close()
+                raise
+            # The server closed the idle pooled connection; retry on a fresh one
+            connection, reused = self._connect(), False
+
+    @staticmethod
+    def _raise_for_status(response):
+        if response.status == 200:
+            return
+        detail = response.read().decode("utf-8", "replace")[:200]
+        if response.status in (401, 403):
+            raise BackendError("auth", "The model server rejected the API key.")
+        if response.status == 429:
+            retry_after = response.getheader("Retry-After")
+            try:
+                retry_after = float(retry_after) if retry_after else None
+            except ValueError:
+                retry_after = None
+            raise BackendError("quota", "The model server is busy. Please try again later.", retry_after)
+        if response.status >= 500 or response.status == 408:
+            raise BackendError("connection", f"Model server error ({response.status}). Please try again.")
+        raise BackendError("server", f"Model server error ({response.status}): {detail}")
+
+    def warm_up(self, model_name):
+        """Open a pooled connection ahead of the first request."""
+        if self._idle.empty():
+            self._checkin(self._connect())
+
+    def iter_text(self, prompt, model_name, stream=True, timeout=None):
+        """Yield the answer in pieces (a single piece when not streaming)."""
+        connection, response = self._open(self._body(prompt, model_name, stream), self._headers(stream), timeout)
+        reusable = False
+        try:
+            self._raise_for_status(response)
+            if not stream:
+                payload = response.read()
+                reusable = not response.will_close
+                text = _parse(payload, lambda data: data["choices"][0]["message"].get("content"))
+                if text:
+                    yield text
+                return
+
+            while True:
+                line = response.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    response.read()
+                    break
+                piece = _parse(data, lambda event: (event.get("choices") or [{}])[0].get("delta", {}).get("content"))
+                if piece:
+                    yield piece
+            reusable = not response.will_close
+        finally:
+            # A stream abandoned halfway (cancel, error) leaves unread bytes on
+            # the socket, so only fully read responses go back to the pool
+            if reusable and response.isclosed():
+                self._checkin(connection)
+            else:
+                connection.close()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def create_backends(gemini_api_key=None, specs=MODEL_BACKENDS):
+    """Build every backend named in ``specs`` (see MODEL_BACKENDS)."""
+    backends = {}
+    for name, spec in specs.items():
+        if spec["type"] == "gemini":
+            backends[name] = GeminiBackend(gemini_api_key, spec.get("generation_config"))
+        elif spec["type"] == "http":
+            api_key = os.environ.get(spec["api_key_env"]) if spec.get("api_key_env") else None
+            backends[name] = HTTPBackend(spec["base_url"], api_key, spec.get("generation_config"))
+        else:
+            raise ValueError(f"Unknown backend type for {name!r}: {spec['type']!r}")
+    return backends
@@ -0,0 +1,333 @@
+import json
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+from config.settings import MODE_BACKENDS, REQUEST_WORKERS, RETRY_ATTEMPTS
+from core.backends import BackendError, GEMINI_AVAILABLE, create_backends
+from core.executor import FairExecutor
+from core.rate_limit import RATE_LIMITER, retry_after_hint, backoff_delay
+
+
+class ClientError(Exception):
+    """A failed model request with a user-facing message and an error kind.
+
+    ``retry_after`` is the server's retry hint in seconds, when it sent one.
+    """
+
+    def __init__(self, kind, message, retry_after=None):
+        super().__init__(message)
+        self.kind = kind
+        self.retry_after = retry_after
+
+    @property
+    def retryable(self):
+        return self.kind in ("quota", "connection")
+
+
+def classify_error(exc):
+    """Map an SDK/transport exception to a ClientError."""
+    if isinstance(exc, ClientError):
+        return exc
+    if isinstance(exc, BackendError):
+        return ClientError(exc.kind, str(exc), exc.retry_after)
+    if isinstance(exc, OSError):
+        return ClientError("connection", "Connection error. Please check your internet connection.")
+    error_msg = str(exc).lower()
+    if "api_key" in error_msg or "invalid" in error_msg:
+        return ClientError("auth", "Invalid API key. Please check your configuration.")
+    if "quota" in error_msg or "limit" in error_msg:
+        return ClientError("quota", "API quota exceeded. Please try again later.", retry_after_hint(exc))
+    if "blocked" in error_msg or "safety" in error_msg:
+        return ClientError("blocked", "Response was blocked. Please rephrase your question.")
+    return ClientError("connection", "Connection error. Please check your internet connection.",
+                       retry_after_hint(exc))
+
+
+def _check_cancelled(cancel_event):
+    if cancel_event is not None and cancel_event.is_set():
+        raise ClientError("cancelled", "Request cancelled.")
+
+
+class _Flight:
+    """One model call shared by every identical request made while it runs.
+
+    Doubles as the call's cancel event: it only counts as set once every
+    subscriber has cancelled, so one user giving up does not cut the answer
+    off for the others.
+    """
+    POLL_INTERVAL = 0.05
+
+    def __init__(self, key):
+        self.key = key
+        self.lock = threading.Lock()
+        self.subscribers = []  # (future, on_chunk, cancel_event)
+        self.on_start = []
+        self.started = False
+        self.text = ""
+
+    def subscribe(self, on_chunk, cancel_event, on_start):
+        """Attach a request and return its future.
+
+        A late subscriber is caught up (``on_start``, then the text streamed
+        so far) under the lock that ``publish`` holds, so no newer chunk can
+        reach it before the replay.
+        """
+        future = Future()
+        with self.lock:
+            self.subscribers.append((future, on_chunk, cancel_event))
+            if on_start and self.started:
+                on_start()
+            elif on_start:
+                self.on_start.append(on_start)
+            if self.text and on_chunk:
+                on_chunk(self.text)
+        return future
+
+    def start(self):
+        with self.lock:
+            self.started = True
+            callbacks, self.on_start = self.on_start, []
+        for callback in callbacks:
+            callback()
+
+    def publish(self, text):
+        with self.lock:
+            self.text = text
+            for _, on_chunk, _ in self.subscribers:
+                if on_chunk:
+                    on_chunk(text)
+
+    def is_set(self):
+        with self.lock:
+            events = [cancel_event for _, _, cancel_event in self.subscribers]
+        return all(event is not None and event.is_set() for event in events)
+
+    def wait(self, timeout):
+        deadline = time.monotonic() + timeout
+        while not self.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(self.POLL_INTERVAL, remaining))
+        return True
+
+    def resolve(self, text=None, error=None, cancelled=False):
+        for future, _, cancel_event in self.subscribers:
+            if cancelled:
+                future.cancel()
+            elif cancel_event is not None and cancel_event.is_set():
+                future.set_exception(ClientError("cancelled", "Request cancelled."))
+            elif error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(text)
+
+
+class ModelClient:
+    """Long-lived model client shared by every request in the process.
+
+    Backends are built once so their transports stay warm between messages,
+    and requests run on a bounded pool that is shut down with the owner.
+    """
+
+    def __init__(self, backends, routes=MODE_BACKENDS, max_workers=REQUEST_WORKERS,
+                 rate_limiter=RATE_LIMITER, retries=RETRY_ATTEMPTS, coalesce=True):
+        self.backends = backends
+        self.routes = routes
+        self.rate_limiter = rate_limiter
+        self.retries = retries
+        self.coalesce = coalesce
+        self.coalesced = 0
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+        self._executor = FairExecutor(max_workers=max_workers, thread_name_prefix="model")
+
+    @classmethod
+    def from_settings(cls, gemini_api_key=None, **kwargs):
+        return cls(create_backends(gemini_api_key), **kwargs)
+
+    def route(self, mode):
+        """Return (backend, model name) for a chat mode, as routed by MODE_BACKENDS."""
+        route = self.routes.get(mode) or self.routes["health"]
+        return self.backends[route["backend"]], route["model"]
+
+    def model_id(self, mode):
+        """The backend and model answering ``mode``, as "backend/model" (stored with each answer)."""
+        route = self.routes.get(mode) or self.routes["health"]
+        return f"{route['backend']}/{route['model']}"
+
+    def available(self, mode):
+        """Whether the mode's backend is configured (SDK installed, key set...)."""
+        return self.route(mode)[0].available
+
+    def warm_up(self):
+        """Prepare every routed backend (SDK import, model build, connection) ahead of the first request."""
+        def run():
+            failures = []
+            for name, model_name in {(route["backend"], route["model"]) for route in self.routes.values()}:
+                backend = self.backends[name]
+                if backend.available:
+                    try:
+                        backend.warm_up(model_name)
+                    except Exception as e:
+                        failures.append(e)
+            if failures:
+                raise failures[0]
+        return self._executor.submit(run)
+
+    def _flight_key(self, prompt, mode):
+        route = self.routes.get(mode) or self.routes["health"]
+        backend = self.backends[route["backend"]]
+        return json.dumps([route["backend"], route["model"], backend.generation_config, prompt],
+                          sort_keys=True, ensure_ascii=False)
+
+    def _join(self, prompt, mode, on_chunk, cancel_event, on_start):
+        """Return (flight, future, leader): the caller leads a new flight or follows a running one.
+
+        Requests with the same backend, model, generation config and final
+        prompt share a flight, and every follower gets its chunks and result.
+        """
+        key = self._flight_key(prompt, mode) if self.coalesce else None
+        with self._flights_lock:
+            flight = self._flights.get(key) if key is not None else None
+            leader = flight is None
+            if leader:
+                flight = _Flight(key)
+                if key is not None:
+                    self._flights[key] = flight
+            else:
+                self.coalesced += 1
+            # Under the registry lock, so the flight cannot resolve before we are on its list
+            future = flight.subscribe(on_chunk, cancel_event, on_start)
+        return flight, future, leader
+
+    def _fly(self, flight, prompt, stream, timeout, mode):
+        flight.start()
+        text = error = None
+        try:
+            text = self._call(prompt, flight.publish, stream, flight, timeout, mode)
+        except Exception as e:
+            error = e
+        finally:
+            # Nobody may join once the result is being handed out
+            with self._flights_lock:
+                if self._flights.get(flight.key) is flight:
+                    del self._flights[flight.key]
+        flight.resolve(text, error)
+
+    def _abort(self, flight):
+        with self._flights_lock:
+            if self._flights.get(flight.key) is flight:
+                del self._flights[flight.key]
+        flight.resolve(cancelled=True)
+
+    def generate(self, prompt, on_chunk=None, stream=True, cancel_event=None, timeout=None, mode="health"):
+        """Run one request on the calling thread and return the answer text.
+
+        ``prompt`` is a string or a list of Gemini ``contents`` turns and goes
+        to the backend routed for ``mode``. With ``stream`` set, ``on_chunk``
+        is called with the accumulated text every time a chunk arrives.
+        Setting ``cancel_event`` aborts the request before it starts, between
+        chunks or during a backoff wait; ``timeout`` bounds the whole call,
+        retries included, in seconds, but not time spent waiting for the rate
+        limiter. An identical request already in flight is waited on instead
+        of sent again, under the first request's ``timeout``.
+        """
+        flight, future, leader = self._join(prompt, mode, on_chunk, cancel_event, None)
+        if leader:
+            self._fly(flight, prompt, stream, timeout, mode)
+            return future.result()
+
+        while True:
+            _check_cancelled(cancel_event)
+            try:
+                return future.result(timeout=_Flight.POLL_INTERVAL)
+            except FutureTimeout:
+                continue
+
+    def _call(self, prompt, on_chunk, stream, cancel_event, timeout, mode):
+        """Call the routed backend, retrying quota/connection errors with backoff until text streams."""
+        backend, model_name = self.route(mode)
+        deadline = None
+        streamed = False
+
+        def forward(text):
+            nonlocal streamed
+            streamed = True
+            if on_chunk:
+                on_chunk(text)
+
+        attempt = 0
+        while True:
+            attempt += 1
+            # Waiting for a rate-limit token paces the request rather than
+            # failing it, so that wait does not count against ``timeout``
+            if backend.rate_limited:
+                waited = time.monotonic()
+                self.rate_limiter.acquire(cancel_event=cancel_event)
+                _check_cancelled(cancel_event)
+                if deadline is not None:
+                    deadline += time.monotonic() - waited
+            if deadline is None and timeout:
+                deadline = time.monotonic() + timeout
+            try:
+                return self._attempt(backend, model_name, prompt, forward, stream, cancel_event, deadline)
+            except ClientError as error:
+                # Retrying after partial output would show the answer twice
+                if not error.retryable or streamed or attempt > self.retries:
+                    raise
+                if error.retry_after and backend.rate_limited:
+                    self.rate_limiter.penalize(error.retry_after)
+                delay = backoff_delay(attempt, hint=error.retry_after)
+                if deadline is not None and time.monotonic() + delay >= deadline:
+                    raise
+                if cancel_event is None:
+                    time.sleep(delay)
+                elif cancel_event.wait(delay):
+                    raise ClientError("cancelled", "Request cancelled.")
+
+    def _attempt(self, backend, model_name, prompt, on_chunk, stream, cancel_event, deadline):
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        text = ""
+        try:
+            _check_cancelled(cancel_event)
+            pieces = backend.iter_text(prompt, model_name, stream, remaining)
+            try:
+                for piece in pieces:
+                    _check_cancelled(cancel_event)
+                    text += piece
+                    if stream:
+                        on_chunk(text)
+            finally:
+                # Releases the backend's connection when the loop stops early
+                pieces.close()
+        except Exception as e:
+            raise classify_error(e) from e
+
+        if not text:
+            raise ClientError("empty", "Empty response from AI. Please try again.")
+        return text
+
+    def submit(self, prompt, on_chunk=None, stream=True, cancel_event=None, timeout=None, on_start=None,
+               mode="health", owner=None):
+        """Queue a request on the pool and return its Future.
+
+        ``on_start`` is called on the pool thread when the request leaves the
+        queue. Queued requests are started round-robin by ``owner``. A
+        request identical to one in flight takes no pool thread: its Future
+        settles with the running call, and ``timeout`` is the first
+        request's.
+        """
+        flight, future, leader = self._join(prompt, mode, on_chunk, cancel_event, on_start)
+        if leader:
+            call = self._executor.submit_for(owner, self._fly, flight, prompt, stream, timeout, mode)
+            # Dropped from the queue by shutdown(): settle the waiting futures too
+            call.add_done_callback(lambda call: call.cancelled() and self._abort(flight))
+        return future
+
+    def shutdown(self, wait=False):
+        """Drop queued requests, release the pool threads and close the backends."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        for backend in self.backends.values():
+            backend.close()
@@ -0,0 +1,92 @@
+import re
+
+from config.settings import CONTEXT_TOKEN_BUDGET, CONTEXT_SUMMARY_TOKENS
+
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?។])\s")
+_MARKUP_RE = re.compile(r"[*_`#]+")
+
+
+def estimate_tokens(text):
+    """Cheap token estimate: ~4 Latin characters or ~2 Khmer characters per token."""
+    ascii_chars = sum(1 for char in text if char < "\x80")
+    return ascii_chars // 4 + (len(text) - ascii_chars) // 2 + 1
+
+
+def _clip(text, limit):
+    text = _MARKUP_RE.sub("", " ".join(text.split()))
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+def extractive_summary(previous, exchanges, token_budget):
+    """Default summarizer: the question and first sentence of each answer.
+
+    Runs locally so compaction never costs an extra model call. The oldest
+    lines are dropped first when the summary outgrows ``token_budget``.
+    """
+    lines = previous.splitlines() if previous else []
+    for question, answer in exchanges:
+        first_sentence = _SENTENCE_END_RE.split(answer.strip(), maxsplit=1)[0]
+        lines.append(f"- Q: {_clip(question, 120)} A: {_clip(first_sentence, 160)}")
+    while len(lines) > 1 and estimate_tokens("\n".join(lines)) > token_budget:
+        lines.pop(0)
+    return "\n".join(lines)
+
+
+class ConversationContext:
+    """Builds multi-turn Gemini requests from recent exchanges under a token budget.
+
+    The newest exchanges that fit in ``token_budget`` are sent verbatim.
+    Exchanges that fall out of that window are folded into a rolling
+    summary, which is cached and only recomputed when the window moves past
+    more exchanges, so request size stays bounded however long the
+    conversation gets.
+    """
+
+    def __init__(self, token_budget=CONTEXT_TOKEN_BUDGET, summary_budget=CONTEXT_SUMMARY_TOKENS,
+                 summarizer=extractive_summary):
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+        self.summarizer = summarizer
+        self.summary = ""
+        self._exchanges = []  # (question, answer, tokens)
+        self._summarized = 0  # exchanges before this index are in the summary
+        self.revision = 0  # bumped on every change, so callers can tell a prompt went stale
+
+    def __len__(self):
+        return len(self._exchanges)
+
+    def add_exchange(self, question, answer):
+        tokens = estimate_tokens(question) + estimate_tokens(answer)
+        self._exchanges.append((question, answer, tokens))
+        self.revision += 1
+
+    def clear(self):
+        self.summary = ""
+        self._exchanges.clear()
+        self._summarized = 0
+        self.revision += 1
+
+    def build(self, prompt):
+        """Return Gemini ``contents`` for ``prompt`` preceded by the history window."""
+        budget = self.token_budget - estimate_tokens(prompt) - estimate_tokens(self.summary)
+        start = len(self._exchanges)
+        while start > self._summarized and self._exchanges[start - 1][2] <= budget:
+            start -= 1
+            budget -= self._exchanges[start][2]
+
+        if start > self._summarized:
+            evicted = [(question, answer) for question, answer, _ in self._exchanges[self._summarized:start]]
+            self.summary = self.summarizer(self.summary, evicted, self.summary_budget)
+            self._summarized = start
+            # The summary shrank the budget the window was sized with
+            return self.build(prompt)
+
+        contents = []
+        if self.summary:
+            contents.append({"role": "user", "parts": ["Summary of our conversation so far:\n" + self.summary]})
+            contents.append({"role": "model", "parts": ["Understood."]})
+        for question, answer, _ in self._exchanges[start:]:
+            contents.append({"role": "user", "parts": [question]})
+            contents.append({"role": "model", "parts": [answer]})
+        contents.append({"role": "user", "parts": [prompt]})
+        return contents
@@ -0,0 +1,263 @@
+import threading
+import time
+import uuid
+
+from config.settings import CONVERSATION_DB_PATH, HISTORY_PAGE_SIZE
+from core.search_index import MIN_PREFIX_LENGTH
+from core.sqlite_writer import BackgroundWriter, connect
+from core.tokenizer import tokenize
+
+# Messages per round trip when streaming history in or out
+STREAM_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    started_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL REFERENCES sessions(id),
+    created_at REAL NOT NULL,
+    kind TEXT NOT NULL,
+    sender TEXT NOT NULL,
+    text TEXT NOT NULL,
+    mode TEXT,
+    language TEXT
+);
+CREATE INDEX IF NOT EXISTS messages_by_session ON messages(session_id, id);
+"""
+
+# Full-text index over message text. Rows hold the core.tokenizer terms
+# (stemmed words, Khmer syllable bigrams) joined by spaces; the ascii
+# tokenizer keeps each of them whole, so matching works like TranscriptIndex
+_TERMS_TABLE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS message_terms
+USING fts5(terms, content='', tokenize="ascii tokenchars ''''")
+"""
+
+
+def _index_terms(text):
+    return " ".join(tokenize(text))
+
+
+def _index_existing_messages(connection):
+    connection.execute(_TERMS_TABLE)
+    rows = connection.execute("SELECT id, text FROM messages")
+    while True:
+        batch = rows.fetchmany(STREAM_BATCH)
+        if not batch:
+            return
+        connection.executemany("INSERT INTO message_terms (rowid, terms) VALUES (?, ?)",
+                               [(message_id, _index_terms(text)) for message_id, text in batch])
+
+
+# Schema upgrades, applied in order on open; PRAGMA user_version counts the
+# applied ones. A step is an SQL script or a function of the connection
+_MIGRATIONS = (
+    # 1: per-answer latency and the model that produced it, for exports
+    "ALTER TABLE messages ADD COLUMN latency_ms REAL; ALTER TABLE messages ADD COLUMN model TEXT;",
+    # 2: full-text search over stored history
+    _index_existing_messages,
+)
+
+_COLUMNS = "id, session_id, created_at, kind, sender, text, mode, language, latency_ms, model"
+
+
+class StoredMessage:
+    """A message row read back from the store."""
+
+    def __init__(self, message_id, session_id, created_at, kind, sender, text, mode, language,
+                 latency_ms=None, model=None):
+        self.id = message_id
+        self.session_id = session_id
+        self.created_at = created_at
+        self.kind = kind
+        self.sender = sender
+        self.text = text
+        self.mode = mode
+        self.language = language
+        self.latency_ms = latency_ms
+        self.model = model
+
+
+class ConversationStore:
+    """Append-only conversation history in SQLite (WAL mode).
+
+    Appends are queued to a writer thread, which commits whatever has
+    accumulated in one transaction, so the GUI thread never waits on disk.
+    Reads use their own connection and return fixed-size pages, newest
+    first, so restoring a session costs the same however long it is.
+    Search runs against a full-text index in the database, so finding an
+    old message never requires loading the session.
+    """
+
+    def __init__(self, path=CONVERSATION_DB_PATH):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        writer = connect(path)
+        writer.executescript(_SCHEMA)
+        self._migrate(writer)
+        self._reader = connect(path)
+        self._reader_lock = threading.Lock()
+        self._writer = BackgroundWriter(writer, "conversation-store")
+
+    @staticmethod
+    def _migrate(connection):
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        for number, step in enumerate(_MIGRATIONS[version:], version + 1):
+            if callable(step):
+                connection.execute("BEGIN")
+                step(connection)
+                connection.execute(f"PRAGMA user_version = {number}")
+                connection.commit()
+            else:
+                connection.executescript(f"BEGIN; {step} PRAGMA user_version = {number}; COMMIT;")
+
+    def new_session(self):
+        session_id = uuid.uuid4().hex
+        self._writer.execute("INSERT INTO sessions VALUES (?, ?)", (session_id, time.time()))
+        return session_id
+
+    def latest_session(self):
+        """Return the id of the most recent session that has messages, if any."""
+        with self._reader_lock:
+            row = self._reader.execute(
+                "SELECT session_id FROM messages ORDER BY id DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def sessions(self):
+        """Return (session id, started at, message count) for every session with messages, oldest first."""
+        with self._reader_lock:
+            return self._reader.execute(
+                "SELECT sessions.id, sessions.started_at, COUNT(*) FROM sessions"
+                " JOIN messages ON messages.session_id = sessions.id"
+                " GROUP BY sessions.id ORDER BY MIN(messages.id)").fetchall()
+
+    def append(self, session_id, kind, sender, text, mode=None, language=None, created_at=None,
+               latency_ms=None, model=None):
+        """Queue a message for writing; returns immediately.
+
+        ``latency_ms`` and ``model`` describe how an answer was produced.
+        """
+        self._writer.execute_all((
+            ("INSERT INTO messages (session_id, created_at, kind, sender, text, mode, language, latency_ms, model)"
+             " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+             (session_id, created_at or time.time(), kind, sender, text, mode, language, latency_ms, model)),
+            ("INSERT INTO message_terms (rowid, terms) VALUES (last_insert_rowid(), ?)", (_index_terms(text),)),
+        ))
+
+    def import_messages(self, messages, flush_every=STREAM_BATCH, new_sessions=None):
+        """Append ``messages`` (an iterable of StoredMessage) under new sessions.
+
+        Each source session gets a fresh session, so importing never mixes
+        into an existing conversation. The queue is flushed every
+        ``flush_every`` messages, which keeps memory flat for a streamed
+        iterable of any length. Returns the new session ids in source order;
+        they are also appended to ``new_sessions`` as they are created, so
+        a caller still has them if ``messages`` raises part-way.
+        """
+        sessions = {}
+        if new_sessions is None:
+            new_sessions = []
+        for count, message in enumerate(messages, 1):
+            session_id = sessions.get(message.session_id)
+            if session_id is None:
+                session_id = sessions[message.session_id] = self.new_session()
+                new_sessions.append(session_id)
+            self.append(session_id, message.kind, message.sender, message.text, message.mode,
+                        message.language, message.created_at, message.latency_ms, message.model)
+            if count % flush_every == 0:
+                self.flush()
+        self.flush()
+        return list(new_sessions)
+
+    def load_page(self, session_id, before_id=None, limit=HISTORY_PAGE_SIZE):
+        """Return up to ``limit`` messages older than ``before_id``, oldest first."""
+        query = f"SELECT {_COLUMNS} FROM messages WHERE session_id = ?"
+        params = [session_id]
+        if before_id is not None:
+            query += " AND id < ?"
+            params.append(before_id)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        with self._reader_lock:
+            rows = self._reader.execute(query, params).fetchall()
+        return [StoredMessage(*row) for row in reversed(rows)]
+
+    def load_window(self, session_id, message_id, before_id=None, limit=HISTORY_PAGE_SIZE):
+        """Return about ``limit`` messages centred on ``message_id``, oldest first.
+
+        Newer rows stop short of ``before_id`` (the oldest row already shown).
+        """
+        older = f"SELECT {_COLUMNS} FROM messages WHERE session_id = ? AND id <= ? ORDER BY id DESC LIMIT ?"
+        newer = f"SELECT {_COLUMNS} FROM messages WHERE session_id = ? AND id > ?"
+        params = [session_id, message_id]
+        if before_id is not None:
+            newer += " AND id < ?"
+            params.append(before_id)
+        with self._reader_lock:
+            rows = self._reader.execute(older, (session_id, message_id, limit - limit // 2)).fetchall()
+            rows.reverse()
+            rows += self._reader.execute(newer + " ORDER BY id LIMIT ?", params + [limit // 2]).fetchall()
+        return [StoredMessage(*row) for row in rows]
+
+    def count_between(self, session_id, after_id, before_id):
+        """Number of the session's messages with ids strictly between the two."""
+        with self._reader_lock:
+            return self._reader.execute(
+                "SELECT COUNT(*) FROM messages WHERE session_id = ? AND id > ? AND id < ?",
+                (session_id, after_id, before_id)).fetchone()[0]
+
+    def search(self, session_id, query, up_to_id=None):
+        """Ids of the session's messages matching every term of ``query``, oldest first.
+
+        Terms match as prefixes, as in TranscriptIndex. ``up_to_id`` limits
+        the search to messages stored before the caller's own.
+        """
+        terms = sorted(set(tokenize(query)))
+        if not terms:
+            return []
+        match = " AND ".join(f'"{term}"*' if len(term) >= MIN_PREFIX_LENGTH else f'"{term}"' for term in terms)
+        sql = ("SELECT messages.id FROM message_terms JOIN messages ON messages.id = message_terms.rowid"
+               " WHERE message_terms MATCH ? AND messages.session_id = ?")
+        params = [match, session_id]
+        if up_to_id is not None:
+            sql += " AND messages.id <= ?"
+            params.append(up_to_id)
+        with self._reader_lock:
+            return [row[0] for row in self._reader.execute(sql + " ORDER BY messages.id", params)]
+
+    def iter_messages(self, session_id=None, batch_size=STREAM_BATCH):
+        """Yield the messages of one session (default: all), oldest first.
+
+        Rows are fetched ``batch_size`` at a time on a connection of the
+        generator's own, so exporting a long history neither loads it into
+        memory nor holds up page loads. Queued appends are flushed first.
+        """
+        self.flush()
+        query = f"SELECT {_COLUMNS} FROM messages"
+        params = ()
+        if session_id is not None:
+            query += " WHERE session_id = ?"
+            params = (session_id,)
+        connection = connect(self.path)
+        try:
+            cursor = connection.execute(query + " ORDER BY id", params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    return
+                for row in rows:
+                    yield StoredMessage(*row)
+        finally:
+            connection.close()
+
+    def flush(self):
+        """Block until every queued append has been committed."""
+        self._writer.flush()
+
+    def close(self):
+        self._writer.close()
+        with self._reader_lock:
+            self._reader.close()
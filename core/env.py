@@ -0,0 +1,28 @@
+import os
+
+try:
+    from dotenv import load_dotenv
+    DOTENV_AVAILABLE = True
+except ImportError:
+    DOTENV_AVAILABLE = False
+
+PLACEHOLDER_API_KEY = "your_gemini_api_key_here"
+
+
+def load_env_file(base_dir):
+    """Load config/.env (or .env) under base_dir and return the file used."""
+    if not DOTENV_AVAILABLE:
+        return None
+    for env_file in [base_dir / "config" / ".env", base_dir / ".env"]:
+        if env_file.exists():
+            load_dotenv(str(env_file))
+            return env_file
+    return None
+
+
+def get_api_key():
+    """Return the configured Gemini API key, or None if missing/placeholder."""
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if not api_key or api_key == PLACEHOLDER_API_KEY:
+        return None
+    return api_key
@@ -0,0 +1,98 @@
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+
+
+class FairExecutor:
+    """Bounded thread pool that takes turns between its callers.
+
+    Work is queued per ``owner`` (a conversation tab, say) and a free worker
+    always takes the next item from the owner that has waited longest for
+    a turn, so one owner with a backlog cannot hold up the others. Like
+    ThreadPoolExecutor, threads are started on demand up to ``max_workers``,
+    and ``shutdown(cancel_futures=True)`` cancels whatever is still queued.
+    """
+
+    def __init__(self, max_workers, thread_name_prefix="fair"):
+        if max_workers <= 0:
+            raise ValueError("max_workers must be greater than 0")
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self._queues = OrderedDict()  # owner -> deque of (future, fn, args, kwargs), in turn order
+        self._condition = threading.Condition()
+        self._threads = []
+        self._idle = 0
+        self._shutdown = False
+
+    def submit(self, fn, *args, **kwargs):
+        """Queue ``fn`` with no owner (all such calls share one turn)."""
+        return self.submit_for(None, fn, *args, **kwargs)
+
+    def submit_for(self, owner, fn, *args, **kwargs):
+        """Queue ``fn(*args, **kwargs)`` on ``owner``'s queue and return its Future."""
+        future = Future()
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            queue = self._queues.get(owner)
+            if queue is None:
+                queue = self._queues[owner] = deque()
+            queue.append((future, fn, args, kwargs))
+            if self._idle:
+                # Claimed here, so a burst of submits still starts new threads
+                self._idle -= 1
+                self._condition.notify()
+            elif len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._work, daemon=True,
+                                          name=f"{self.thread_name_prefix}_{len(self._threads)}")
+                self._threads.append(thread)
+                thread.start()
+        return future
+
+    def _next(self):
+        """Pop the next call in round-robin order; None once shut down and drained."""
+        with self._condition:
+            while not self._queues:
+                if self._shutdown:
+                    return None
+                self._idle += 1
+                self._condition.wait()
+            owner, queue = next(iter(self._queues.items()))
+            item = queue.popleft()
+            # The owner goes to the back of the line, or leaves it when drained
+            del self._queues[owner]
+            if queue:
+                self._queues[owner] = queue
+            return item
+
+    def _work(self):
+        while True:
+            item = self._next()
+            if item is None:
+                return
+            future, fn, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        with self._condition:
+            self._shutdown = True
+            cancelled = []
+            if cancel_futures:
+                for queue in self._queues.values():
+                    cancelled.extend(future for future, _, _, _ in queue)
+                self._queues.clear()
+            self._condition.notify_all()
+            threads = list(self._threads)
+        # Outside the lock: cancelling runs the futures' done callbacks
+        for future in cancelled:
+            future.cancel()
+        if wait:
+            for thread in threads:
+                thread.join()
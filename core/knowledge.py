@@ -0,0 +1,141 @@
+"""BM25 search over the bundled English/Khmer health FAQ.
+
+The inverted index is prebuilt into config/knowledge_index.json so start-up
+does no tokenizing. Rebuild it after editing config/knowledge_base.py:
+
+    python -m core.knowledge
+"""
+import hashlib
+import json
+import math
+from collections import Counter
+
+from config.knowledge_base import KNOWLEDGE_BASE
+from config.settings import KNOWLEDGE_INDEX_PATH
+from core.tokenizer import tokenize, TOKENIZER_VERSION
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Question phrasings describe what an entry is about, so they outweigh the answer text
+QUESTION_WEIGHT = 3
+LANGUAGES = ("en", "km")
+
+
+def corpus_fingerprint(entries):
+    payload = json.dumps([TOKENIZER_VERSION, entries], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def build_index(entries):
+    """Inverted index with one document per (entry, language)."""
+    docs, lengths, topics, postings = [], [], [], {}
+    for entry in entries:
+        for language in LANGUAGES:
+            fields = entry[language]
+            question_terms = tokenize(" ".join(fields["questions"]))
+            terms = Counter(question_terms * QUESTION_WEIGHT + tokenize(fields["answer"]))
+            doc = len(docs)
+            docs.append([entry["id"], language])
+            lengths.append(sum(terms.values()))
+            topics.append(sorted(set(question_terms)))
+            for term, frequency in terms.items():
+                postings.setdefault(term, []).append([doc, frequency])
+    return {
+        "fingerprint": corpus_fingerprint(entries),
+        "docs": docs,
+        "lengths": lengths,
+        "topics": topics,
+        "postings": postings,
+    }
+
+
+class KnowledgeHit:
+    """One ranked FAQ entry, answered in the requested language."""
+
+    def __init__(self, entry_id, answer, score, confidence):
+        self.entry_id = entry_id
+        self.answer = answer
+        self.score = score
+        self.confidence = confidence
+
+
+class KnowledgeBase:
+    """Ranks FAQ entries for a question with BM25.
+
+    ``confidence`` is the idf-weighted share of the query's terms found in
+    the entry's question phrasings: 1.0 means everything the user asked about
+    is what the entry covers, which is the bar for answering without the
+    model. The index is loaded on first search.
+    """
+
+    def __init__(self, entries=KNOWLEDGE_BASE, index_path=KNOWLEDGE_INDEX_PATH):
+        self.entries = {entry["id"]: entry for entry in entries}
+        self._entry_list = entries
+        self.index_path = index_path
+        self._index = None
+
+    def _load(self):
+        fingerprint = corpus_fingerprint(self._entry_list)
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = None
+        if index is None or index.get("fingerprint") != fingerprint:
+            print("Knowledge index missing or stale, building it in memory (run: python -m core.knowledge)")
+            index = build_index(self._entry_list)
+        index["topics"] = [set(terms) for terms in index["topics"]]
+        count = len(index["docs"])
+        index["idf"] = {term: math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+                        for term, docs in index["postings"].items()}
+        index["avgdl"] = sum(index["lengths"]) / max(1, count)
+        self._index = index
+        return index
+
+    def search(self, query, language="en", limit=3):
+        index = self._index or self._load()
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        idf = index["idf"]
+        # Terms the corpus has never seen count fully against confidence
+        unseen_weight = max(idf.values(), default=1.0)
+        total_weight = sum(idf.get(term, unseen_weight) for term in terms)
+
+        scores = Counter()
+        lengths, avgdl = index["lengths"], index["avgdl"]
+        for term in terms:
+            for doc, frequency in index["postings"].get(term, ()):
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[doc] / avgdl)
+                scores[doc] += idf[term] * frequency * (BM25_K1 + 1) / (frequency + norm)
+
+        hits, seen = [], set()
+        for doc, score in scores.most_common():
+            entry_id = index["docs"][doc][0]
+            if entry_id in seen:
+                continue
+            seen.add(entry_id)
+            covered = sum(idf[term] for term in terms & index["topics"][doc])
+            answer = self.entries[entry_id][language]["answer"]
+            hits.append(KnowledgeHit(entry_id, answer, score, covered / total_weight))
+            if len(hits) == limit:
+                break
+        return hits
+
+    def best_answer(self, query, language="en", min_confidence=0.0):
+        """The best-ranked hit whose confidence reaches ``min_confidence``, or None."""
+        for hit in self.search(query, language):
+            if hit.confidence >= min_confidence:
+                return hit
+        return None
+
+
+def main():
+    index = build_index(KNOWLEDGE_BASE)
+    with open(KNOWLEDGE_INDEX_PATH, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    print(f"Wrote {KNOWLEDGE_INDEX_PATH}: {len(index['docs'])} documents, {len(index['postings'])} terms")
+
+
+if __name__ == "__main__":
+    main()
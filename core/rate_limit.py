@@ -0,0 +1,93 @@
+import random
+import re
+import threading
+import time
+
+from config.settings import RATE_LIMIT_RPM, RATE_LIMIT_BURST, RETRY_BASE_DELAY, RETRY_MAX_DELAY
+
+# Retry hints as they appear in quota errors: the RPC RetryInfo detail, the
+# "retry in Ns" sentence and a plain Retry-After header
+_RETRY_HINT_RES = (
+    re.compile(r"retry_delay\s*\{\s*seconds:\s*(\d+(?:\.\d+)?)"),
+    re.compile(r"retry in\s*(\d+(?:\.\d+)?)\s*s", re.IGNORECASE),
+    re.compile(r"retry-after:\s*(\d+(?:\.\d+)?)", re.IGNORECASE),
+)
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate_per_minute`` refill with ``burst`` capacity."""
+
+    def __init__(self, rate_per_minute=RATE_LIMIT_RPM, burst=RATE_LIMIT_BURST):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """Take a token if one is available, else return the seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, timeout=None, cancel_event=None):
+        """Block until a token is available; False on timeout or cancellation."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self._reserve()
+            if not wait:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining < wait:
+                    return False
+            if cancel_event is not None:
+                if cancel_event.wait(wait):
+                    return False
+            else:
+                time.sleep(wait)
+
+    def penalize(self, seconds):
+        """Drain the bucket so nobody sends again for ``seconds`` (server said so)."""
+        with self._lock:
+            self._tokens = min(self._tokens, -seconds * self.rate)
+            self._updated = time.monotonic()
+
+
+# Shared by every client in the process so the quota is respected as a whole
+RATE_LIMITER = TokenBucket()
+
+
+def retry_after_hint(exc):
+    """Seconds the server asked us to wait, if the error carries a hint."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers and headers.get("Retry-After"):
+        try:
+            return float(headers["Retry-After"])
+        except ValueError:
+            pass
+    text = str(exc)
+    for pattern in _RETRY_HINT_RES:
+        match = pattern.search(text)
+        if match:
+            return float(match.group(1))
+    return None
+
+
+def backoff_delay(attempt, base=RETRY_BASE_DELAY, cap=RETRY_MAX_DELAY, hint=None):
+    """Delay before retry ``attempt`` (1-based).
+
+    Exponential backoff with full jitter, capped at ``cap``. A server hint
+    wins over the backoff (plus a little jitter so clients do not retry in
+    lockstep).
+    """
+    if hint is not None:
+        return hint + random.uniform(0, base)
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
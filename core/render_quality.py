@@ -0,0 +1,45 @@
+from collections import deque
+
+from config.settings import RENDER_QUALITY, FRAME_BUDGET_MS, FRAME_WINDOW
+from core.tracing import percentile
+
+AUTO = "auto"
+HIGH = "high"
+LOW = "low"
+
+
+class FrameMonitor:
+    """Picks the rendering quality from measured frame times.
+
+    In "auto" mode the level starts high and drops to low once the median of
+    the last ``window`` frames is over ``budget_ms``. It does not come back
+    up during the run, so effects never flicker on and off. "high" and "low"
+    pin the level.
+    """
+
+    def __init__(self, mode=RENDER_QUALITY, budget_ms=FRAME_BUDGET_MS, window=FRAME_WINDOW):
+        if mode not in (AUTO, HIGH, LOW):
+            raise ValueError(f"Unknown render quality: {mode!r}")
+        self.mode = mode
+        self.level = LOW if mode == LOW else HIGH
+        self.budget_ms = budget_ms
+        self.frames = 0
+        self._recent = deque(maxlen=window)
+
+    def record(self, ms):
+        """Add one frame time; True when it made the level drop to low."""
+        self.frames += 1
+        self._recent.append(ms)
+        if self.mode != AUTO or self.level == LOW or len(self._recent) < self._recent.maxlen:
+            return False
+        if percentile(sorted(self._recent), 0.5) > self.budget_ms:
+            self.level = LOW
+            return True
+        return False
+
+    def stats(self):
+        """p50/p95 of the recent frames in milliseconds (empty before the first frame)."""
+        if not self._recent:
+            return {}
+        recent = sorted(self._recent)
+        return {"count": self.frames, "p50": percentile(recent, 0.5), "p95": percentile(recent, 0.95)}
@@ -0,0 +1,97 @@
+import re
+from functools import lru_cache
+from html import escape
+
+# Inline markup, tried left to right in a single pass:
+# `code`, **bold**, __bold__, *italic*, _italic_, [text](url)
+_INLINE_RE = re.compile(
+    r"(?=[`*_\[])"  # fail fast on positions that cannot start markup
+    r"(?:`(?P<code>[^`\n]+)`"
+    r"|\*\*(?P<bold>.+?)\*\*"
+    r"|__(?P<bold2>.+?)__"
+    r"|\*(?P<italic>[^\s*](?:.*?[^\s*])?)\*"
+    r"|(?<!\w)_(?P<italic2>[^\s_](?:.*?[^\s_])?)_(?!\w)"
+    r'|\[(?P<label>[^\]\n]+)\]\((?P<url>https?://[^\s)"]+)\))'
+)
+# One alternation classifies every line, so the scanner never runs more than
+# a single regex per line
+_LINE_RE = re.compile(
+    r"^(?:"
+    r"[ \t]*(?P<rule>-{3,}|\*{3,}|_{3,})[ \t]*$"
+    r"|(?P<indent>[ \t]*)(?:(?P<bullet>[-*+•])|\d{1,3}[.)])[ \t]+(?P<item>[^\n]*)"
+    r"|[ \t]*#{1,6}[ \t]+(?P<heading>[^\n]*)"
+    r"|[ \t]*(?P<text>[^\n]*)"
+    r")",
+    re.MULTILINE,
+)
+
+PARAGRAPH_OPEN = '<p style="margin: 8px 0; line-height: 1.6;">'
+HEADING_OPEN = '<p style="margin: 10px 0 4px 0; font-weight: 600; font-size: 16px;">'
+LIST_STYLE = 'style="margin: 8px 0; padding-left: 20px;"'
+ITEM_OPEN = '<li style="margin: 2px 0; line-height: 1.5;">'
+CODE_OPEN = '<code style="font-family: monospace;">'
+
+
+def _replace_inline(match):
+    kind = match.lastgroup
+    if kind == "code":
+        return f"{CODE_OPEN}{match['code']}</code>"
+    if kind in ("bold", "bold2"):
+        return f"<b>{_render_inline(match[kind])}</b>"
+    if kind in ("italic", "italic2"):
+        return f"<i>{_render_inline(match[kind])}</i>"
+    return f'<a href="{match["url"]}">{_render_inline(match["label"])}</a>'
+
+
+def _render_inline(text):
+    """Apply inline markup to already-escaped text."""
+    if "*" not in text and "_" not in text and "`" not in text and "[" not in text:
+        return text
+    return _INLINE_RE.sub(_replace_inline, text)
+
+
+@lru_cache(maxsize=1024)
+def render_markdown(message):
+    """Render the light markdown Gemini produces as Qt rich text.
+
+    A single scan over the lines handles headings, nested bullet/numbered
+    lists, rules and paragraphs; inline code, emphasis and links are
+    resolved per line. All model text is HTML-escaped. Results are memoized
+    because the same message is rendered whenever its row is laid out again.
+    """
+    out = []
+    lists = []  # open lists as (indent, tag), innermost last
+
+    # Escaping up front leaves every markup character intact
+    for line in _LINE_RE.finditer(escape(message, quote=False)):
+        kind = line.lastgroup
+        if kind == "item":
+            indent = len(line["indent"].expandtabs(4))
+            tag = "ul" if line["bullet"] else "ol"
+            while lists and lists[-1][0] > indent:
+                out.append(f"</li></{lists.pop()[1]}>")
+            if lists and lists[-1][0] == indent and lists[-1][1] != tag:
+                out.append(f"</li></{lists.pop()[1]}>")
+            if lists and lists[-1][0] == indent:
+                out.append("</li>")
+            else:
+                out.append(f"<{tag} {LIST_STYLE}>")
+                lists.append((indent, tag))
+            out.append(ITEM_OPEN + _render_inline(line["item"].rstrip()))
+            continue
+
+        text = line[kind].rstrip()
+        if not text:
+            continue
+        while lists:
+            out.append(f"</li></{lists.pop()[1]}>")
+        if kind == "rule":
+            out.append("<hr>")
+        elif kind == "heading":
+            out.append(f"{HEADING_OPEN}{_render_inline(text.rstrip(' #'))}</p>")
+        else:
+            out.append(f"{PARAGRAPH_OPEN}{_render_inline(text)}</p>")
+
+    while lists:
+        out.append(f"</li></{lists.pop()[1]}>")
+    return "".join(out)
@@ -0,0 +1,141 @@
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from config.prompts import PROMPT_VERSION
+from config.settings import RESPONSE_CACHE_PATH, RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL
+from core.sqlite_writer import BackgroundWriter, connect
+
+_WHITESPACE_RE = re.compile(r"\s+")
+# Trailing punctuation that does not change the question (incl. Khmer khan)
+_TRAILING_PUNCT = " ?!.។៕"
+
+
+def normalize_message(message):
+    """Fold case, Unicode form and whitespace so equivalent questions share a key."""
+    text = unicodedata.normalize("NFC", message).casefold()
+    text = _WHITESPACE_RE.sub(" ", text).strip()
+    return text.rstrip(_TRAILING_PUNCT)
+
+
+class ResponseCache:
+    """LRU cache of model answers with a TTL, persisted to SQLite.
+
+    Entries are keyed on (prompt version, mode, language, normalized message).
+    The in-memory LRU serves hot entries; misses fall through to the
+    database so answers survive restarts. Both tiers are capped at
+    ``max_entries``. Inserts, access times and evictions are queued to a
+    writer thread that commits them in batches (WAL mode), so a hit or a
+    put on the GUI thread never waits on disk.
+    """
+
+    def __init__(self, path=RESPONSE_CACHE_PATH, max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+                 ttl=RESPONSE_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._writer = None
+        if path:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            writer = connect(path)
+            writer.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, response TEXT NOT NULL,"
+                " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            writer.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - ttl,))
+            writer.commit()
+            self._db = connect(path)
+            self._writer = BackgroundWriter(writer, "response-cache", after_batch=self._evict)
+
+    @staticmethod
+    def make_key(mode, language, message):
+        return f"{PROMPT_VERSION}|{mode}|{language}|{normalize_message(message)}"
+
+    def get(self, mode, language, message):
+        """Return the cached answer or None, updating the hit/miss counters."""
+        key = self.make_key(mode, language, message)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                entry = self._load(key)
+            if entry is not None and now - entry[1] > self.ttl:
+                self._forget(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._remember(key, entry)
+            self.hits += 1
+            if self._db:
+                self._writer.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            return entry[0]
+
+    def contains(self, mode, language, message):
+        """Whether a fresh answer is cached, leaving counters and recency alone."""
+        key = self.make_key(mode, language, message)
+        with self._lock:
+            entry = self._memory.get(key) or self._load(key)
+        return entry is not None and time.time() - entry[1] <= self.ttl
+
+    def put(self, mode, language, message, response):
+        key = self.make_key(mode, language, message)
+        now = time.time()
+        with self._lock:
+            self._remember(key, (response, now))
+            if self._db:
+                self._writer.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                                     (key, response, now, now))
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._memory)}
+
+    def flush(self):
+        """Block until every queued write has been committed."""
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        with self._lock:
+            if self._db:
+                self._db.close()
+                self._db = None
+
+    def _evict(self, connection, statements):
+        # One pass per committed batch, however many inserts it holds
+        if any(sql.startswith("INSERT") for sql, _ in statements):
+            connection.execute(
+                "DELETE FROM responses WHERE key NOT IN"
+                " (SELECT key FROM responses ORDER BY accessed_at DESC LIMIT ?)",
+                (self.max_entries,))
+
+    def _load(self, key):
+        if not self._db:
+            return None
+        row = self._db.execute(
+            "SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+        return tuple(row) if row else None
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _forget(self, key):
+        self._memory.pop(key, None)
+        if self._db:
+            self._writer.execute("DELETE FROM responses WHERE key = ?", (key,))
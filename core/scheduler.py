@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import deque
+
+from config.settings import REQUEST_TIMEOUT, REPLACE_QUEUED_RESENDS, SUPERSEDE_ON_SEND
+from core.response_cache import normalize_message
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+SUPERSEDED = "superseded"
+EXPIRED = "expired"
+
+
+class ScheduledRequest:
+    """One user message waiting for, or being answered by, the model.
+
+    ``cancel_event`` is shared with the client, which checks it between
+    stream chunks so an abandoned request stops consuming its pool thread.
+    """
+
+    def __init__(self, message, mode, language, timeout=REQUEST_TIMEOUT):
+        self.message = message
+        self.mode = mode
+        self.language = language
+        self.timeout = timeout
+        self.state = QUEUED
+        self.deadline = None
+        self.cancel_event = threading.Event()
+        self.bubble = None
+        self.trace = None
+
+    @property
+    def finished(self):
+        return self.state not in (QUEUED, RUNNING)
+
+    def remaining(self):
+        """Seconds left before the deadline (the full timeout while queued)."""
+        if self.deadline is None:
+            return self.timeout
+        return max(0.0, self.deadline - time.monotonic())
+
+    def _close(self, state):
+        self.state = state
+        if state != DONE:
+            self.cancel_event.set()
+
+
+def is_resend(previous, message):
+    """True when ``message`` repeats ``previous`` up to case, spacing and punctuation.
+
+    Fuzzy similarity is deliberately not used: "symptoms of flu?" and
+    "symptoms of dengue?" score as close as a real rewording does.
+    """
+    return normalize_message(previous) == normalize_message(message)
+
+
+class RequestScheduler:
+    """FIFO of chat requests for one conversation with one request in flight.
+
+    Requests run one at a time because each answer becomes context for the
+    next question. Instead of dropping input while busy, new messages queue
+    behind the running one and the running request is bounded by its
+    deadline. With ``replace_resends``, resending a question that is still
+    queued replaces the queued copy. With ``supersede_running``, a message
+    sent while busy abandons the running request and everything queued, so
+    it is answered next.
+    """
+
+    def __init__(self, replace_resends=REPLACE_QUEUED_RESENDS, supersede_running=SUPERSEDE_ON_SEND):
+        self.replace_resends = replace_resends
+        self.supersede_running = supersede_running
+        self.current = None
+        self._pending = deque()
+
+    def __len__(self):
+        return len(self._pending)
+
+    @property
+    def busy(self):
+        return self.current is not None or bool(self._pending)
+
+    def submit(self, request):
+        """Queue ``request``; return the requests it superseded."""
+        if self.supersede_running and self.current is not None:
+            superseded = [self.current, *self._pending]
+        elif self.replace_resends:
+            superseded = [previous for previous in self._pending if is_resend(previous.message, request.message)]
+        else:
+            superseded = []
+        for previous in superseded:
+            self._drop(previous, SUPERSEDED)
+        self._pending.append(request)
+        return superseded
+
+    def start_next(self):
+        """Start the oldest queued request if none is running and return it."""
+        if self.current is not None or not self._pending:
+            return None
+        request = self._pending.popleft()
+        request.state = RUNNING
+        request.deadline = time.monotonic() + request.timeout
+        self.current = request
+        return request
+
+    def finish(self, request):
+        if request.state == RUNNING:
+            request._close(DONE)
+        if request is self.current:
+            self.current = None
+
+    def cancel(self, request=None):
+        """Cancel ``request`` (default: the running one); return it, or None."""
+        request = request or self.current
+        if request is None or request.finished:
+            return None
+        self._drop(request, CANCELLED)
+        return request
+
+    def expire(self, request):
+        """Abandon ``request`` if it is still running past its deadline."""
+        if request is not self.current or request.remaining() > 0:
+            return False
+        self._drop(request, EXPIRED)
+        return True
+
+    def cancel_all(self):
+        for request in list(self._pending):
+            self._drop(request, CANCELLED)
+        if self.current is not None:
+            self._drop(self.current, CANCELLED)
+
+    def _drop(self, request, state):
+        request._close(state)
+        if request is self.current:
+            self.current = None
+        else:
+            try:
+                self._pending.remove(request)
+            except ValueError:
+                pass
@@ -0,0 +1,65 @@
+import bisect
+
+from core.tokenizer import tokenize
+
+# Shorter query terms only match whole index terms, so a single typed
+# letter does not expand to half the vocabulary
+MIN_PREFIX_LENGTH = 2
+
+
+class TranscriptIndex:
+    """Incremental inverted index over transcript messages with prefix search.
+
+    Messages are indexed once, when they are added; nothing is ever
+    rescanned, and ids increase in transcript order. It holds the messages
+    written in this run; stored history is searched by ConversationStore
+    with the same terms. The vocabulary is kept sorted, so every term starting with a query
+    prefix is one contiguous slice found by bisection.
+    """
+
+    def __init__(self):
+        self._postings = {}
+        self._terms = []
+        self._docs = {}
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self._docs)
+
+    def append(self, payload, text):
+        doc_id = self._next_id
+        self._next_id += 1
+        self._add(doc_id, payload, text)
+
+    def _add(self, doc_id, payload, text):
+        self._docs[doc_id] = payload
+        for term in set(tokenize(text)):
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = []
+                bisect.insort(self._terms, term)
+            postings.append(doc_id)
+
+    def _matching(self, term):
+        if len(term) < MIN_PREFIX_LENGTH:
+            return set(self._postings.get(term, ()))
+        matches = set()
+        start = bisect.bisect_left(self._terms, term)
+        for candidate in self._terms[start:]:
+            if not candidate.startswith(term):
+                break
+            matches.update(self._postings[candidate])
+        return matches
+
+    def search(self, query):
+        """Payloads of messages matching every query term (as a prefix), oldest first."""
+        terms = sorted(set(tokenize(query)), key=len, reverse=True)
+        if not terms:
+            return []
+        # Longer terms are more selective; stop as soon as nothing is left
+        result = self._matching(terms[0])
+        for term in terms[1:]:
+            if not result:
+                break
+            result &= self._matching(term)
+        return [self._docs[doc_id] for doc_id in sorted(result)]
@@ -0,0 +1,75 @@
+import queue
+import sqlite3
+import threading
+
+_STOP = object()
+
+
+def connect(path):
+    """Open ``path`` in WAL mode, shareable across threads."""
+    connection = sqlite3.connect(str(path), check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+class BackgroundWriter:
+    """Thread that owns a SQLite connection and commits queued statements.
+
+    Whatever has accumulated since the last commit is written in one
+    transaction, so callers on the GUI thread never wait on disk.
+    ``after_batch(connection, statements)`` runs inside that transaction,
+    once per batch (e.g. to trim a table however many rows were added).
+    """
+
+    def __init__(self, connection, name, after_batch=None):
+        self.name = name
+        self.after_batch = after_batch
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, args=(connection,), name=name, daemon=True)
+        self._thread.start()
+
+    def execute(self, sql, params=()):
+        self._queue.put(((sql, params),))
+
+    def execute_all(self, statements):
+        """Queue ``(sql, params)`` pairs that must be committed together, in order."""
+        self._queue.put(tuple(statements))
+
+    def flush(self):
+        """Block until every queued statement has been committed."""
+        self._queue.join()
+
+    def close(self):
+        """Commit what is queued, then close the connection and stop the thread."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+
+    def _run(self, connection):
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            statements = [statement for entry in batch if entry is not _STOP for statement in entry]
+            try:
+                with connection:
+                    for statement in statements:
+                        connection.execute(*statement)
+                    if statements and self.after_batch:
+                        self.after_batch(connection, statements)
+            except sqlite3.Error as e:
+                print(f"{self.name} write failed: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+            if _STOP in batch:
+                connection.close()
+                return
@@ -0,0 +1,51 @@
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """Wall-clock breakdown of application start-up.
+
+    ``mark`` closes a phase that started at the previous mark; ``phase``
+    times a block explicitly. Background work reports through ``record``.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        self._last = self.origin
+        self.phases = []
+
+    def mark(self, name):
+        now = time.perf_counter()
+        if self.enabled:
+            self.phases.append((name, now - self._last))
+        self._last = now
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            if self.enabled:
+                self.phases.append((name, now - started))
+            self._last = now
+
+    def record(self, name, seconds):
+        """Add a phase timed elsewhere and return its report line."""
+        if self.enabled:
+            self.phases.append((name, seconds))
+        return self._line(name, seconds)
+
+    def elapsed(self):
+        return time.perf_counter() - self.origin
+
+    def report(self, title="Startup profile"):
+        lines = [f"{title} ({self.elapsed() * 1000:.0f} ms since launch):"]
+        lines.extend(self._line(name, seconds) for name, seconds in self.phases)
+        return "\n".join(lines)
+
+    @staticmethod
+    def _line(name, seconds):
+        return f"  {name:<24}{seconds * 1000:>9.1f} ms"
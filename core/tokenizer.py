@@ -0,0 +1,59 @@
+import re
+import unicodedata
+from functools import lru_cache
+
+# Bump when tokenization changes so prebuilt indexes are rebuilt
+TOKENIZER_VERSION = 1
+
+# Khmer is written without spaces between words. An orthographic syllable
+# is a base character followed by coeng+consonant subscripts and dependent
+# vowels/signs; adjacent syllable pairs make good index terms without a
+# dictionary-based word segmenter.
+_SYLLABLE_RE = re.compile(r"[\u1780-\u17b3](?:\u17d2[\u1780-\u17b3]|[\u17b4-\u17d1\u17d3\u17dd])*")
+# Words and whole Khmer runs; runs are split into syllables afterwards
+_TOKEN_RE = re.compile(r"([a-z0-9]+(?:'[a-z]+)?)|([\u1780-\u17d3\u17dd]+)")
+
+STOP_WORDS = frozenset("""
+a an and are as at be but by can do does for from have how i i'm in is it it's me my of on or
+should so that the this to what when where which who why will with you your about am any
+""".split())
+
+
+@lru_cache(maxsize=16384)
+def _stem(word):
+    """Fold the common English inflections (plural, -ing) onto one term."""
+    if len(word) <= 3:
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith("ing") and len(word) >= 6:
+        return word[:-3]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+@lru_cache(maxsize=16384)
+def khmer_terms(run):
+    """Syllable bigrams of a Khmer run (the syllable itself if it stands alone)."""
+    syllables = _SYLLABLE_RE.findall(run)
+    if len(syllables) == 1:
+        return tuple(syllables)
+    return tuple(a + b for a, b in zip(syllables, syllables[1:]))
+
+
+def tokenize(text):
+    """Index terms for English/Khmer text: stemmed words and Khmer syllable bigrams.
+
+    Words and Khmer runs repeat heavily across messages, so stemming and
+    syllable splitting are memoized.
+    """
+    text = unicodedata.normalize("NFC", text).casefold()
+    terms = []
+    for word, khmer in _TOKEN_RE.findall(text):
+        if word:
+            if word not in STOP_WORDS:
+                terms.append(_stem(word))
+        else:
+            terms.extend(khmer_terms(khmer))
+    return terms
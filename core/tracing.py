@@ -0,0 +1,153 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+from config.settings import TRACE_DIR, TRACE_WINDOW, TRACE_LOG_MAX_BYTES, TRACE_LOG_BACKUPS
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Trace:
+    """Timing spans for one chat message, in milliseconds.
+
+    ``span()`` times a block on the calling thread; ``mark()`` stamps a
+    moment (possibly from a pool thread) so spans can later be derived
+    between two marks with ``between()``.
+    """
+
+    def __init__(self, tracer):
+        self.tracer = tracer
+        self.started = time.perf_counter()
+        self.spans = {}
+        self.marks = {}
+
+    @contextmanager
+    def span(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - started) * 1000)
+
+    def record(self, name, ms):
+        self.spans[name] = self.spans.get(name, 0.0) + ms
+
+    def mark(self, name):
+        self.marks.setdefault(name, time.perf_counter())
+
+    def between(self, name, start, end):
+        if start in self.marks and end in self.marks:
+            self.record(name, (self.marks[end] - self.marks[start]) * 1000)
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def finish(self, source):
+        """Close the trace; ``source`` says where the answer came from."""
+        self.record("total", self.elapsed_ms())
+        self.tracer.record(self, source)
+
+
+def percentile(sorted_samples, quantile):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, math.ceil(quantile * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+class Tracer:
+    """Aggregates finished traces into per-span latency percentiles.
+
+    Percentiles are computed over the last ``window`` samples of each span;
+    counts and sums cover the whole run. ``export()`` appends a snapshot to
+    a size-rotated JSON lines log and rewrites a Prometheus textfile.
+    """
+
+    def __init__(self, directory=TRACE_DIR, window=TRACE_WINDOW, version=""):
+        self.directory = Path(directory)
+        self.window = window
+        self.version = version
+        self._samples = {}
+        self._totals = {}
+        self._sources = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    def start(self):
+        return Trace(self)
+
+    def record(self, trace, source):
+        with self._lock:
+            for name, ms in trace.spans.items():
+                self._samples.setdefault(name, deque(maxlen=self.window)).append(ms)
+                count, total = self._totals.get(name, (0, 0.0))
+                self._totals[name] = (count + 1, total + ms)
+            self._sources[source] = self._sources.get(source, 0) + 1
+            self._dirty = True
+
+    def stats(self):
+        """{span: {"count", "sum", "p50", "p95", "p99"}} in milliseconds."""
+        with self._lock:
+            snapshot = {name: sorted(samples) for name, samples in self._samples.items()}
+            totals = dict(self._totals)
+        stats = {}
+        for name, samples in snapshot.items():
+            count, total = totals[name]
+            entry = {"count": count, "sum": round(total, 3)}
+            for quantile in QUANTILES:
+                entry[f"p{int(quantile * 100)}"] = round(percentile(samples, quantile), 3)
+            stats[name] = entry
+        return stats
+
+    def sources(self):
+        with self._lock:
+            return dict(self._sources)
+
+    def export(self):
+        """Write the current stats if anything was recorded since the last export."""
+        if not self._dirty:
+            return
+        self._dirty = False
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stats, sources = self.stats(), self.sources()
+        snapshot = {"time": time.time(), "version": self.version, "spans": stats, "sources": sources}
+        self._append_rotating(self.directory / "latency.jsonl", json.dumps(snapshot, sort_keys=True) + "\n")
+        self._write_atomic(self.directory / "healthbot.prom", self._prometheus(stats, sources))
+
+    def _append_rotating(self, path, line):
+        if path.exists() and path.stat().st_size + len(line) > TRACE_LOG_MAX_BYTES:
+            for index in range(TRACE_LOG_BACKUPS - 1, 0, -1):
+                older = path.with_name(f"{path.name}.{index}")
+                if older.exists():
+                    os.replace(older, path.with_name(f"{path.name}.{index + 1}"))
+            os.replace(path, path.with_name(f"{path.name}.1"))
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+    @staticmethod
+    def _write_atomic(path, text):
+        # The node-exporter textfile collector may read at any moment
+        temporary = path.with_name(path.name + ".tmp")
+        temporary.write_text(text, encoding="utf-8")
+        os.replace(temporary, path)
+
+    def _prometheus(self, stats, sources):
+        version = self.version.replace('"', "")
+        lines = ["# HELP healthbot_span_milliseconds Per-message latency by span.",
+                 "# TYPE healthbot_span_milliseconds summary"]
+        for name, entry in sorted(stats.items()):
+            labels = f'span="{name}",version="{version}"'
+            for quantile in QUANTILES:
+                value = entry[f"p{int(quantile * 100)}"]
+                lines.append(f'healthbot_span_milliseconds{{{labels},quantile="{quantile}"}} {value}')
+            lines.append(f"healthbot_span_milliseconds_sum{{{labels}}} {entry['sum']}")
+            lines.append(f"healthbot_span_milliseconds_count{{{labels}}} {entry['count']}")
+        lines += ["# HELP healthbot_answers_total Answered messages by source.",
+                  "# TYPE healthbot_answers_total counter"]
+        for source, count in sorted(sources.items()):
+            lines.append(f'healthbot_answers_total{{source="{source}",version="{version}"}} {count}')
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,113 @@
+"""Conversation export and import as NDJSON (one JSON object per line).
+
+The first line is a header naming the format and version; every other line
+is one message with its session, timestamp, kind, sender, text, mode,
+language and, for answers, latency and model. Both directions stream: the
+writer emits a line per message and the reader is a generator, so a
+transcript of any length is never held in memory as a whole.
+"""
+import json
+import time
+
+from core.conversation_store import StoredMessage
+
+FORMAT = "healthbot-transcript"
+VERSION = 1
+KINDS = ("user", "bot", "system")
+
+
+class TranscriptError(ValueError):
+    """A transcript file that cannot be read; ``line`` is 1-based.
+
+    ``sessions`` holds the ids of the sessions imported before the error.
+    """
+
+    def __init__(self, line, message):
+        super().__init__(f"line {line}: {message}")
+        self.line = line
+        self.sessions = []
+
+
+def to_record(message):
+    return {
+        "session": message.session_id,
+        "id": message.id,
+        "created_at": message.created_at,
+        "kind": message.kind,
+        "sender": message.sender,
+        "text": message.text,
+        "mode": message.mode,
+        "language": message.language,
+        "latency_ms": message.latency_ms,
+        "model": message.model,
+    }
+
+
+def write_transcript(messages, stream, app_version=""):
+    """Write a header and one line per message to the text ``stream``; returns the message count."""
+    header = {"format": FORMAT, "version": VERSION, "exported_at": time.time(), "app_version": app_version}
+    stream.write(json.dumps(header, ensure_ascii=False) + "\n")
+    count = 0
+    for message in messages:
+        stream.write(json.dumps(to_record(message), ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def read_transcript(lines):
+    """Yield a StoredMessage per message line of an NDJSON transcript.
+
+    ``lines`` is any iterable of text lines, such as an open file. The
+    header is optional, but a file from a newer format version is refused.
+    Raises TranscriptError on the first malformed line.
+    """
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise TranscriptError(number, f"invalid JSON: {e.msg}") from e
+        if not isinstance(record, dict):
+            raise TranscriptError(number, "expected a JSON object")
+        if "format" in record:
+            if record["format"] != FORMAT:
+                raise TranscriptError(number, f"not a transcript: {record['format']!r}")
+            if not isinstance(record.get("version"), int) or record["version"] > VERSION:
+                raise TranscriptError(number, f"unsupported version: {record.get('version')!r}")
+            continue
+        yield _from_record(number, record)
+
+
+def _from_record(number, record):
+    if record.get("kind") not in KINDS:
+        raise TranscriptError(number, f"unknown kind: {record.get('kind')!r}")
+    if not isinstance(record.get("text"), str):
+        raise TranscriptError(number, "missing text")
+    created_at = record.get("created_at")
+    if not isinstance(created_at, (int, float)):
+        raise TranscriptError(number, "missing created_at")
+    return StoredMessage(record.get("id"), record.get("session"), float(created_at), record["kind"],
+                         record.get("sender") or "", record["text"], record.get("mode"),
+                         record.get("language"), record.get("latency_ms"), record.get("model"))
+
+
+def export_transcript(store, stream, session_id=None, app_version=""):
+    """Export one session (default: every session) to the text ``stream``; returns the message count."""
+    return write_transcript(store.iter_messages(session_id), stream, app_version)
+
+
+def import_transcript(store, stream):
+    """Import the transcript read from the text ``stream`` into ``store``; returns the new session ids.
+
+    Messages are written as they are read, so a malformed line leaves the
+    ones before it imported; the TranscriptError raised for it lists their
+    sessions in ``sessions``.
+    """
+    sessions = []
+    try:
+        return store.import_messages(read_transcript(stream), new_sessions=sessions)
+    except TranscriptError as e:
+        e.sessions = sessions
+        raise
@@ -1,29 +1,46 @@
 import sys
-import os
+import threading
+import time
+from contextlib import ExitStack
 from pathlib import Path
+
+from core.startup import StartupProfiler
+
+startup_profiler = StartupProfiler(enabled="--startup-profile" in sys.argv)
+
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLineEdit, QPushButton, QLabel, QFrame, QScrollArea,
-    QGraphicsDropShadowEffect
+    QLineEdit, QPushButton, QLabel, QFrame, QGraphicsDropShadowEffect, QStackedWidget, QTabWidget,
+    QFileDialog
 )
-from PyQt6.QtGui import QIcon, QFont, QFontDatabase, QColor
-from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal
+from PyQt6.QtGui import QIcon, QFont, QFontDatabase, QColor, QKeySequence, QShortcut
+from PyQt6.QtCore import Qt, QEvent, QTimer, QObject, pyqtSignal
 
 from config.prompts import get_prompt
 from config.ui_text import UI_TEXT
-from config.styles import get_app_stylesheet, get_chat_bubble_style
-
-try:
-    from dotenv import load_dotenv
-    DOTENV_AVAILABLE = True
-except ImportError:
-    DOTENV_AVAILABLE = False
+from config.styles import THEMES, get_app_stylesheet
+from config.suggestions import SUGGESTIONS
+from core.env import DOTENV_AVAILABLE, load_env_file, get_api_key
+from core.client import ModelClient, ClientError, GEMINI_AVAILABLE
+from core.response_cache import ResponseCache
+from core.context import ConversationContext
+from core.knowledge import KnowledgeBase
+from core.search_index import TranscriptIndex
+from core.scheduler import RequestScheduler, ScheduledRequest, QUEUED
+from core.conversation_store import ConversationStore
+from core.transcript_io import TranscriptError, export_transcript, import_transcript
+from core.renderer import render_markdown
+from core.tracing import Trace, Tracer
+from core.render_quality import FrameMonitor, HIGH
+from config.settings import (
+    DATA_DIR, RESPONSE_CACHE_PATH, CONVERSATION_DB_PATH, TRACE_DIR, HISTORY_PAGE_SIZE,
+    KB_ANSWER_CONFIDENCE, KB_FALLBACK_CONFIDENCE, TRACE_EXPORT_INTERVAL, PREFETCH_SUGGESTIONS, REQUEST_TIMEOUT,
+    THEME, THEME_CYCLE,
+)
+from ui.transcript import ChatMessage, TranscriptModel, TranscriptView
+from ui.perf_overlay import PerfOverlay
 
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
+startup_profiler.mark("imports")
 
 
 BASE_DIR = Path(__file__).parent
@@ -34,229 +51,183 @@ if not (BASE_DIR / "config").exists() and (BASE_DIR.parent / "config").exists():
 ASSETS_DIR = BASE_DIR / "assets"
 
 
-if DOTENV_AVAILABLE:
-    for env_file in [BASE_DIR / "config" / ".env", BASE_DIR / ".env"]:
-        if env_file.exists():
-            load_dotenv(str(env_file))
-            print(f"Loaded .env from: {env_file}")
-            break
+env_file = load_env_file(BASE_DIR)
+if env_file:
+    print(f"Loaded .env from: {env_file}")
 
 
-class GeminiWorker(QThread):
-    """Worker thread for Gemini API calls to avoid blocking the UI."""
+class GeminiWorker(QObject):
+    """Runs one chat request on the shared ModelClient pool; signals arrive on the GUI thread."""
+    chunk_ready = pyqtSignal(str)
     response_ready = pyqtSignal(str)
     error_occurred = pyqtSignal(str)
+    speculative = False
 
-    def __init__(self, message, mode, language, api_key):
+    def __init__(self, client, message, mode, language, stream=True, context=None,
+                 cancel_event=None, timeout=None, trace=None, owner=None):
         super().__init__()
+        self.client = client
         self.message = message
         self.mode = mode
         self.language = language
-        self.api_key = api_key
-
-    def run(self):
-        try:
-            if not GEMINI_AVAILABLE:
-                self.error_occurred.emit("Gemini API not available. Install google-generativeai package.")
-                return
-
-            if not self.api_key:
-                self.error_occurred.emit("API key not configured. Please check your .env file.")
-                return
-
-            genai.configure(api_key=self.api_key)
-            model = genai.GenerativeModel('gemini-2.0-flash')
-
-            generation_config = {
-                "temperature": 0.6,
-                "top_p": 0.7,
-                "max_output_tokens": 250,
-            }
-
+        self.stream = stream
+        self.context = context
+        self.cancel_event = cancel_event
+        self.timeout = timeout
+        self.trace = trace if trace is not None else Trace(None)
+        self.owner = owner
+        self.future = None
+        self.text = ""
+        self.result = None
+        self.error = None
+
+    def start(self):
+        """Build the prompt (with ``context``, if any) and queue it on the pool under ``owner``.
+
+        ``chunk_ready`` carries the accumulated answer as chunks arrive and
+        ``response_ready`` the final text; each step is stamped on ``trace``.
+        """
+        with self.trace.span("prompt"):
             prompt = get_prompt(self.mode, self.language, self.message)
-            response = model.generate_content(prompt, generation_config=generation_config)
+            if self.context is not None and len(self.context):
+                prompt = self.context.build(prompt)
+        self.future = self.client.submit(prompt, on_chunk=self._on_chunk, stream=self.stream,
+                                         cancel_event=self.cancel_event, timeout=self.timeout,
+                                         on_start=lambda: self.trace.mark("started"), mode=self.mode,
+                                         owner=self.owner)
+        self.future.add_done_callback(self._on_done)
+
+    def _on_chunk(self, text):
+        self.trace.mark("first_chunk")
+        self.text = text
+        self.chunk_ready.emit(text)
+
+    def _on_done(self, future):
+        self.trace.mark("done")
+        if future.cancelled():
+            return
+        try:
+            text = future.result()
+        except ClientError as e:
+            if e.kind != "cancelled":
+                self.error = str(e)
+                self.error_occurred.emit(self.error)
+            return
+        self.result = text
+        self.response_ready.emit(text)
 
-            if response and response.text:
-                self.response_ready.emit(response.text)
-            else:
-                self.error_occurred.emit("Empty response from AI. Please try again.")
-
-        except Exception as e:
-            error_msg = str(e).lower()
-            if "api_key" in error_msg or "invalid" in error_msg:
-                self.error_occurred.emit("Invalid API key. Please check your configuration.")
-            elif "quota" in error_msg or "limit" in error_msg:
-                self.error_occurred.emit("API quota exceeded. Please try again later.")
-            elif "blocked" in error_msg or "safety" in error_msg:
-                self.error_occurred.emit("Response was blocked. Please rephrase your question.")
-            else:
-                self.error_occurred.emit("Connection error. Please check your internet connection.")
+    def replay(self):
+        """Re-emit the progress so far, for a worker started speculatively and connected later."""
+        if self.result is not None:
+            self.response_ready.emit(self.result)
+        elif self.error is not None:
+            self.error_occurred.emit(self.error)
+        elif self.text:
+            self.chunk_ready.emit(self.text)
 
 
 class ModernButton(QPushButton):
+    # Cleared when rendering drops to low quality, so new buttons skip the effect
+    effects_enabled = True
+
     def __init__(self, text="", parent=None):
         super().__init__(text, parent)
         self.setMinimumHeight(45)
         self.setCursor(Qt.CursorShape.PointingHandCursor)
-
-        self.shadow = QGraphicsDropShadowEffect()
-        self.shadow.setBlurRadius(15)
-        self.shadow.setColor(QColor(0, 0, 0, 50))
-        self.shadow.setOffset(0, 2)
-        self.setGraphicsEffect(self.shadow)
-
-
-class ModernChatBubble(QFrame):
-
-    def __init__(self, message, sender, is_user=False, theme="light"):
-        super().__init__()
-        self.is_user = is_user
-        self.theme = theme
-        self.setMaximumWidth(600)
-        self.setContentsMargins(0, 5, 0, 5)
-
-        layout = QVBoxLayout(self)
-        layout.setSpacing(5)
-        layout.setContentsMargins(15, 10, 15, 10)
-
-        sender_label = QLabel(sender)
-        sender_label.setObjectName("senderLabel")
-
-        message_label = QLabel()
-        message_label.setWordWrap(True)
-        message_label.setTextFormat(Qt.TextFormat.RichText)
-        message_label.setText(self._format_message(message))
-        message_label.setObjectName("messageLabel")
-
-        layout.addWidget(sender_label)
-        layout.addWidget(message_label)
-
-        self._apply_bubble_style()
-
-    def _format_message(self, message):
-        import re
-
-        message = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', message)
-        message = re.sub(r'\*(.*?)\*', r'<i>\1</i>', message)
-        message = message.replace('\n', '<br>')
-
-        lines = message.split('<br>')
-        formatted_lines = []
-        in_list = False
-
-        for line in lines:
-            line = line.strip()
-            if re.match(r'^\d+\.\s+', line) or line.startswith('•') or line.startswith('-'):
-                if not in_list:
-                    formatted_lines.append('<ul style="margin: 8px 0; padding-left: 20px;">')
-                    in_list = True
-                if re.match(r'^\d+\.\s+', line):
-                    item_text = re.sub(r'^\d+\.\s+', '', line)
-                else:
-                    item_text = re.sub(r'^[•\-]\s*', '', line)
-                formatted_lines.append(f'<li style="margin: 2px 0; line-height: 1.5;">{item_text}</li>')
-            else:
-                if in_list:
-                    formatted_lines.append('</ul>')
-                    in_list = False
-                if line:
-                    formatted_lines.append(f'<p style="margin: 8px 0; line-height: 1.6;">{line}</p>')
-
-        if in_list:
-            formatted_lines.append('</ul>')
-        result = ''.join(formatted_lines)
-
-        result = re.sub(r'<p[^>]*>\s*</p>', '', result)
-
-        return result
-
-    def _apply_bubble_style(self):
-        style = get_chat_bubble_style(self.is_user, self.theme)
-        self.setStyleSheet(style)
-
-
-class HealthBotDemoWindow(QMainWindow):
-
-    def __init__(self):
+        self.shadow = None
+        self.set_shadow(self.effects_enabled)
+
+    def set_shadow(self, enabled):
+        """Drop shadows render every button offscreen, so low quality goes without."""
+        if enabled and self.shadow is None:
+            self.shadow = QGraphicsDropShadowEffect()
+            self.shadow.setBlurRadius(15)
+            self.shadow.setColor(QColor(0, 0, 0, 50))
+            self.shadow.setOffset(0, 2)
+            self.setGraphicsEffect(self.shadow)
+        elif not enabled and self.shadow is not None:
+            # Deletes the effect
+            self.setGraphicsEffect(None)
+            self.shadow = None
+
+
+def set_style_state(widget, name, value):
+    """Set a dynamic property the app stylesheet selects on (e.g. QLineEdit[error="true"]).
+
+    Qt only re-evaluates property selectors on polish, so the widget is
+    re-polished; this keeps the shared stylesheet instead of giving the
+    widget its own one to parse.
+    """
+    widget.setProperty(name, value)
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
+
+
+class ConversationTab(QWidget):
+    """One conversation: transcript, history session, mode, language and request queue.
+
+    The model client, caches, history store and tracer belong to the window
+    and are shared by every tab. Each tab answers one question at a time
+    (its answers are context for the next question), while the client's
+    pool takes turns between tabs, so a slow answer here never holds up
+    another tab. ``busy_changed`` lets the window mark the tab meanwhile.
+    """
+    busy_changed = pyqtSignal(bool)
+
+    def __init__(self, main_window, number, language="en"):
         super().__init__()
-        self.language = "en"
-        self.theme = "dark"
-
-        self.api_key = self._load_api_key()
+        self.main_window = main_window
+        self.number = number
+        self.language = language
+        self.ui_text = main_window.ui_text
+        self.model_client = main_window.model_client
+        self.response_cache = main_window.response_cache
+        self.conversation_store = main_window.conversation_store
+        self.knowledge_base = main_window.knowledge_base
+        self.tracer = main_window.tracer
+        self.context = ConversationContext()
+        self.search_index = TranscriptIndex()
+        self.scheduler = RequestScheduler()
         self.gemini_worker = None
-        self.is_typing = False
-        self.chat_history = []
-        self._load_custom_fonts()
-        self.ui_text = UI_TEXT
-        self._configure_window()
-        self._create_widgets()
+        self._prefetch = None
+        self._prefetch_key = None
+        self.typing_indicator = None
+        self.streaming_bubble = None
+        self.session_id = None
+        self._oldest_message_id = None
+        self._history_exhausted = True
+        # Newest restored id: stored history up to it is searched in the store
+        self._restored_newest_id = None
+        # Rows paged in around an older search hit, at the top of the transcript,
+        # and the paging state of the history below them while they are shown
+        self._island_rows = 0
+        self._paging_below_island = None
+        self._search_results = []
+        self._search_position = 0
+        self._create_widgets(main_window.theme)
         self._create_layout()
-        self._apply_styles()
         self._connect_signals()
-
         self.update_ui_text()
         self.set_health_query_mode()
-        self._show_welcome_message()
-
-    def _load_custom_fonts(self):
-        """Load custom fonts - simple version."""
-        font_path = ASSETS_DIR / "Dangrek-Regular.ttf"
-
-        if font_path.exists():
-            font_id = QFontDatabase.addApplicationFont(str(font_path))
-            if font_id != -1:
-                print("Custom font loaded successfully")
-        else:
-            print("Custom font not found, using system fonts")
-
-    def _load_api_key(self):
-        api_key = os.environ.get("GEMINI_API_KEY")
-        if not api_key or api_key == "your_gemini_api_key_here":
-            print("Warning: GEMINI_API_KEY not found or not properly configured.")
-            print("Please set a valid API key in your config/.env file or environment variables.")
-            if not DOTENV_AVAILABLE:
-                print("Consider installing python-dotenv: pip install python-dotenv")
-            else:
-                print("Make sure you have a valid .env file in the 'config' folder.")
-                print("You can copy config/.env.example to config/.env and add your API key.")
-            return None
-        return api_key
-
-    def _configure_window(self):
-        """Set up the main window properties."""
-        self.setGeometry(100, 100, 900, 800)
-        self.setMinimumSize(600, 500)
-
-        # Load window icon - simple version
-        icon_path = ASSETS_DIR / "icon.png"
-        if icon_path.exists():
-            self.setWindowIcon(QIcon(str(icon_path)))
-            print("Icon loaded successfully")
-        else:
-            print("Icon not found, using default")
 
-    def _create_widgets(self):
-        self.central_widget = QWidget()
-        self.setCentralWidget(self.central_widget)
-        self.header_frame = QFrame()
-        self.header_frame.setMinimumHeight(70)
-        self.title_label = QLabel()
-        self.language_toggle_button = ModernButton()
-        self.theme_toggle_button = ModernButton()
-        self.chat_scroll = QScrollArea()
-        self.chat_widget = QWidget()
-        self.chat_layout = QVBoxLayout(self.chat_widget)
-        self.chat_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        self.chat_layout.setSpacing(12)
-        self.chat_layout.setContentsMargins(16, 16, 16, 16)
-
-        self.chat_scroll.setWidget(self.chat_widget)
-        self.chat_scroll.setWidgetResizable(True)
-        self.chat_scroll.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
-        self.chat_scroll.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+    def _create_widgets(self, theme):
+        self.search_frame = QFrame()
+        self.search_frame.setObjectName("search_frame")
+        self.search_frame.hide()
+        self.search_input = QLineEdit()
+        self.search_input.setObjectName("search_input")
+        self.search_status = QLabel()
+        self.search_status.setObjectName("search_status")
+        self.search_prev_button = ModernButton("↑")
+        self.search_next_button = ModernButton("↓")
+        self.search_close_button = ModernButton("✕")
+        self.chat_model = TranscriptModel(self)
+        self.chat_view = TranscriptView(self.chat_model, theme)
         self.mode_button_frame = QFrame()
+        self.mode_button_frame.setObjectName("mode_button_frame")
         self.mode_button_frame.setMinimumHeight(60)
         self.mode_label = QLabel()
+        self.mode_label.setObjectName("mode_label")
         self.health_query_button = ModernButton()
         self.health_query_button.setCheckable(True)
         self.symptom_checker_button = ModernButton()
@@ -265,26 +236,26 @@ class HealthBotDemoWindow(QMainWindow):
         # Quick suggestion buttons
         self.suggestions_frame = QFrame()
         self.suggestions_frame.setMaximumHeight(80)
-        self.suggestion_buttons = []
+        self.suggestion_stack = QStackedWidget()
+        self._suggestion_pages = {}
 
         self.input_frame = QFrame()
+        self.input_frame.setObjectName("input_frame")
         self.input_frame.setMinimumHeight(70)
         self.user_input = QLineEdit()
         self.user_input.setMinimumHeight(45)
         self.send_button = ModernButton()
+        self.send_button.setObjectName("send_button")
         self.send_button.setMinimumSize(80, 45)
+        self.cancel_button = ModernButton()
+        self.cancel_button.setObjectName("cancel_button")
+        self.cancel_button.setMinimumSize(80, 45)
+        self.cancel_button.hide()
 
     def _create_layout(self):
-        self.main_layout = QVBoxLayout(self.central_widget)
-        self.main_layout.setSpacing(0)
-        self.main_layout.setContentsMargins(0, 0, 0, 0)
-        header_layout = QHBoxLayout(self.header_frame)
-        header_layout.addWidget(self.title_label)
-        header_layout.addStretch()
-        header_layout.addWidget(self.language_toggle_button)
-        header_layout.addWidget(self.theme_toggle_button)
-        header_layout.setContentsMargins(24, 16, 24, 16)
-        header_layout.setSpacing(12)
+        layout = QVBoxLayout(self)
+        layout.setSpacing(0)
+        layout.setContentsMargins(0, 0, 0, 0)
         mode_buttons_layout = QHBoxLayout()
         mode_buttons_layout.addWidget(self.health_query_button)
         mode_buttons_layout.addWidget(self.symptom_checker_button)
@@ -296,91 +267,146 @@ class HealthBotDemoWindow(QMainWindow):
         mode_layout.addLayout(mode_buttons_layout)
         mode_layout.setContentsMargins(24, 12, 24, 12)
 
-        # Create suggestion buttons layout
-        self._create_suggestion_buttons()
         suggestions_layout = QHBoxLayout(self.suggestions_frame)
-        suggestions_layout.setContentsMargins(24, 8, 24, 8)
-        suggestions_layout.setSpacing(8)
-
-        for btn in self.suggestion_buttons:
-            suggestions_layout.addWidget(btn)
-        suggestions_layout.addStretch()
+        suggestions_layout.setContentsMargins(0, 0, 0, 0)
+        suggestions_layout.addWidget(self.suggestion_stack)
 
         input_layout = QHBoxLayout(self.input_frame)
         input_layout.addWidget(self.user_input, 1)
+        input_layout.addWidget(self.cancel_button)
         input_layout.addWidget(self.send_button)
         input_layout.setContentsMargins(24, 12, 24, 12)
         input_layout.setSpacing(12)
-        self.main_layout.addWidget(self.header_frame)
-        self.main_layout.addWidget(self.chat_scroll, 1)
-        self.main_layout.addWidget(self.mode_button_frame)
-        self.main_layout.addWidget(self.suggestions_frame)
-        self.main_layout.addWidget(self.input_frame)
+        search_layout = QHBoxLayout(self.search_frame)
+        search_layout.addWidget(self.search_input, 1)
+        search_layout.addWidget(self.search_status)
+        search_layout.addWidget(self.search_prev_button)
+        search_layout.addWidget(self.search_next_button)
+        search_layout.addWidget(self.search_close_button)
+        search_layout.setContentsMargins(24, 8, 24, 8)
+        search_layout.setSpacing(8)
+        layout.addWidget(self.search_frame)
+        layout.addWidget(self.chat_view, 1)
+        layout.addWidget(self.mode_button_frame)
+        layout.addWidget(self.suggestions_frame)
+        layout.addWidget(self.input_frame)
 
     def _connect_signals(self):
+        self.chat_view.top_reached.connect(self._load_older_history)
         self.send_button.clicked.connect(self.send_message)
+        self.cancel_button.clicked.connect(self.cancel_request)
+        self.search_input.textChanged.connect(self._run_search)
+        self.search_input.returnPressed.connect(lambda: self._step_search(-1))
+        self.search_prev_button.clicked.connect(lambda: self._step_search(-1))
+        self.search_next_button.clicked.connect(lambda: self._step_search(1))
+        self.search_close_button.clicked.connect(self.close_search)
         self.user_input.returnPressed.connect(self.send_message)
+        self.user_input.textEdited.connect(self._on_input_edited)
         self.health_query_button.clicked.connect(lambda: self.set_health_query_mode(True))
         self.symptom_checker_button.clicked.connect(lambda: self.set_symptom_checker_mode(True))
-        self.language_toggle_button.clicked.connect(self.toggle_language)
-        self.theme_toggle_button.clicked.connect(self.toggle_theme)
 
-        if GEMINI_AVAILABLE:
-            print("Gemini API integration ready. Make sure to set GEMINI_API_KEY in .env file.")
-
-    def _show_welcome_message(self):
-        welcome_bubble = ModernChatBubble(
+    def show_welcome_message(self):
+        self.chat_model.append(ChatMessage(
+            "bot",
             self.ui_text[self.language]["welcome_message"],
-            self.ui_text[self.language]["bot"],
-            False,
-            self.theme
-        )
-        self.chat_layout.addWidget(welcome_bubble)
-
-    def _add_chat_bubble(self, message, sender, is_user, save_to_history=True):
-        if save_to_history and sender != "✍️ AI is thinking..." and sender != "✍️ AI កំពុងគិត...":
-            self.chat_history.append((message, sender, is_user))
-
-        bubble = ModernChatBubble(message, sender, is_user, self.theme)
-        container = QWidget()
-        container_layout = QHBoxLayout(container)
-        container_layout.setContentsMargins(0, 0, 0, 0)
-
-        if is_user:
-            container_layout.addStretch()
-            container_layout.addWidget(bubble)
-        else:
-            container_layout.addWidget(bubble)
-            container_layout.addStretch()
-
-        self.chat_layout.addWidget(container)
-        QTimer.singleShot(50, lambda: self.chat_scroll.verticalScrollBar().setValue(
-            self.chat_scroll.verticalScrollBar().maximum()
+            self.ui_text[self.language]["bot"]
         ))
 
-    def _post_system_message(self, message):
-        system_label = QLabel(message)
-        system_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        system_label.setObjectName("systemMessage")
-
-        container = QWidget()
-        container_layout = QHBoxLayout(container)
-        container_layout.addWidget(system_label)
-        container_layout.setContentsMargins(20, 10, 20, 10)
-
-        self.chat_layout.addWidget(container)
+    def restore_history(self, session_id):
+        """Resume a stored session, loading only its most recent page."""
+        self.session_id = session_id
+        page = self.conversation_store.load_page(self.session_id)
+        self._prepend_history([self._to_chat_message(stored) for stored in page])
+        self._oldest_message_id = page[0].id if page else None
+        self._history_exhausted = len(page) < HISTORY_PAGE_SIZE
+        self._restored_newest_id = page[-1].id if page else None
+        for question, answer in zip(page, page[1:]):
+            if question.kind == "user" and answer.kind == "bot":
+                self.context.add_exchange(question.text, answer.text)
+
+    def _load_older_history(self):
+        if self._history_exhausted:
+            return
+        page = self.conversation_store.load_page(self.session_id, before_id=self._oldest_message_id)
+        self._history_exhausted = len(page) < HISTORY_PAGE_SIZE
+        if page:
+            self._oldest_message_id = page[0].id
+            self._prepend_history([self._to_chat_message(stored) for stored in page])
+
+    def _prepend_history(self, messages):
+        # Restored rows are searched in the store, not indexed in memory
+        self.chat_model.prepend(messages)
+        if self._paging_below_island is not None:
+            self._island_rows += len(messages)
+
+    def _show_history_around(self, message_id):
+        """Page in the rows around an unloaded search hit above the loaded history and return its row.
+
+        Only one such island is kept: it replaces the previous one, so
+        stepping through old matches does not grow the transcript.
+        """
+        self._drop_history_island()
+        page = self.conversation_store.load_window(self.session_id, message_id, before_id=self._oldest_message_id)
+        rows = [self._to_chat_message(stored) for stored in page]
+        hidden = self.conversation_store.count_between(self.session_id, page[-1].id, self._oldest_message_id)
+        if hidden:
+            rows.append(ChatMessage("system", self.ui_text[self.language]["history_gap"].format(count=hidden)))
+        self._paging_below_island = (self._oldest_message_id, self._history_exhausted)
+        self._oldest_message_id = page[0].id
+        self._history_exhausted = False
+        self._prepend_history(rows)
+        return next(row for row in rows if row.message_id == message_id)
+
+    def _drop_history_island(self):
+        if self._paging_below_island is None:
+            return
+        self.chat_model.remove_first(self._island_rows)
+        self._oldest_message_id, self._history_exhausted = self._paging_below_island
+        self._paging_below_island = None
+        self._island_rows = 0
+
+    @staticmethod
+    def _to_chat_message(stored):
+        return ChatMessage(stored.kind, stored.text, stored.sender, stored.id, stored.created_at)
+
+    def _current_mode(self):
+        return 'health' if self.health_query_button.isChecked() else 'symptom'
+
+    def _add_chat_bubble(self, message, sender, is_user, save_to_history=True, latency_ms=None, model=None):
+        bubble = self.chat_model.append(
+            ChatMessage("user" if is_user else "bot", message, sender, created_at=time.time()))
+        if save_to_history:
+            self._save_to_history(bubble, self._current_mode(), self.language, latency_ms, model)
+        self._scroll_to_bottom()
+        return bubble
+
+    def _save_to_history(self, bubble, mode, language, latency_ms=None, model=None):
+        """Store a finished bubble; answers also record their latency and the model that wrote them."""
+        # A new tab gets its session with its first message, so unused tabs leave nothing behind
+        if self.session_id is None:
+            self.session_id = self.conversation_store.new_session()
+        # Bubbles are saved once their text is final, which is also when they become searchable
+        self.search_index.append(bubble, bubble.text)
+        self.conversation_store.append(self.session_id, bubble.kind, bubble.sender, bubble.text,
+                                       mode, language, bubble.created_at, latency_ms, model)
+
+    def _scroll_to_bottom(self):
+        QTimer.singleShot(50, self.chat_view.scrollToBottom)
+
+    def post_system_message(self, message):
+        notice = self.chat_model.append(ChatMessage("system", message))
+        self._scroll_to_bottom()
+        return notice
 
     def update_ui_text(self):
-        """Updates all UI text elements based on the current language."""
+        """Updates the tab's text elements based on its language."""
         lang = self.language
-        self.setWindowTitle(self.ui_text[lang]["window_title"])
-        self.title_label.setText(self.ui_text[lang]["window_title"])
         self.health_query_button.setText(self.ui_text[lang]["health_query_btn"])
         self.symptom_checker_button.setText(self.ui_text[lang]["symptom_checker_btn"])
-        self.language_toggle_button.setText(self.ui_text[lang]["language_btn"])
-        self.theme_toggle_button.setText(self.ui_text[lang]["theme_btn"])
         self.user_input.setPlaceholderText(self.ui_text[lang]["input_placeholder"])
         self.send_button.setText(self.ui_text[lang]["send_btn"])
+        self.cancel_button.setText(self.ui_text[lang]["cancel_btn"])
+        self.search_input.setPlaceholderText(self.ui_text[lang]["search_placeholder"])
 
         if self.health_query_button.isChecked():
             self.mode_label.setText(self.ui_text[lang]["mode_label_health"])
@@ -388,76 +414,41 @@ class HealthBotDemoWindow(QMainWindow):
             self.mode_label.setText(self.ui_text[lang]["mode_label_symptom"])
 
     def toggle_language(self):
-        """Toggles the language and updates the UI."""
+        """Toggles the tab's language and updates its UI."""
         self.language = "km" if self.language == "en" else "en"
         self.update_ui_text()
-        self._create_suggestion_buttons()
-        self._update_suggestions_layout()
-        self._post_system_message(
+        self._show_suggestions()
+        self.post_system_message(
             self.ui_text[self.language]["switched_to_km" if self.language == "km" else "switched_to_en"])
 
-    def toggle_theme(self):
-        self.theme = "dark" if self.theme == "light" else "light"
-        UI_TEXT["en"]["theme_btn"] = "☀️" if self.theme == "dark" else "🌙"
-        UI_TEXT["km"]["theme_btn"] = "☀️" if self.theme == "dark" else "🌙"
-
-        self.update_ui_text()
-        self._apply_styles()
-        self._refresh_chat_bubbles()
-
-    def _refresh_chat_bubbles(self):
-        for i in reversed(range(self.chat_layout.count())):
-            self.chat_layout.itemAt(i).widget().setParent(None)
-        for message, sender, is_user in self.chat_history:
-            self._add_chat_bubble(message, sender, is_user, save_to_history=False)
-        self._show_welcome_message()
-
-    def _create_suggestion_buttons(self):
-        """Create quick suggestion buttons based on current mode and language."""
-        # Clear existing buttons
-        for btn in self.suggestion_buttons:
-            btn.deleteLater()
-        self.suggestion_buttons.clear()
-
-        # Define suggestions for each mode and language
-        suggestions = {
-            'health': {
-                'en': ['💊 Medication Info', '🏃 Exercise Tips', '🥗 Nutrition Help', '😴 Sleep Issues'],
-                'km': ['💊 ព័ត៌មានឱសថ', '🏃 គន្លឹះហាត់ប្រាណ', '🥗 ជំនួយអាហារូបត្ថម្ភ', '😴 បញ្ហាគេង']
-            },
-            'symptom': {
-                'en': ['🤒 Fever & Chills', '🤕 Headache', '😷 Cold Symptoms', '🤧 Allergies'],
-                'km': ['🤒 គ្រុនក្តៅ', '🤕 ឈឺក្បាល', '😷 រោគសញ្ញាផ្តាសាយ', '🤧 អាលែកហ្សុី']
-            }
-        }
-
-        mode = 'health' if self.health_query_button.isChecked() else 'symptom'
-        current_suggestions = suggestions[mode][self.language]
-
-        for suggestion in current_suggestions:
+    def set_theme(self, theme):
+        self.chat_view.set_theme(theme)
+
+    def _show_suggestions(self):
+        """Flip to the suggestion panel for the current mode and language."""
+        key = (self._current_mode(), self.language)
+        page = self._suggestion_pages.get(key)
+        if page is None:
+            page = self._suggestion_pages[key] = self._create_suggestion_page(SUGGESTIONS[key[0]][key[1]])
+            self.suggestion_stack.addWidget(page)
+        self.suggestion_stack.setCurrentWidget(page)
+
+    def _create_suggestion_page(self, suggestions):
+        """Build one panel of suggestion buttons; it is kept and reused from then on."""
+        page = QWidget()
+        layout = QHBoxLayout(page)
+        layout.setContentsMargins(24, 8, 24, 8)
+        layout.setSpacing(8)
+        for suggestion in suggestions:
             btn = ModernButton(suggestion)
+            # Styled by the app stylesheet's ModernButton#suggestion_button rules
+            btn.setObjectName("suggestion_button")
             btn.setMaximumHeight(35)
-            btn.setMinimumWidth(120)  # Fixed minimum width
-            btn.setStyleSheet("""
-                QPushButton {
-                    background-color: rgba(100, 149, 237, 0.1);
-                    border: 1px solid rgba(100, 149, 237, 0.3);
-                    border-radius: 18px;
-                    padding: 6px 12px;
-                    font-size: 12px;
-                    color: #4a90e2;
-                    text-align: center;
-                }
-                QPushButton:hover {
-                    background-color: rgba(100, 149, 237, 0.2);
-                    border-color: rgba(100, 149, 237, 0.5);
-                }
-                QPushButton:pressed {
-                    background-color: rgba(100, 149, 237, 0.3);
-                }
-            """)
+            btn.setMinimumWidth(120)
             btn.clicked.connect(lambda checked, text=suggestion: self._use_suggestion(text))
-            self.suggestion_buttons.append(btn)
+            layout.addWidget(btn)
+        layout.addStretch()
+        return page
 
     def _use_suggestion(self, suggestion_text):
         """Use a suggestion as input."""
@@ -465,47 +456,236 @@ class HealthBotDemoWindow(QMainWindow):
         clean_text = suggestion_text.split(' ', 1)[1] if ' ' in suggestion_text else suggestion_text
         self.user_input.setText(clean_text)
         self.user_input.setFocus()
+        self._start_prefetch(clean_text)
+
+    def _start_prefetch(self, message):
+        """Start answering a picked suggestion before the user presses Send.
+
+        Only model answers are worth it (cached and offline ones are already
+        instant). ``_start_next_request`` adopts the worker if the same text
+        is sent in the same mode, language and conversation state.
+        """
+        self._cancel_prefetch()
+        mode, lang = self._current_mode(), self.language
+        if (not PREFETCH_SUGGESTIONS or self.scheduler.busy or not self.model_client
+                or not self.model_client.available(mode)):
+            return
+        if not len(self.context) and self.response_cache.contains(mode, lang, message):
+            return
+        if self.knowledge_base.best_answer(message, lang, KB_ANSWER_CONFIDENCE) is not None:
+            return
+        worker = GeminiWorker(self.model_client, message, mode, lang, context=self.context,
+                              cancel_event=threading.Event(), timeout=REQUEST_TIMEOUT, trace=self.tracer.start(),
+                              owner=self)
+        worker.speculative = True
+        worker.start()
+        self._prefetch = worker
+        self._prefetch_key = (message, mode, lang, self.context.revision)
+
+    def _cancel_prefetch(self):
+        if self._prefetch is not None:
+            self._prefetch.cancel_event.set()
+            self._prefetch = None
+
+    def _on_input_edited(self, text):
+        if self._prefetch is not None and text.strip() != self._prefetch.message:
+            self._cancel_prefetch()
+
+    def _take_prefetch(self, request):
+        """Hand the speculative worker to ``request`` if it answers the same question."""
+        worker, self._prefetch = self._prefetch, None
+        if worker is None:
+            return None
+        if self._prefetch_key != (request.message, request.mode, request.language, self.context.revision):
+            worker.cancel_event.set()
+            return None
+        request.cancel_event = worker.cancel_event
+        # Work done before Send counts as instant: clamp its marks to the send time
+        prefetch_trace, worker.trace = worker.trace, request.trace
+        sent = request.trace.marks["queued"]
+        for name, moment in prefetch_trace.marks.items():
+            request.trace.marks.setdefault(name, max(moment, sent))
+        return worker
 
     def send_message(self):
-        user_message = self.user_input.text().strip()
-
-        # Input validation with better UX
-        if not user_message:
-            self._shake_input()
-            return
+        trace = self.tracer.start()
+        with trace.span("validate"):
+            user_message = self.user_input.text().strip()
 
-        if len(user_message) > 500:
-            self._show_input_hint("Message too long (max 500 characters)")
-            return
+            # Input validation with better UX
+            if not user_message:
+                self._shake_input()
+                return
 
-        if self.is_typing:
-            return
+            if len(user_message) > 500:
+                self._show_input_hint("Message too long (max 500 characters)")
+                return
 
         lang = self.language
-        self._add_chat_bubble(user_message, self.ui_text[lang]["you"], True)
+        mode = self._current_mode()
+        with trace.span("insert"):
+            bubble = self._add_chat_bubble(user_message, self.ui_text[lang]["you"], True)
         self.user_input.clear()
-        self.is_typing = True
 
-        # Disable send button and show loading state
-        self.send_button.setEnabled(False)
-        self.send_button.setText("⏳" if lang == "en" else "⏳")
+        # Cached answers are context-free, so only a conversation's opening question may use one
+        if not self.scheduler.busy and not len(self.context):
+            with trace.span("cache"):
+                cached_response = self.response_cache.get(mode, lang, user_message)
+            if cached_response is not None:
+                self.context.add_exchange(user_message, cached_response)
+                with trace.span("insert"):
+                    self._add_chat_bubble(cached_response, self.ui_text[lang]["bot"], False,
+                                          latency_ms=trace.elapsed_ms())
+                trace.finish("cache")
+                return
+
+        # Common questions the offline guide covers well never reach the network
+        if not self.scheduler.busy:
+            with trace.span("knowledge"):
+                hit = self.knowledge_base.best_answer(user_message, lang, KB_ANSWER_CONFIDENCE)
+            if hit is not None:
+                self._add_knowledge_answer(user_message, hit, trace)
+                trace.finish("offline")
+                return
 
-        self._show_typing_indicator()
+        request = ScheduledRequest(user_message, mode, lang)
+        request.bubble = bubble
+        request.trace = trace
+        trace.mark("queued")
+        for stale in self.scheduler.submit(request):
+            self._abandon_request(stale, self.ui_text[lang]["superseded_note"])
+        self._start_next_request()
+        if request.state == QUEUED:
+            self.chat_model.update_note(bubble, self.ui_text[lang]["queued_note"])
+
+    def _start_next_request(self):
+        request = self.scheduler.start_next()
+        if request is None:
+            if not self.scheduler.busy:
+                self._set_busy(False)
+            return
 
-        if GEMINI_AVAILABLE and self.api_key:
-            mode = 'health' if self.health_query_button.isChecked() else 'symptom'
-            self.gemini_worker = GeminiWorker(user_message, mode, lang, self.api_key)
-            self.gemini_worker.response_ready.connect(self._handle_gemini_response)
-            self.gemini_worker.error_occurred.connect(self._handle_gemini_error)
+        self.chat_model.update_note(request.bubble, "")
+        self._set_busy(True)
+        self._show_typing_indicator()
+        QTimer.singleShot(int(request.timeout * 1000), lambda: self._on_request_deadline(request))
+
+        prefetched = self._take_prefetch(request)
+        if prefetched is not None:
+            self.gemini_worker = prefetched
+            self._connect_worker(prefetched)
+            # Chunks (or the whole answer) may have arrived before anything was connected
+            QTimer.singleShot(0, prefetched.replay)
+        elif self.model_client and self.model_client.available(request.mode):
+            self.gemini_worker = GeminiWorker(self.model_client, request.message, request.mode,
+                                             request.language, context=self.context,
+                                             cancel_event=request.cancel_event, timeout=request.timeout,
+                                             trace=request.trace, owner=self)
+            self._connect_worker(self.gemini_worker)
             self.gemini_worker.start()
         else:
-            QTimer.singleShot(1000, lambda: self._send_mock_response(lang))
+            QTimer.singleShot(0, lambda: self._send_fallback_response(request))
+
+    def _connect_worker(self, worker):
+        worker.chunk_ready.connect(self._handle_gemini_chunk)
+        worker.response_ready.connect(self._handle_gemini_response)
+        worker.error_occurred.connect(self._handle_gemini_error)
+
+    def open_search(self):
+        self.search_frame.show()
+        self.search_input.setFocus()
+        self.search_input.selectAll()
+
+    def close_search(self):
+        self.search_frame.hide()
+        self._search_results = []
+        self.chat_view.reveal(None)
+        self.user_input.setFocus()
+
+    def _run_search(self, query):
+        """Search as the user types, starting from the newest match.
+
+        Results are store ids for restored history (paged in when shown)
+        followed by this run's rows from the in-memory index.
+        """
+        self._search_results = []
+        if query.strip():
+            if self._restored_newest_id is not None:
+                self._search_results = self.conversation_store.search(
+                    self.session_id, query, self._restored_newest_id)
+            self._search_results += self.search_index.search(query)
+        self._search_position = len(self._search_results) - 1
+        self._show_search_result()
+
+    def _step_search(self, step):
+        """Move to an older (-1) or newer (+1) match, wrapping around."""
+        if self._search_results:
+            self._search_position = (self._search_position + step) % len(self._search_results)
+            self._show_search_result()
+
+    def _show_search_result(self):
+        if not self._search_results:
+            self.chat_view.reveal(None)
+            has_query = bool(self.search_input.text().strip())
+            self.search_status.setText(self.ui_text[self.language]["search_no_results"] if has_query else "")
+            return
+        hit = self._search_results[self._search_position]
+        if not isinstance(hit, ChatMessage):
+            loaded = next((row for row in self.chat_model.messages() if row.message_id == hit), None)
+            hit = loaded or self._show_history_around(hit)
+        self.chat_view.reveal(hit)
+        self.search_status.setText(f"{self._search_position + 1}/{len(self._search_results)}")
+
+    def on_escape(self):
+        if self.search_frame.isVisible() and self.search_input.hasFocus():
+            self.close_search()
+        else:
+            self.cancel_request()
+
+    def cancel_request(self):
+        """Stop the running request (Esc / stop button) and move on to the next one."""
+        request = self.scheduler.cancel()
+        if request is None:
+            return
+        self._abandon_request(request, self.ui_text[self.language]["cancelled_note"])
+        self._start_next_request()
+
+    def close_conversation(self):
+        """Drop everything still queued or running before the tab goes away."""
+        self._cancel_prefetch()
+        self.scheduler.cancel_all()
+        self.gemini_worker = None
+
+    def _on_request_deadline(self, request):
+        if not self.scheduler.expire(request):
+            return
+        lang = self.language
+        self._abandon_request(request, self.ui_text[lang]["timed_out_note"])
+        self.post_system_message(self.ui_text[lang]["request_timed_out"])
+        self._start_next_request()
+
+    def _abandon_request(self, request, note):
+        """Drop the UI state of a cancelled, expired or superseded request.
+
+        The pool thread notices ``cancel_event`` at its next chunk; any
+        signal it still emits is ignored because the worker is detached here.
+        """
+        self.chat_model.update_note(request.bubble, note)
+        if self.gemini_worker is not None and self.gemini_worker.cancel_event is request.cancel_event:
+            self.gemini_worker = None
+            self._remove_typing_indicator()
+            if self.streaming_bubble is not None:
+                self.chat_model.remove(self.streaming_bubble)
+                self.streaming_bubble = None
+
+    def _set_busy(self, busy):
+        self.cancel_button.setVisible(busy)
+        self.busy_changed.emit(busy)
 
     def _shake_input(self):
         """Visual feedback for empty input."""
-        original_style = self.user_input.styleSheet()
-        self.user_input.setStyleSheet(original_style + "border: 2px solid #ff6b6b;")
-        QTimer.singleShot(1000, lambda: self.user_input.setStyleSheet(original_style))
+        set_style_state(self.user_input, "error", True)
+        QTimer.singleShot(1000, lambda: set_style_state(self.user_input, "error", False))
 
     def _show_input_hint(self, message):
         """Show temporary hint below input field."""
@@ -518,92 +698,449 @@ class HealthBotDemoWindow(QMainWindow):
         system_msg = "✍️ " + (
             "AI is thinking..." if lang == "en" else "AI កំពុងគិត..."
         )
-        self._post_system_message(system_msg)
+        self.typing_indicator = self.post_system_message(system_msg)
+
+    def _handle_gemini_chunk(self, partial_text):
+        """Grow the streaming bubble in place as chunks arrive."""
+        if self.sender() is not self.gemini_worker:
+            return
+        if self.streaming_bubble is None:
+            self._remove_typing_indicator()
+            with self.gemini_worker.trace.span("insert"):
+                self.streaming_bubble = self._add_chat_bubble(
+                    partial_text, self.ui_text[self.language]["bot"], False, save_to_history=False)
+        else:
+            self.chat_model.update_text(self.streaming_bubble, partial_text)
+            self._scroll_to_bottom()
 
     def _handle_gemini_response(self, response_text):
+        worker = self.gemini_worker
+        if self.sender() is not worker:
+            return
         self._remove_typing_indicator()
-        self._reset_send_button()
+        self.gemini_worker = None
+        if not len(self.context):
+            self.response_cache.put(worker.mode, worker.language, worker.message, response_text)
+        self.context.add_exchange(worker.message, response_text)
         lang = self.language
-        self._add_chat_bubble(response_text, self.ui_text[lang]["bot"], False)
-        self.is_typing = False
+        trace = worker.trace
+        model = self.model_client.model_id(worker.mode)
+        with trace.span("render"):
+            # Memoized, so the delegate's own call when painting is free
+            render_markdown(response_text)
+        with trace.span("insert"):
+            if self.streaming_bubble is not None:
+                self.chat_model.update_text(self.streaming_bubble, response_text)
+                self._save_to_history(self.streaming_bubble, worker.mode, worker.language,
+                                      trace.elapsed_ms(), model)
+                self.streaming_bubble = None
+            else:
+                self._add_chat_bubble(response_text, self.ui_text[lang]["bot"], False,
+                                      latency_ms=trace.elapsed_ms(), model=model)
+        trace.between("queue_wait", "queued", "started")
+        trace.between("ttfb", "started", "first_chunk")
+        trace.between("generation", "started", "done")
+        trace.finish("prefetch" if worker.speculative else "model")
+        self.scheduler.finish(self.scheduler.current)
+        self._start_next_request()
 
     def _handle_gemini_error(self, error_message):
+        if self.sender() is not self.gemini_worker:
+            return
         self._remove_typing_indicator()
-        self._reset_send_button()
-        lang = self.language
-        self._post_system_message(f"⚠️ {error_message}")
-        self._send_mock_response(lang)
-
-    def _reset_send_button(self):
-        """Reset send button to normal state."""
-        self.send_button.setEnabled(True)
-        lang = self.language
-        self.send_button.setText(self.ui_text[lang]["send_btn"])
+        self.gemini_worker = None
+        if self.streaming_bubble is not None:
+            self.chat_model.remove(self.streaming_bubble)
+            self.streaming_bubble = None
+        self.post_system_message(f"⚠️ {error_message}")
+        self._send_fallback_response(self.scheduler.current)
 
     def _remove_typing_indicator(self):
-        if self.chat_layout.count() > 0:
-            last_item = self.chat_layout.itemAt(self.chat_layout.count() - 1).widget()
-            last_item.setParent(None)
+        if self.typing_indicator is not None:
+            self.chat_model.remove(self.typing_indicator)
+            self.typing_indicator = None
 
-    def _send_mock_response(self, lang):
-        if self.health_query_button.isChecked():
-            bot_response = self.ui_text[lang]["mock_health_response"]
+    def _send_fallback_response(self, request):
+        """Answer offline: the most relevant guide entry, else the generic mock text."""
+        if request is None or request.finished:
+            return
+        self._remove_typing_indicator()
+        trace = request.trace
+        with trace.span("knowledge"):
+            hit = self.knowledge_base.best_answer(request.message, request.language, KB_FALLBACK_CONFIDENCE)
+        if hit is not None:
+            self._add_knowledge_answer(request.message, hit, trace)
         else:
-            bot_response = self.ui_text[lang]["mock_symptom_response"]
-
-        self._add_chat_bubble(bot_response, self.ui_text[lang]["bot"], False)
-        self._reset_send_button()
-        self.is_typing = False
+            lang = request.language
+            key = "mock_health_response" if request.mode == "health" else "mock_symptom_response"
+            with trace.span("insert"):
+                self._add_chat_bubble(self.ui_text[lang][key], self.ui_text[lang]["bot"], False,
+                                      latency_ms=trace.elapsed_ms())
+        trace.finish("fallback")
+        self.scheduler.finish(request)
+        self._start_next_request()
+
+    def _add_knowledge_answer(self, question, hit, trace):
+        with trace.span("insert"):
+            bubble = self._add_chat_bubble(hit.answer, self.ui_text[self.language]["bot"], False,
+                                           latency_ms=trace.elapsed_ms())
+            self.chat_model.update_note(bubble, self.ui_text[self.language]["offline_note"])
+        self.context.add_exchange(question, hit.answer)
 
     def set_health_query_mode(self, from_click=False):
         self.health_query_button.setChecked(True)
         self.symptom_checker_button.setChecked(False)
         self.mode_label.setText(self.ui_text[self.language]["mode_label_health"])
-        self._create_suggestion_buttons()
-        self._update_suggestions_layout()
+        self._show_suggestions()
         if from_click:
-            self._post_system_message(self.ui_text[self.language]["switched_to_health"])
+            self.post_system_message(self.ui_text[self.language]["switched_to_health"])
 
     def set_symptom_checker_mode(self, from_click=False):
         self.symptom_checker_button.setChecked(True)
         self.health_query_button.setChecked(False)
         self.mode_label.setText(self.ui_text[self.language]["mode_label_symptom"])
-        self._create_suggestion_buttons()
-        self._update_suggestions_layout()
+        self._show_suggestions()
         if from_click:
-            self._post_system_message(self.ui_text[self.language]["switched_to_symptom"])
-
-    def _update_suggestions_layout(self):
-        """Update suggestion buttons in the layout."""
-        layout = self.suggestions_frame.layout()
-        if layout:
-            # Clear existing items from layout completely
-            while layout.count():
-                child = layout.takeAt(0)
-                if child.widget():
-                    child.widget().setParent(None)
-
-            # Re-add new buttons with proper spacing
-            for btn in self.suggestion_buttons:
-                layout.addWidget(btn)
-            layout.addStretch()  # Push buttons to the left
-
-            # Force layout update
-            self.suggestions_frame.update()
-            self.suggestions_frame.repaint()
+            self.post_system_message(self.ui_text[self.language]["switched_to_symptom"])
+
+
+class HealthBotDemoWindow(QMainWindow):
+
+    def __init__(self, profiler=None, client=None, data_dir=None):
+        """``client`` replaces the Gemini client (e.g. a fake in benchmarks);
+        ``data_dir`` relocates the cache, history and trace files."""
+        super().__init__()
+        self.theme = THEME
+        self.profiler = profiler or StartupProfiler(enabled=False)
+        self._first_paint_done = False
+        self._tabs_opened = 0
+
+        with self.profiler.phase("client_setup"):
+            if client is not None:
+                self.api_key = None
+                self.model_client = client
+            else:
+                self.api_key = self._load_api_key()
+                self.model_client = ModelClient.from_settings(self.api_key)
+            data_dir = Path(data_dir) if data_dir is not None else DATA_DIR
+            self.response_cache = ResponseCache(data_dir / RESPONSE_CACHE_PATH.name)
+            self.conversation_store = ConversationStore(data_dir / CONVERSATION_DB_PATH.name)
+            self.knowledge_base = KnowledgeBase()
+            self.tracer = Tracer(data_dir / TRACE_DIR.name, version=QApplication.applicationVersion())
+        self.frame_monitor = FrameMonitor()
+        ModernButton.effects_enabled = self.frame_monitor.level == HIGH
+        with self.profiler.phase("_load_custom_fonts"):
+            self._load_custom_fonts()
+        self.ui_text = UI_TEXT
+        self._configure_window()
+        with self.profiler.phase("_create_widgets"):
+            self._create_widgets()
+            self._create_layout()
+        with self.profiler.phase("_apply_styles"):
+            self._apply_styles()
+        self._connect_signals()
+
+        with self.profiler.phase("initial_content"):
+            # The first tab resumes the last session
+            self.new_tab(self.conversation_store.latest_session())
+
+    @property
+    def current_tab(self):
+        return self.conversation_tabs.currentWidget()
+
+    def tabs(self):
+        return [self.conversation_tabs.widget(index) for index in range(self.conversation_tabs.count())]
+
+    def new_tab(self, session_id=None):
+        """Open a conversation tab (resuming ``session_id`` if given) and switch to it."""
+        language = self.current_tab.language if self.current_tab is not None else "en"
+        self._tabs_opened += 1
+        tab = ConversationTab(self, self._tabs_opened, language)
+        if session_id is not None:
+            tab.restore_history(session_id)
+        tab.show_welcome_message()
+        tab.busy_changed.connect(lambda busy, tab=tab: self._update_tab_title(tab))
+        self.conversation_tabs.addTab(tab, "")
+        self._update_tab_title(tab)
+        self.conversation_tabs.setCurrentWidget(tab)
+        tab.user_input.setFocus()
+        return tab
+
+    def close_tab(self, index):
+        """Close a conversation tab; the last one stays open."""
+        if self.conversation_tabs.count() <= 1:
+            return
+        tab = self.conversation_tabs.widget(index)
+        tab.close_conversation()
+        self.conversation_tabs.removeTab(index)
+        tab.deleteLater()
+
+    def _update_tab_title(self, tab):
+        title = self.ui_text[tab.language]["tab_title"].format(number=tab.number)
+        if tab.scheduler.busy:
+            title = "⏳ " + title
+        self.conversation_tabs.setTabText(self.conversation_tabs.indexOf(tab), title)
+
+    def _on_tab_changed(self, index):
+        if self.current_tab is not None:
+            self.update_ui_text()
+
+    def event(self, event):
+        if event.type() != QEvent.Type.UpdateRequest:
+            return super().event(event)
+        # The top-level UpdateRequest repaints and flushes every dirty widget,
+        # graphics effects included, so its duration is the frame time
+        started = time.perf_counter()
+        handled = super().event(event)
+        if self.frame_monitor.record((time.perf_counter() - started) * 1000):
+            QTimer.singleShot(0, self._on_slow_frames)
+        return handled
+
+    def _on_slow_frames(self):
+        """Frames are over budget: drop per-widget effects for the rest of the run."""
+        ModernButton.effects_enabled = False
+        for button in self.findChildren(ModernButton):
+            button.set_shadow(False)
+        self._restyle()
+        print(f"Frames over {self.frame_monitor.budget_ms} ms budget "
+              f"(median {self.frame_monitor.stats()['p50']:.0f} ms); switched to low rendering quality")
+
+    def _restyle(self):
+        # Only colors change, so the transcripts keep their layout
+        with ExitStack() as frozen:
+            for tab in self.tabs():
+                frozen.enter_context(tab.chat_view.keep_layout())
+            self.setStyleSheet(get_app_stylesheet(self.theme, self.frame_monitor.level))
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._first_paint_done:
+            self._first_paint_done = True
+            self.profiler.mark("first_paint")
+            # Let the paint reach the screen before doing background start-up work
+            QTimer.singleShot(0, self._on_first_idle)
+
+    def _on_first_idle(self):
+        if self.profiler.enabled:
+            print(self.profiler.report())
+        if self.model_client:
+            started = time.perf_counter()
+            warm_up = self.model_client.warm_up()
+            warm_up.add_done_callback(lambda future: self._on_client_warm(future, started))
+
+    def _on_client_warm(self, future, started):
+        # Runs on the pool thread; only reports timing
+        if self.profiler.enabled and not future.cancelled():
+            seconds = time.perf_counter() - started
+            status = "failed" if future.exception() else "ready"
+            print(f"{self.profiler.record('model_warm_up', seconds)} (background, {status})")
+
+    def closeEvent(self, event):
+        for tab in self.tabs():
+            tab.close_conversation()
+        if self.model_client:
+            self.model_client.shutdown()
+        stats = self.response_cache.stats()
+        print(f"Response cache: {stats['hits']} hits, {stats['misses']} misses")
+        self.response_cache.close()
+        self.conversation_store.close()
+        self.tracer.export()
+        super().closeEvent(event)
+
+    def _load_custom_fonts(self):
+        """Load custom fonts - simple version."""
+        font_path = ASSETS_DIR / "Dangrek-Regular.ttf"
+
+        if font_path.exists():
+            font_id = QFontDatabase.addApplicationFont(str(font_path))
+            if font_id != -1:
+                print("Custom font loaded successfully")
+        else:
+            print("Custom font not found, using system fonts")
+
+    def _load_api_key(self):
+        api_key = get_api_key()
+        if not api_key:
+            print("Warning: GEMINI_API_KEY not found or not properly configured.")
+            print("Please set a valid API key in your config/.env file or environment variables.")
+            if not DOTENV_AVAILABLE:
+                print("Consider installing python-dotenv: pip install python-dotenv")
+            else:
+                print("Make sure you have a valid .env file in the 'config' folder.")
+                print("You can copy config/.env.example to config/.env and add your API key.")
+            return None
+        return api_key
+
+    def _configure_window(self):
+        """Set up the main window properties."""
+        self.setGeometry(100, 100, 900, 800)
+        self.setMinimumSize(600, 500)
+
+        # Load window icon - simple version
+        icon_path = ASSETS_DIR / "icon.png"
+        if icon_path.exists():
+            self.setWindowIcon(QIcon(str(icon_path)))
+            print("Icon loaded successfully")
+        else:
+            print("Icon not found, using default")
+
+    def _create_widgets(self):
+        self.central_widget = QWidget()
+        self.setCentralWidget(self.central_widget)
+        self.header_frame = QFrame()
+        self.header_frame.setMinimumHeight(70)
+        self.title_label = QLabel()
+        self.language_toggle_button = ModernButton()
+        self.theme_toggle_button = ModernButton()
+        self.search_toggle_button = ModernButton("🔍")
+        self.export_button = ModernButton("📤")
+        self.import_button = ModernButton("📥")
+        self.conversation_tabs = QTabWidget()
+        self.conversation_tabs.setDocumentMode(True)
+        self.conversation_tabs.setTabsClosable(True)
+        self.conversation_tabs.setMovable(True)
+        self.new_tab_button = ModernButton("+")
+        self.new_tab_button.setMinimumHeight(28)
+        self.conversation_tabs.setCornerWidget(self.new_tab_button)
+        self.perf_overlay = PerfOverlay(self.tracer, self.conversation_tabs, self.frame_monitor)
+        self.trace_export_timer = QTimer(self)
+        self.trace_export_timer.start(TRACE_EXPORT_INTERVAL * 1000)
+
+    def _create_layout(self):
+        self.main_layout = QVBoxLayout(self.central_widget)
+        self.main_layout.setSpacing(0)
+        self.main_layout.setContentsMargins(0, 0, 0, 0)
+        header_layout = QHBoxLayout(self.header_frame)
+        header_layout.addWidget(self.title_label)
+        header_layout.addStretch()
+        header_layout.addWidget(self.language_toggle_button)
+        header_layout.addWidget(self.search_toggle_button)
+        header_layout.addWidget(self.export_button)
+        header_layout.addWidget(self.import_button)
+        header_layout.addWidget(self.theme_toggle_button)
+        header_layout.setContentsMargins(24, 16, 24, 16)
+        header_layout.setSpacing(12)
+        self.main_layout.addWidget(self.header_frame)
+        self.main_layout.addWidget(self.conversation_tabs, 1)
+
+    def _connect_signals(self):
+        QShortcut(QKeySequence(Qt.Key.Key_Escape), self, activated=lambda: self.current_tab.on_escape())
+        QShortcut(QKeySequence.StandardKey.Find, self, activated=self.open_search)
+        QShortcut(QKeySequence.StandardKey.AddTab, self, activated=self.new_tab)
+        QShortcut(QKeySequence.StandardKey.Close, self,
+                  activated=lambda: self.close_tab(self.conversation_tabs.currentIndex()))
+        QShortcut(QKeySequence.StandardKey.Save, self, activated=lambda: self.export_conversation())
+        QShortcut(QKeySequence.StandardKey.Open, self, activated=lambda: self.import_conversations())
+        QShortcut(QKeySequence("Ctrl+Shift+P"), self, activated=self.perf_overlay.toggle)
+        self.trace_export_timer.timeout.connect(self.tracer.export)
+        self.search_toggle_button.clicked.connect(self.open_search)
+        self.export_button.clicked.connect(lambda: self.export_conversation())
+        self.import_button.clicked.connect(lambda: self.import_conversations())
+        self.new_tab_button.clicked.connect(lambda: self.new_tab())
+        self.conversation_tabs.tabCloseRequested.connect(self.close_tab)
+        self.conversation_tabs.currentChanged.connect(self._on_tab_changed)
+        self.language_toggle_button.clicked.connect(self.toggle_language)
+        self.theme_toggle_button.clicked.connect(self.toggle_theme)
+
+        if GEMINI_AVAILABLE:
+            print("Gemini API integration ready. Make sure to set GEMINI_API_KEY in .env file.")
+
+    def open_search(self):
+        self.current_tab.open_search()
+
+    def export_conversation(self, path=None):
+        """Write the current tab's conversation to an NDJSON file (asks where when ``path`` is None)."""
+        tab = self.current_tab
+        text = self.ui_text[tab.language]
+        if tab.session_id is None:
+            tab.post_system_message(text["export_nothing"])
+            return
+        if path is None:
+            path, _ = QFileDialog.getSaveFileName(self, text["export_tooltip"],
+                                                  f"conversation-{tab.session_id[:8]}.ndjson",
+                                                  "NDJSON (*.ndjson *.jsonl)")
+            if not path:
+                return
+        try:
+            with open(path, "w", encoding="utf-8", newline="\n") as stream:
+                count = export_transcript(self.conversation_store, stream, tab.session_id,
+                                          QApplication.applicationVersion())
+        except OSError as e:
+            tab.post_system_message(f"⚠️ {e}")
+            return
+        tab.post_system_message(text["exported"].format(count=count, path=path))
+
+    def import_conversations(self, path=None):
+        """Add the conversations in an NDJSON file to the history and open each in a new tab."""
+        text = self.ui_text[self.current_tab.language]
+        if path is None:
+            path, _ = QFileDialog.getOpenFileName(self, text["import_tooltip"], "", "NDJSON (*.ndjson *.jsonl)")
+            if not path:
+                return
+        try:
+            with open(path, encoding="utf-8") as stream:
+                sessions = import_transcript(self.conversation_store, stream)
+        except TranscriptError as e:
+            # Sessions before the bad line are already stored: open them too
+            for session_id in e.sessions:
+                self.new_tab(session_id)
+            message = text["import_partial"] if e.sessions else text["import_failed"]
+            self.current_tab.post_system_message(message.format(path=path, error=e, count=len(e.sessions)))
+            return
+        except (OSError, ValueError) as e:
+            # UnicodeDecodeError is a ValueError
+            self.current_tab.post_system_message(text["import_failed"].format(path=path, error=e))
+            return
+        for session_id in sessions:
+            self.new_tab(session_id)
+
+    def update_ui_text(self):
+        """Updates the window's text elements based on the current tab's language."""
+        lang = self.current_tab.language
+        self.setWindowTitle(self.ui_text[lang]["window_title"])
+        self.title_label.setText(self.ui_text[lang]["window_title"])
+        self.language_toggle_button.setText(self.ui_text[lang]["language_btn"])
+        self.theme_toggle_button.setText(self._theme_icon())
+        self.new_tab_button.setToolTip(self.ui_text[lang]["new_tab_tooltip"])
+        self.export_button.setToolTip(self.ui_text[lang]["export_tooltip"])
+        self.import_button.setToolTip(self.ui_text[lang]["import_tooltip"])
+
+    def toggle_language(self):
+        """Toggles the current tab's language; other tabs keep theirs."""
+        tab = self.current_tab
+        tab.toggle_language()
+        self.update_ui_text()
+        self._update_tab_title(tab)
+
+    def toggle_theme(self):
+        """Switch themes in place: only the stylesheet and visible rows are redone."""
+        self.theme = self._next_theme()
+        self.theme_toggle_button.setText(self._theme_icon())
+        self._restyle()
+        self._refresh_chat_bubbles()
+
+    def _next_theme(self):
+        position = THEME_CYCLE.index(self.theme) if self.theme in THEME_CYCLE else -1
+        return THEME_CYCLE[(position + 1) % len(THEME_CYCLE)]
+
+    def _theme_icon(self):
+        # The toggle shows the theme it switches to
+        return THEMES[self._next_theme()]["icon"]
+
+    def _refresh_chat_bubbles(self):
+        for tab in self.tabs():
+            tab.set_theme(self.theme)
 
     def _apply_styles(self):
         font = QFont("Segoe UI", 15)
         font.setStyleHint(QFont.StyleHint.System)
         QApplication.setFont(font)
-        stylesheet = get_app_stylesheet(self.theme)
+        stylesheet = get_app_stylesheet(self.theme, self.frame_monitor.level)
         self.setStyleSheet(stylesheet)
         self.header_frame.setObjectName("header_frame")
         self.title_label.setObjectName("title_label")
-        self.mode_button_frame.setObjectName("mode_button_frame")
-        self.mode_label.setObjectName("mode_label")
-        self.input_frame.setObjectName("input_frame")
-        self.send_button.setObjectName("send_button")
+        self.conversation_tabs.setObjectName("conversation_tabs")
+        self.new_tab_button.setObjectName("new_tab_button")
 
 
 if __name__ == "__main__":
@@ -611,6 +1148,7 @@ if __name__ == "__main__":
     app.setApplicationName("Healthcare Assistant")
     app.setApplicationVersion("2.0")
 
-    demo_window = HealthBotDemoWindow()
+    startup_profiler.mark("qapplication")
+    demo_window = HealthBotDemoWindow(startup_profiler)
     demo_window.show()
     sys.exit(app.exec())
@@ -0,0 +1,114 @@
+import threading
+
+import pytest
+
+from core.client import ClientError, ModelClient
+
+TIMEOUT = 5
+
+
+class FakeBackend:
+    """Streams ``chunks``; with a ``gate`` every chunk after the first waits for it."""
+    rate_limited = False
+    available = True
+    generation_config = {}
+
+    def __init__(self, chunks=("a", "b", "c"), gate=None):
+        self.chunks = chunks
+        self.gate = gate
+        self.calls = 0
+        self.completed = 0
+        self.first_chunk = threading.Event()
+
+    def iter_text(self, prompt, model_name, stream=True, timeout=None):
+        self.calls += 1
+        for number, chunk in enumerate(self.chunks):
+            if number and self.gate is not None:
+                assert self.gate.wait(TIMEOUT)
+            yield chunk
+            self.first_chunk.set()
+        self.completed += 1
+
+    def close(self):
+        pass
+
+
+def make_client(backend, max_workers=2):
+    return ModelClient({"fake": backend}, routes={"health": {"backend": "fake", "model": "m"}},
+                       max_workers=max_workers)
+
+
+def test_identical_submits_share_one_call():
+    gate = threading.Event()
+    backend = FakeBackend(gate=gate)
+    client = make_client(backend)
+    futures = [client.submit("question") for _ in range(5)]
+    gate.set()
+    assert [future.result(TIMEOUT) for future in futures] == ["abc"] * 5
+    assert backend.calls == 1
+    assert client.coalesced == 4
+    client.shutdown()
+
+
+def test_late_follower_is_caught_up_before_newer_chunks():
+    gate = threading.Event()
+    backend = FakeBackend(gate=gate)
+    client = make_client(backend)
+    leader = client.submit("question")
+    assert backend.first_chunk.wait(TIMEOUT)
+    seen = []
+    follower = client.submit("question", on_chunk=seen.append)
+    gate.set()
+    assert follower.result(TIMEOUT) == leader.result(TIMEOUT) == "abc"
+    assert seen[0] == "a" and seen[-1] == "abc"
+    assert seen == sorted(seen, key=len)
+    client.shutdown()
+
+
+def test_one_subscriber_cancelling_leaves_the_others_answered():
+    gate = threading.Event()
+    backend = FakeBackend(gate=gate)
+    client = make_client(backend)
+    cancelled, kept = threading.Event(), threading.Event()
+    first = client.submit("question", cancel_event=cancelled)
+    second = client.submit("question", cancel_event=kept)
+    assert backend.first_chunk.wait(TIMEOUT)
+    cancelled.set()
+    gate.set()
+    with pytest.raises(ClientError) as error:
+        first.result(TIMEOUT)
+    assert error.value.kind == "cancelled"
+    assert second.result(TIMEOUT) == "abc"
+    assert backend.calls == 1 and backend.completed == 1
+    client.shutdown()
+
+
+def test_all_subscribers_cancelling_stops_the_call():
+    gate = threading.Event()
+    backend = FakeBackend(gate=gate)
+    client = make_client(backend)
+    events = [threading.Event(), threading.Event()]
+    futures = [client.submit("question", cancel_event=event) for event in events]
+    assert backend.first_chunk.wait(TIMEOUT)
+    for event in events:
+        event.set()
+    gate.set()
+    for future in futures:
+        with pytest.raises(ClientError) as error:
+            future.result(TIMEOUT)
+        assert error.value.kind == "cancelled"
+    assert backend.completed == 0
+    client.shutdown()
+
+
+def test_shutdown_settles_queued_leader_and_followers():
+    gate = threading.Event()
+    backend = FakeBackend(gate=gate)
+    client = make_client(backend, max_workers=1)
+    busy = client.submit("occupies the only worker")
+    assert backend.first_chunk.wait(TIMEOUT)
+    queued = [client.submit("question"), client.submit("question")]
+    client.shutdown(wait=False)
+    assert all(future.cancelled() for future in queued)
+    gate.set()
+    assert busy.result(TIMEOUT) == "abc"
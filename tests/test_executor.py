@@ -0,0 +1,70 @@
+import threading
+import time
+
+import pytest
+
+from core.executor import FairExecutor
+
+TIMEOUT = 5
+
+
+def test_queued_work_runs_round_robin_across_owners():
+    executor = FairExecutor(max_workers=1)
+    started, gate = threading.Event(), threading.Event()
+
+    def block():
+        started.set()
+        assert gate.wait(TIMEOUT)
+
+    executor.submit_for("blocker", block)
+    assert started.wait(TIMEOUT)
+    order = []
+    futures = [executor.submit_for(owner, order.append, f"{owner}{number}")
+               for owner, count in (("a", 3), ("b", 2), ("c", 1))
+               for number in range(1, count + 1)]
+    gate.set()
+    for future in futures:
+        future.result(TIMEOUT)
+    assert order == ["a1", "b1", "c1", "a2", "b2", "a3"]
+    executor.shutdown()
+
+
+def test_thread_count_never_exceeds_max_workers():
+    executor = FairExecutor(max_workers=3)
+    lock = threading.Lock()
+    running = peak = 0
+
+    def work():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+
+    futures = [executor.submit_for(number % 4, work) for number in range(30)]
+    for future in futures:
+        future.result(TIMEOUT)
+    assert len(executor._threads) <= 3
+    assert peak == 3
+    executor.shutdown()
+
+
+def test_shutdown_cancels_queued_work_and_refuses_more():
+    executor = FairExecutor(max_workers=1)
+    started, gate = threading.Event(), threading.Event()
+
+    def block():
+        started.set()
+        assert gate.wait(TIMEOUT)
+
+    running = executor.submit(block)
+    assert started.wait(TIMEOUT)
+    queued = executor.submit(time.sleep, 0)
+    executor.shutdown(wait=False, cancel_futures=True)
+    assert queued.cancelled()
+    with pytest.raises(RuntimeError):
+        executor.submit(time.sleep, 0)
+    gate.set()
+    running.result(TIMEOUT)
@@ -0,0 +1,71 @@
+"""Export and import conversation history as NDJSON without starting the UI.
+
+    python transcripts.py sessions
+    python transcripts.py export -o history.ndjson [--session ID]
+    python transcripts.py import history.ndjson
+
+Exports hold one message per line (see core.transcript_io); imports add
+each exported session to the history as a new conversation.
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from config.settings import CONVERSATION_DB_PATH
+from core.conversation_store import ConversationStore
+from core.transcript_io import TranscriptError, export_transcript, import_transcript
+
+
+def list_sessions(store, out):
+    for session_id, started_at, count in store.sessions():
+        started = datetime.fromtimestamp(started_at).strftime("%Y-%m-%d %H:%M")
+        out.write(f"{session_id}  {started}  {count} messages\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export or import conversation history as NDJSON.")
+    parser.add_argument("--db", type=Path, default=CONVERSATION_DB_PATH,
+                        help=f"conversation database (default: {CONVERSATION_DB_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("sessions", help="list stored sessions")
+    export = commands.add_parser("export", help="write sessions to an NDJSON file")
+    export.add_argument("-o", "--output", default="-", help="file to write (default: stdout)")
+    export.add_argument("--session", help="only this session id (default: all sessions)")
+    load = commands.add_parser("import", help="add the sessions in an NDJSON file to the history")
+    load.add_argument("input", help="NDJSON transcript ('-' for stdin)")
+    args = parser.parse_args(argv)
+
+    store = ConversationStore(args.db)
+    started = time.perf_counter()
+    try:
+        if args.command == "sessions":
+            list_sessions(store, sys.stdout)
+            return 0
+        if args.command == "export":
+            out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8", newline="\n")
+            try:
+                count = export_transcript(store, out, args.session)
+            finally:
+                if out is not sys.stdout:
+                    out.close()
+            print(f"Exported {count} messages in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+            return 0
+        source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+        try:
+            sessions = import_transcript(store, source)
+        except TranscriptError as e:
+            print(f"Import stopped at {e}; {len(e.sessions)} sessions were imported before it.", file=sys.stderr)
+            return 1
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        print(f"Imported {len(sessions)} sessions in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+        return 0
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
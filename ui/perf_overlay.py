@@ -0,0 +1,72 @@
+from PyQt6.QtWidgets import QLabel
+from PyQt6.QtCore import Qt, QEvent, QTimer
+
+# Spans in message order; anything else the tracer knows is listed after them
+SPAN_ORDER = ("validate", "cache", "knowledge", "prompt", "queue_wait", "ttfb", "generation",
+              "render", "insert", "total")
+OVERLAY_MARGIN = 12
+REFRESH_MS = 1000
+
+
+class PerfOverlay(QLabel):
+    """Floating p50/p95/p99 table over the top-right corner of ``host``.
+
+    Refreshes from the tracer (and the frame monitor, if given) once a
+    second, and only while visible.
+    """
+
+    def __init__(self, tracer, host, frame_monitor=None):
+        super().__init__(host)
+        self.tracer = tracer
+        self.frame_monitor = frame_monitor
+        self.setObjectName("perf_overlay")
+        self.setTextFormat(Qt.TextFormat.RichText)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self._timer = QTimer(self)
+        self._timer.setInterval(REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+        host.installEventFilter(self)
+        self.hide()
+
+    def toggle(self):
+        if self.isVisible():
+            self._timer.stop()
+            self.hide()
+        else:
+            self.refresh()
+            self.show()
+            self.raise_()
+            self._timer.start()
+
+    def refresh(self):
+        stats = self.tracer.stats()
+        names = [name for name in SPAN_ORDER if name in stats]
+        names += sorted(name for name in stats if name not in SPAN_ORDER)
+        rows = "".join(
+            f"<tr><td>{name}</td><td align='right'>{stats[name]['count']}</td>"
+            f"<td align='right'>{stats[name]['p50']:.1f}</td><td align='right'>{stats[name]['p95']:.1f}</td>"
+            f"<td align='right'>{stats[name]['p99']:.1f}</td></tr>"
+            for name in names
+        ) or "<tr><td colspan='5'>no messages yet</td></tr>"
+        sources = ", ".join(f"{source} {count}" for source, count in sorted(self.tracer.sources().items()))
+        footer = [sources] if sources else []
+        frames = self.frame_monitor.stats() if self.frame_monitor is not None else {}
+        if frames:
+            footer.append(f"frames p50 {frames['p50']:.1f} / p95 {frames['p95']:.1f} ms · "
+                          f"quality {self.frame_monitor.level}")
+        self.setText(
+            "<table cellspacing='0' cellpadding='2'>"
+            "<tr><th align='left'>span (ms)</th><th>n</th><th>p50</th><th>p95</th><th>p99</th></tr>"
+            f"{rows}</table>" + "".join(f"<div>{line}</div>" for line in footer)
+        )
+        self.adjustSize()
+        self._place()
+
+    def _place(self):
+        host = self.parentWidget()
+        self.move(host.width() - self.width() - OVERLAY_MARGIN, OVERLAY_MARGIN)
+
+    def eventFilter(self, watched, event):
+        if watched is self.parentWidget() and event.type() == QEvent.Type.Resize and self.isVisible():
+            self._place()
+        return False
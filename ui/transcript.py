@@ -0,0 +1,447 @@
+import itertools
+import sys
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from PyQt6.QtWidgets import QListView, QStyledItemDelegate, QAbstractItemView, QAbstractScrollArea
+from PyQt6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPalette, QPen, QTextDocument, QAbstractTextDocumentLayout
+from PyQt6.QtCore import Qt, QAbstractListModel, QEvent, QModelIndex, QPersistentModelIndex, QRectF, QSize, QTimer, pyqtSignal
+
+from config.styles import get_chat_bubble_colors
+from core.renderer import render_markdown
+
+MessageRole = Qt.ItemDataRole.UserRole + 1
+
+# Bubble geometry (matches the old per-widget ModernChatBubble layout)
+VIEW_MARGIN = 16
+ROW_SPACING = 12
+BUBBLE_MAX_WIDTH = 600
+BUBBLE_FAR_MARGIN = 80
+BUBBLE_NEAR_MARGIN = 16
+BUBBLE_PADDING_H = 15
+BUBBLE_PADDING_V = 10
+BUBBLE_RADIUS = 16
+SENDER_SPACING = 5
+SYSTEM_MARGIN_H = 20
+SYSTEM_PADDING_H = 16
+SYSTEM_PADDING_V = 12
+HIGHLIGHT_WIDTH = 2
+SYSTEM_RADIUS = 8
+
+# Upper bound on laid-out documents kept alive; only visible rows need one
+DOCUMENT_CACHE_SIZE = 256
+# Narrow bubbles are laid out at widths rounded down to this step, so
+# dragging the window edge only re-lays out rows when a step is crossed
+WIDTH_STEP = 32
+
+_message_keys = itertools.count(1)
+
+
+class ChatMessage:
+    """One transcript row: a user/bot bubble or a centered system notice.
+
+    ``message_id`` is the conversation store id for rows restored from
+    history; rows created in this run leave it unset. ``key`` is unique in
+    the process and keys the delegate's layout caches. ``note`` is a short
+    status shown next to the sender, e.g. while a question is queued.
+
+    Long sessions hold tens of thousands of rows, so records use
+    ``__slots__`` and share interned kind/sender strings.
+    """
+    __slots__ = ("key", "kind", "text", "sender", "message_id", "created_at", "note")
+
+    def __init__(self, kind, text, sender="", message_id=None, created_at=None):
+        self.key = next(_message_keys)
+        self.kind = sys.intern(kind)
+        self.text = text
+        self.sender = sys.intern(sender)
+        self.message_id = message_id
+        self.created_at = created_at if created_at is not None else time.time()
+        self.note = ""
+
+    @property
+    def is_user(self):
+        return self.kind == "user"
+
+    @property
+    def header(self):
+        return f"{self.sender} · {self.note}" if self.note else self.sender
+
+
+class TranscriptModel(QAbstractListModel):
+    """Flat list of ChatMessage rows backing the transcript view."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._messages = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._messages)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        message = self._messages[index.row()]
+        if role == MessageRole:
+            return message
+        if role == Qt.ItemDataRole.DisplayRole:
+            return message.text
+        return None
+
+    def flags(self, index):
+        return Qt.ItemFlag.ItemIsEnabled
+
+    def append(self, message):
+        row = len(self._messages)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._messages.append(message)
+        self.endInsertRows()
+        return message
+
+    def prepend(self, messages):
+        """Insert older messages above the current first row."""
+        if not messages:
+            return
+        self.beginInsertRows(QModelIndex(), 0, len(messages) - 1)
+        self._messages[0:0] = messages
+        self.endInsertRows()
+
+    def update_text(self, message, text):
+        row = self._row_of(message)
+        if row is None:
+            return
+        message.text = text
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def update_note(self, message, note):
+        message.note = note
+        row = self._row_of(message)
+        if row is None:
+            return
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def remove(self, message):
+        row = self._row_of(message)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._messages[row]
+        self.endRemoveRows()
+
+    def remove_first(self, count):
+        """Remove the ``count`` oldest rows."""
+        count = min(count, len(self._messages))
+        if not count:
+            return
+        self.beginRemoveRows(QModelIndex(), 0, count - 1)
+        del self._messages[:count]
+        self.endRemoveRows()
+
+    def message_at(self, row):
+        return self._messages[row]
+
+    def messages(self):
+        return list(self._messages)
+
+    def index_of(self, message):
+        row = self._row_of(message)
+        return QModelIndex() if row is None else self.index(row)
+
+    def _row_of(self, message):
+        # Updated/removed rows are almost always the newest ones
+        for row in range(len(self._messages) - 1, -1, -1):
+            if self._messages[row] is message:
+                return row
+        return None
+
+
+class ChatBubbleDelegate(QStyledItemDelegate):
+    """Paints chat bubbles directly instead of creating a widget per message.
+
+    Rich text is laid out with QTextDocument. Laid-out documents sit in an
+    LRU keyed by (message key, width class) so only rows that become visible
+    pay for layout, and row heights are kept per message. Theme changes only
+    swap the colors used at paint time; colors and fonts are built once per
+    theme/font rather than on every paint.
+    """
+
+    def __init__(self, view, theme="light"):
+        super().__init__(view)
+        self.view = view
+        self.theme = theme
+        self._documents = OrderedDict()
+        self._heights = {}  # message key -> (text width, row height)
+        self._styles = {}
+        self._font_cache = None
+
+    def set_theme(self, theme):
+        # Layout does not depend on colors (text color comes from the paint
+        # context), so cached documents and heights stay valid
+        self.theme = theme
+
+    def invalidate(self, message):
+        """Drop cached layout for a message whose text changed or was removed."""
+        self._heights.pop(message.key, None)
+        for key in [key for key in self._documents if key[0] == message.key]:
+            del self._documents[key]
+
+    def _fonts(self):
+        base = self.view.font()
+        if self._font_cache is None or self._font_cache[0] != base:
+            message_font = QFont(base)
+            message_font.setPixelSize(15)
+            sender_font = QFont(base)
+            sender_font.setPixelSize(12)
+            sender_font.setWeight(QFont.Weight.DemiBold)
+            system_font = QFont(base)
+            system_font.setPixelSize(13)
+            system_font.setItalic(True)
+            self._font_cache = (base, (message_font, sender_font, system_font))
+        return self._font_cache[1]
+
+    def _style(self, kind):
+        """QColors for a row kind in the current theme (None where the theme has no color)."""
+        key = (self.theme, kind)
+        style = self._styles.get(key)
+        if style is None:
+            style = {name: QColor(value) if value else None
+                     for name, value in get_chat_bubble_colors(kind, self.theme).items()}
+            self._styles[key] = style
+        return style
+
+    def _bubble_text_width(self, view_width):
+        available = view_width - 2 * VIEW_MARGIN - BUBBLE_FAR_MARGIN - BUBBLE_NEAR_MARGIN
+        if available < BUBBLE_MAX_WIDTH:
+            available -= available % WIDTH_STEP
+        return max(100, min(BUBBLE_MAX_WIDTH, available) - 2 * BUBBLE_PADDING_H)
+
+    def _document(self, message, text_width):
+        key = (message.key, text_width)
+        document = self._documents.get(key)
+        if document is not None:
+            self._documents.move_to_end(key)
+            return document
+
+        message_font, _, _ = self._fonts()
+        document = QTextDocument()
+        document.setDefaultFont(message_font)
+        document.setDocumentMargin(0)
+        document.setHtml(render_markdown(message.text))
+        document.setTextWidth(text_width)
+        # Shrink short messages to their natural width
+        if document.idealWidth() < text_width:
+            document.setTextWidth(document.idealWidth() + 1)
+
+        if len(self._documents) >= DOCUMENT_CACHE_SIZE:
+            self._documents.popitem(last=False)
+        self._documents[key] = document
+        return document
+
+    def sizeHint(self, option, index):
+        # Called for every row on each relayout, so skip the QVariant round trip
+        message = index.model().message_at(index.row())
+        view_width = self.view.viewport().width()
+        if message.kind == "system":
+            return QSize(view_width, self._measure(message, view_width))
+
+        # Bubble height only depends on the text width, which stops changing
+        # once the view is wider than a full-size bubble
+        text_width = self._bubble_text_width(view_width)
+        entry = self._heights.get(message.key)
+        if entry is None or entry[0] != text_width:
+            entry = (text_width, self._measure(message, view_width))
+            self._heights[message.key] = entry
+        return QSize(view_width, entry[1])
+
+    def _measure(self, message, view_width):
+        _, sender_font, system_font = self._fonts()
+        if message.kind == "system":
+            metrics = QFontMetrics(system_font)
+            text_width = view_width - 2 * (VIEW_MARGIN + SYSTEM_MARGIN_H + SYSTEM_PADDING_H)
+            rect = metrics.boundingRect(0, 0, max(1, text_width), 10000,
+                                        Qt.TextFlag.TextWordWrap, message.text)
+            return rect.height() + 2 * SYSTEM_PADDING_V + ROW_SPACING
+
+        document = self._document(message, self._bubble_text_width(view_width))
+        sender_height = QFontMetrics(sender_font).height()
+        return (int(document.size().height()) + sender_height + SENDER_SPACING
+                + 2 * BUBBLE_PADDING_V + ROW_SPACING)
+
+    def paint(self, painter, option, index):
+        message = index.data(MessageRole)
+        colors = self._style(message.kind)
+        _, sender_font, system_font = self._fonts()
+        rect = QRectF(option.rect).adjusted(VIEW_MARGIN, ROW_SPACING / 2, -VIEW_MARGIN, -ROW_SPACING / 2)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        if message.kind == "system":
+            box = rect.adjusted(SYSTEM_MARGIN_H, 0, -SYSTEM_MARGIN_H, 0)
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(colors["background"])
+            painter.drawRoundedRect(box, SYSTEM_RADIUS, SYSTEM_RADIUS)
+            painter.setPen(colors["text"])
+            painter.setFont(system_font)
+            painter.drawText(box.adjusted(SYSTEM_PADDING_H, SYSTEM_PADDING_V, -SYSTEM_PADDING_H, -SYSTEM_PADDING_V),
+                             Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextWordWrap, message.text)
+            painter.restore()
+            return
+
+        document = self._document(message, self._bubble_text_width(self.view.viewport().width()))
+        sender_metrics = QFontMetrics(sender_font)
+        content_width = max(document.size().width(), sender_metrics.horizontalAdvance(message.header))
+        bubble_width = content_width + 2 * BUBBLE_PADDING_H
+        if message.is_user:
+            left = rect.right() - BUBBLE_NEAR_MARGIN - bubble_width
+        else:
+            left = rect.left() + BUBBLE_NEAR_MARGIN
+        bubble = QRectF(left, rect.top(), bubble_width, rect.height())
+
+        if colors.get("border"):
+            painter.setPen(colors["border"])
+        else:
+            painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(colors["background"])
+        painter.drawRoundedRect(bubble, BUBBLE_RADIUS, BUBBLE_RADIUS)
+        if message is self.view.highlighted_message:
+            painter.setPen(QPen(colors["highlight"], HIGHLIGHT_WIDTH))
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.drawRoundedRect(bubble.adjusted(1, 1, -1, -1), BUBBLE_RADIUS, BUBBLE_RADIUS)
+
+        text_left = bubble.left() + BUBBLE_PADDING_H
+        text_top = bubble.top() + BUBBLE_PADDING_V
+        painter.setFont(sender_font)
+        painter.setPen(colors["sender"])
+        painter.drawText(QRectF(text_left, text_top, content_width, sender_metrics.height()),
+                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, message.header)
+
+        painter.translate(text_left, text_top + sender_metrics.height() + SENDER_SPACING)
+        context = QAbstractTextDocumentLayout.PaintContext()
+        context.palette.setColor(QPalette.ColorRole.Text, colors["text"])
+        document.documentLayout().draw(painter, context)
+        painter.restore()
+
+
+class TranscriptView(QListView):
+    """Virtualized chat transcript: only visible rows are laid out and painted.
+
+    ``top_reached`` fires when the user scrolls to the oldest loaded row, so
+    the owner can page in older history. ``highlighted_message`` gets an
+    outline, e.g. for the current search result.
+    """
+    top_reached = pyqtSignal()
+
+    _layout_frozen = False
+    highlighted_message = None
+
+    def __init__(self, model, theme="light", parent=None):
+        super().__init__(parent)
+        self.setModel(model)
+        self.bubble_delegate = ChatBubbleDelegate(self, theme)
+        self.setItemDelegate(self.bubble_delegate)
+        self.setObjectName("chat_view")
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(500)
+        self.setUniformItemSizes(False)
+        self.setSpacing(0)
+        self.setContentsMargins(0, VIEW_MARGIN, 0, VIEW_MARGIN)
+
+        # Batched layout grows the scroll range over several event-loop passes,
+        # so keep following the newest row until the user scrolls away.
+        # Scrolling in the middle of a batch restarts the layout, hence the
+        # debounce timer.
+        self._follow_tail = True
+        self._tail_timer = QTimer(self)
+        self._tail_timer.setSingleShot(True)
+        self._tail_timer.setInterval(30)
+        self._tail_timer.timeout.connect(self._scroll_to_tail)
+        self.verticalScrollBar().rangeChanged.connect(self._on_range_changed)
+        self.verticalScrollBar().valueChanged.connect(self._on_scrolled)
+
+        model.dataChanged.connect(self._on_data_changed)
+        model.rowsAboutToBeRemoved.connect(self._on_rows_removed)
+        model.rowsInserted.connect(self._on_rows_inserted)
+
+    def scrollToBottom(self):
+        self._follow_tail = True
+        super().scrollToBottom()
+
+    def _on_range_changed(self, minimum, maximum):
+        if self._follow_tail or self.highlighted_message is not None:
+            self._tail_timer.start()
+
+    def _scroll_to_tail(self):
+        if self._follow_tail:
+            self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+        elif self.highlighted_message is not None:
+            # Rows above the highlight may still be getting laid out
+            self._center_highlight()
+
+    def _on_scrolled(self, value):
+        scroll_bar = self.verticalScrollBar()
+        self._follow_tail = value >= scroll_bar.maximum() - ROW_SPACING
+        if value == scroll_bar.minimum() and scroll_bar.maximum() > 0:
+            self.top_reached.emit()
+
+    def _on_rows_inserted(self, parent, first, last):
+        if first != 0 or self._follow_tail or last + 1 >= self.model().rowCount():
+            return
+        if self.highlighted_message is not None:
+            # Rows paged in around a search hit: keep the hit centred instead
+            QTimer.singleShot(0, self._center_highlight)
+            return
+        # Older history was prepended: keep the row the user was reading in place
+        anchor = QPersistentModelIndex(self.model().index(last + 1))
+        QTimer.singleShot(0, lambda: self.scrollTo(QModelIndex(anchor), QAbstractItemView.ScrollHint.PositionAtTop))
+
+    def reveal(self, message):
+        """Scroll ``message`` to the middle of the view and outline it (None clears)."""
+        self.highlighted_message = message
+        if message is not None:
+            self._follow_tail = False
+            self._center_highlight()
+        self.viewport().update()
+
+    def _center_highlight(self):
+        index = self.model().index_of(self.highlighted_message)
+        if index.isValid():
+            self.scrollTo(index, QAbstractItemView.ScrollHint.PositionAtCenter)
+
+    def set_theme(self, theme):
+        self.bubble_delegate.set_theme(theme)
+        self.viewport().update()
+
+    @contextmanager
+    def keep_layout(self):
+        """Skip the full relayout Qt does on style changes that keep geometry."""
+        self._layout_frozen = True
+        try:
+            yield
+        finally:
+            self._layout_frozen = False
+
+    def event(self, event):
+        if self._layout_frozen and event.type() in (QEvent.Type.FontChange, QEvent.Type.StyleChange):
+            # Bypass QAbstractItemView, which would relayout every row
+            return QAbstractScrollArea.event(self, event)
+        return super().event(event)
+
+    def _on_rows_removed(self, parent, first, last):
+        for row in range(first, last + 1):
+            self.bubble_delegate.invalidate(self.model().index(row).data(MessageRole))
+
+    def _on_data_changed(self, top_left, bottom_right, roles=()):
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            self.bubble_delegate.invalidate(self.model().index(row).data(MessageRole))
+        # Row height may have changed (streaming text), so relayout
+        self.scheduleDelayedItemsLayout()